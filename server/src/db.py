@@ -1,5 +1,5 @@
 import os
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.orm import sessionmaker, declarative_base
 
 BASE_DIR = os.path.dirname(__file__)
@@ -22,3 +22,20 @@ def get_db():
         yield db
     finally:
         db.close()
+
+def add_missing_columns(bind=engine):
+    """create_all이 기존 테이블에 추가하지 않는 새 컬럼 보강 (text() 서버 기본값이 있는 컬럼만)"""
+    inspector = inspect(bind)
+    with bind.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing or column.server_default is None:
+                    continue
+                column_type = column.type.compile(dialect=bind.dialect)
+                conn.execute(text(
+                    f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type} "
+                    f"NOT NULL DEFAULT {column.server_default.arg.text}"
+                ))
@@ -8,7 +8,10 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
-from src.db import Base, engine
+from src.db import Base, add_missing_columns, engine
+from src.services.llm_client import close_async_http_client
+from src.services.ollama_backend import ollama_backend, warm_up_active_providers
+from src.services.wordpress_sessions import wordpress_sessions
 
 from src.routes.auth import router as auth_router
 from src.routes.user import router as user_router
@@ -17,6 +20,7 @@ from src.routes.content import router as content_router
 from src.routes.llm import router as llm_router
 from src.routes.seo import router as seo_router
 from src.routes.keyword_analysis import router as keyword_analysis_router
+from src.routes.admin import router as admin_router
 
 
 app = FastAPI()
@@ -29,6 +33,18 @@ app.add_middleware(
 )
 
 Base.metadata.create_all(bind=engine)
+add_missing_columns(engine)
+
+@app.on_event("startup")
+def warm_up_ollama_models():
+    if os.getenv('OLLAMA_WARM_UP_ON_STARTUP', 'true').lower() == 'true':
+        warm_up_active_providers()
+
+@app.on_event("shutdown")
+async def shutdown_llm_clients():
+    await close_async_http_client()
+    ollama_backend.close()
+    wordpress_sessions.close()
 
 app.include_router(auth_router, prefix="/api/auth")
 app.include_router(user_router, prefix="/api/user")
@@ -37,6 +53,7 @@ app.include_router(content_router, prefix="/api/content")
 app.include_router(llm_router, prefix="/api/llm")
 app.include_router(seo_router, prefix="/api/seo")
 app.include_router(keyword_analysis_router, prefix="/api/keyword-analysis")
+app.include_router(admin_router, prefix="/api/admin")
 
 static_dir = os.path.join(os.path.dirname(__file__), "static")
 if os.path.isdir(static_dir):
@@ -0,0 +1,72 @@
+import json
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+from src.db import Base
+
+class BulkJob(Base):
+    __tablename__ = "bulk_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    status = Column(String(20), nullable=False, default='queued')  # queued, running, completed, failed
+    content_type = Column(String(50), nullable=False, default='blog_post')
+    tone = Column(String(50), nullable=False, default='professional')
+    target_audience = Column(String(50), nullable=False, default='general')
+    cache_mode = Column(String(10), nullable=False, default='bypass')  # bypass, prefer, only
+    total_items = Column(Integer, default=0)
+    error = Column(Text, nullable=True)
+
+    # 타임스탬프
+    created_at = Column(DateTime, default=func.now())
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    # 관계
+    items = relationship("BulkJobItem", back_populates="job", order_by="BulkJobItem.position",
+                         cascade="all, delete-orphan")
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'user_id': self.user_id,
+            'status': self.status,
+            'content_type': self.content_type,
+            'tone': self.tone,
+            'target_audience': self.target_audience,
+            'cache_mode': self.cache_mode,
+            'total_items': self.total_items,
+            'error': self.error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+
+class BulkJobItem(Base):
+    __tablename__ = "bulk_job_items"
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_id = Column(Integer, ForeignKey("bulk_jobs.id"), nullable=False, index=True)
+    position = Column(Integer, nullable=False, default=0)
+    keyword = Column(String(255), nullable=False)
+    status = Column(String(20), nullable=False, default='pending')  # pending, running, success, failed, timeout
+    result = Column(Text, nullable=True)  # JSON 형태로 저장
+    error = Column(Text, nullable=True)
+
+    # 타임스탬프
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    # 관계
+    job = relationship("BulkJob", back_populates="items")
+
+    def to_dict(self):
+        item = {
+            'keyword': self.keyword,
+            'status': self.status
+        }
+        if self.result:
+            item['content'] = json.loads(self.result)
+        if self.error:
+            item['error'] = self.error
+        return item
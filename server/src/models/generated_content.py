@@ -0,0 +1,57 @@
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, Float, LargeBinary, ForeignKey, Index
+from sqlalchemy.orm import deferred
+from sqlalchemy.sql import func
+from src.db import Base
+
+class GeneratedContent(Base):
+    __tablename__ = "generated_contents"
+    __table_args__ = (
+        # 목록 조회용 키셋 페이지네이션 인덱스 (created_at, id 역순)
+        Index('ix_generated_contents_user_created', 'user_id', 'created_at', 'id'),
+        Index('ix_generated_contents_user_status_created', 'user_id', 'status', 'created_at', 'id'),
+        Index('ix_generated_contents_user_keyword', 'user_id', 'keyword'),
+        # 중복 색인이 사용자별로 새 지문만 이어서 읽을 때 사용
+        Index('ix_generated_contents_user_id', 'user_id', 'id'),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    keyword = Column(String(255), nullable=False)
+    title = Column(String(500), nullable=False, default='')
+    content_type = Column(String(50), nullable=False, default='blog_post')
+    status = Column(String(20), nullable=False, default='draft')  # draft, published, archived
+    source = Column(String(20), nullable=False, default='generate')  # generate, bulk
+    bulk_job_id = Column(Integer, ForeignKey("bulk_jobs.id"), nullable=True)
+
+    # 목록에 표시할 요약 정보 (본문을 읽지 않고 조회)
+    excerpt = Column(String(300), nullable=True)
+    word_count = Column(Integer, default=0)
+    seo_score = Column(Float, nullable=True)
+
+    # 본문 SimHash 지문 (부호 있는 64비트로 저장, 근접 중복 탐지용)
+    simhash = Column(BigInteger, nullable=True)
+
+    # 생성 결과 전체(JSON) - 크면 zlib 압축, 목록 조회 시에는 로드하지 않음
+    body = deferred(Column(LargeBinary, nullable=False))
+    body_encoding = Column(String(10), nullable=False, default='identity')  # identity, zlib
+    body_size = Column(Integer, default=0)  # 압축 전 바이트 수
+
+    # 타임스탬프
+    created_at = Column(DateTime, default=func.now(), nullable=False)
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+    def to_summary(self):
+        return {
+            'id': self.id,
+            'keyword': self.keyword,
+            'title': self.title,
+            'content_type': self.content_type,
+            'status': self.status,
+            'source': self.source,
+            'bulk_job_id': self.bulk_job_id,
+            'excerpt': self.excerpt,
+            'word_count': self.word_count,
+            'seo_score': self.seo_score,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
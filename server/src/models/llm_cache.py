@@ -0,0 +1,16 @@
+from sqlalchemy import Column, String, DateTime, Text
+from sqlalchemy.sql import func
+from src.db import Base
+
+class LLMResponseCacheEntry(Base):
+    __tablename__ = "llm_response_cache"
+
+    # 렌더링된 프롬프트 + 제공자/모델의 SHA-256
+    cache_key = Column(String(64), primary_key=True)
+    provider_type = Column(String(50), nullable=False)
+    model_name = Column(String(100), nullable=False)
+    response = Column(Text, nullable=False)
+
+    # 타임스탬프
+    created_at = Column(DateTime, default=func.now())
+    expires_at = Column(DateTime, nullable=False, index=True)
@@ -1,5 +1,5 @@
 from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 from sqlalchemy.orm import relationship
 from src.db import Base
 
@@ -14,6 +14,8 @@ class LLMProvider(Base):
     base_url = Column(String(255), nullable=True)
     model_name = Column(String(100), nullable=False)
     is_active = Column(Boolean, default=False)
+    # 활성 제공자 외에 부하 분산/장애 조치 대상으로 쓸지 여부 (기본: 사용 안 함)
+    use_for_routing = Column(Boolean, default=False, server_default=text('0'), nullable=False)
     
     # 타임스탬프
     created_at = Column(DateTime, default=func.now())
@@ -30,6 +32,7 @@ class LLMProvider(Base):
             'provider_type': self.provider_type,
             'model_name': self.model_name,
             'is_active': self.is_active,
+            'use_for_routing': self.use_for_routing,
             'api_key': self.api_key,
             'base_url': self.base_url,
             'created_at': self.created_at.isoformat() if self.created_at else None,
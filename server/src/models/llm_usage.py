@@ -0,0 +1,48 @@
+from sqlalchemy import Column, Integer, String, DateTime, Float, Text, ForeignKey
+from sqlalchemy.sql import func
+from src.db import Base
+
+class LLMCallRecord(Base):
+    __tablename__ = "llm_call_records"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)
+    operation = Column(String(50), nullable=False)  # content, section, batch, stream, llm_generate, connection_test
+    content_type = Column(String(50), nullable=True)
+    provider_type = Column(String(50), nullable=False)
+    model_name = Column(String(100), nullable=False)
+
+    # 토큰 사용량 (제공자가 보고하지 않으면 NULL)
+    prompt_tokens = Column(Integer, nullable=True)
+    completion_tokens = Column(Integer, nullable=True)
+    cached_tokens = Column(Integer, nullable=True)  # prompt_tokens 중 제공자 프롬프트 캐시에 적중한 토큰
+    total_tokens = Column(Integer, nullable=True)
+
+    # 지연 시간 (밀리초)
+    ttft_ms = Column(Float, nullable=True)
+    latency_ms = Column(Float, nullable=False)
+
+    status = Column(String(20), nullable=False)  # success, error
+    error = Column(Text, nullable=True)
+
+    # 타임스탬프
+    created_at = Column(DateTime, default=func.now(), index=True)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'user_id': self.user_id,
+            'operation': self.operation,
+            'content_type': self.content_type,
+            'provider_type': self.provider_type,
+            'model_name': self.model_name,
+            'prompt_tokens': self.prompt_tokens,
+            'completion_tokens': self.completion_tokens,
+            'cached_tokens': self.cached_tokens,
+            'total_tokens': self.total_tokens,
+            'ttft_ms': self.ttft_ms,
+            'latency_ms': self.latency_ms,
+            'status': self.status,
+            'error': self.error,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey
+from sqlalchemy.sql import func
+from src.db import Base
+
+class PromptTemplate(Base):
+    __tablename__ = "prompt_templates"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    name = Column(String(100), nullable=False)
+    content_type = Column(String(50), nullable=False)  # blog_post, product_review, ...
+    locale = Column(String(10), nullable=False, default='ko')
+    # Jinja2 소스 - {% block prefix %}(고정 지침)와 {% block request %}(요청별 내용)로 구성
+    source = Column(Text, nullable=False)
+    is_active = Column(Boolean, default=True)
+
+    # 타임스탬프
+    created_at = Column(DateTime, default=func.now())
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'name': self.name,
+            'content_type': self.content_type,
+            'locale': self.locale,
+            'source': self.source,
+            'is_active': self.is_active,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
@@ -0,0 +1,71 @@
+import json
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Index
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+from src.db import Base
+
+class PublishJob(Base):
+    __tablename__ = "publish_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    status = Column(String(20), nullable=False, default='queued')  # queued, running, completed, failed
+    post_status = Column(String(20), nullable=False, default='draft')  # WordPress 게시 상태 (draft, publish, private)
+    total_items = Column(Integer, default=0)
+    error = Column(Text, nullable=True)
+
+    # 타임스탬프
+    created_at = Column(DateTime, default=func.now())
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    # 관계
+    items = relationship("PublishJobItem", back_populates="job", order_by="PublishJobItem.position",
+                         cascade="all, delete-orphan")
+
+class PublishJobItem(Base):
+    """글 한 편 x 사이트 하나"""
+    __tablename__ = "publish_job_items"
+    __table_args__ = (
+        Index('ix_publish_job_items_job_position', 'job_id', 'position'),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_id = Column(Integer, ForeignKey("publish_jobs.id"), nullable=False)
+    position = Column(Integer, nullable=False, default=0)
+    site_id = Column(Integer, ForeignKey("wordpress_sites.id", ondelete="SET NULL"), nullable=True)
+    # 저장된 생성 결과를 게시하면 본문은 generated_contents에서 읽음
+    content_id = Column(Integer, ForeignKey("generated_contents.id", ondelete="SET NULL"), nullable=True)
+    title = Column(String(500), nullable=False, default='')
+    payload = Column(Text, nullable=False)  # 게시 옵션 (JSON - 직접 전달한 본문, 카테고리, 태그 등)
+    status = Column(String(20), nullable=False, default='pending')  # pending, running, success, failed
+    attempts = Column(Integer, default=0)
+    post_id = Column(Integer, nullable=True)
+    link = Column(String(500), nullable=True)
+    skipped_terms = Column(Text, nullable=True)  # 생성하지 못해 빼고 게시한 카테고리/태그 (JSON)
+    error = Column(Text, nullable=True)
+
+    # 타임스탬프
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    # 관계
+    job = relationship("PublishJob", back_populates="items")
+
+    def to_dict(self):
+        item = {
+            'id': self.id,
+            'position': self.position,
+            'site_id': self.site_id,
+            'content_id': self.content_id,
+            'title': self.title,
+            'status': self.status,
+            'attempts': self.attempts
+        }
+        if self.post_id is not None:
+            item['post'] = {'id': self.post_id, 'link': self.link}
+        if self.error:
+            item['error'] = self.error
+        if self.skipped_terms:
+            item['skipped_terms'] = json.loads(self.skipped_terms)
+        return item
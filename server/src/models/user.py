@@ -103,17 +103,19 @@ class User(Base):
             return {
                 'posts': 1000,
                 'keywords': 5000,
-                'sites': 10
+                'sites': 10,
+                'tokens': 5000000
             }
         else:
             return {
                 'posts': 50,
                 'keywords': 200,
-                'sites': 2
+                'sites': 2,
+                'tokens': 500000
             }
     
-    def check_monthly_usage(self):
-        """월간 사용량 확인"""
+    def check_monthly_usage(self, tokens_used: int = 0):
+        """월간 사용량 확인 (토큰 사용량은 LLM 호출 기록에서 집계해 전달)"""
         limits = self.get_monthly_limits()
         return {
             'posts': {
@@ -125,6 +127,11 @@ class User(Base):
                 'used': self.monthly_keywords_count,
                 'limit': limits['keywords'],
                 'remaining': max(0, limits['keywords'] - self.monthly_keywords_count)
+            },
+            'tokens': {
+                'used': tokens_used,
+                'limit': limits['tokens'],
+                'remaining': max(0, limits['tokens'] - tokens_used)
             }
         }
 
@@ -0,0 +1,28 @@
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey, Index
+from sqlalchemy.sql import func, text
+from src.db import Base
+
+class WordPressSite(Base):
+    __tablename__ = "wordpress_sites"
+    __table_args__ = (
+        # 사용자별 사이트 목록/단건 조회
+        Index('ix_wordpress_sites_user_id', 'user_id', 'id'),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    name = Column(String(100), nullable=False)
+    url = Column(String(500), nullable=False)
+    username = Column(String(100), nullable=False)
+    # 애플리케이션 비밀번호 (crypto_utils.encrypt_secret으로 암호화해 저장)
+    password_encrypted = Column(Text, nullable=False)
+    is_active = Column(Boolean, default=True)
+    status = Column(String(20), default='connected')  # connected, disconnected
+    user_info = Column(Text, nullable=True)  # 연결 테스트로 얻은 WordPress 사용자 정보 (JSON)
+    # 수정할 때마다 증가 - 워커별 사이트 캐시가 DB와 같은지 읽을 때마다 확인 (updated_at은 초 단위라 부족)
+    version = Column(Integer, nullable=False, default=0, server_default=text('0'))
+
+    # 타임스탬프
+    last_tested = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=func.now())
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
@@ -0,0 +1,28 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from src.db import get_db
+from src.utils.dependencies import get_current_admin
+from src.services.llm_telemetry import llm_telemetry
+
+router = APIRouter()
+
+@router.get('/llm-usage')
+def get_llm_usage(days: int = 7, group_by: str = 'provider_type',
+                  admin = Depends(get_current_admin), db: Session = Depends(get_db)):
+    """LLM 호출 통계 (그룹별 호출 수, 토큰 합계, 지연 시간/첫 토큰 p50·p95·p99, 오류율)"""
+    if days < 1 or days > 90:
+        raise HTTPException(status_code=400, detail="days는 1-90 사이여야 합니다.")
+    try:
+        groups = llm_telemetry.summarize(db, days=days, group_by=group_by)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {
+        "success": True,
+        "data": {
+            "days": days,
+            "group_by": group_by,
+            "groups": groups
+        }
+    }
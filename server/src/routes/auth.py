@@ -8,6 +8,7 @@ import json
 from src.db import get_db
 from src.models.user import User
 from src.services.auth_service import AdvancedAuthService, TwoFactorAuth
+from src.services.llm_telemetry import llm_telemetry
 from src.utils.dependencies import get_current_user
 
 router = APIRouter()
@@ -285,13 +286,13 @@ def logout(access_token: str, refresh_token: Optional[str] = None):
         }
 
 @router.get('/me')
-def get_current_user_info(user: User = Depends(get_current_user)):
+def get_current_user_info(user: User = Depends(get_current_user), db: Session = Depends(get_db)):
     """현재 사용자 정보 조회"""
     return {
         'success': True,
         'data': {
             'user': user.to_dict(),
-            'usage': user.check_monthly_usage(),
+            'usage': user.check_monthly_usage(llm_telemetry.monthly_tokens(db, user)),
             'limits': user.get_monthly_limits()
         }
     }
@@ -603,12 +604,12 @@ def regenerate_api_key(user: User = Depends(get_current_user), db: Session = Dep
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get('/usage-stats')
-def get_usage_stats(user: User = Depends(get_current_user)):
+def get_usage_stats(user: User = Depends(get_current_user), db: Session = Depends(get_db)):
     """사용량 통계 조회"""
     return {
         'success': True,
         'data': {
-            'usage': user.check_monthly_usage(),
+            'usage': user.check_monthly_usage(llm_telemetry.monthly_tokens(db, user)),
             'limits': user.get_monthly_limits(),
             'account_type': 'Premium' if user.is_premium else 'Free',
             'api_access': user.can_use_api()
@@ -1,13 +1,20 @@
 from fastapi import APIRouter, Depends, HTTPException
+from openai import NotFoundError
 from sqlalchemy.orm import Session
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Optional
-from datetime import datetime
 import os
 
 from src.db import get_db
+from src.models.prompt_template import PromptTemplate
 from src.utils.dependencies import get_current_user
+from src.utils.sse import sse_response
 from src.services.content_generator import AdvancedContentGenerator
+from src.services.bulk_jobs import bulk_job_service
+from src.services.content_store import content_store
+from src.services.llm_telemetry import TokenBudgetExceeded
+from src.services.prompt_templates import AUDIENCE_OPTIONS, CONTENT_TEMPLATES, TONE_OPTIONS, prompt_registry
+from src.services.response_cache import CACHE_MODES
 from src.services.seo_service import SEOAnalyzer
 
 router = APIRouter()
@@ -15,6 +22,9 @@ router = APIRouter()
 # 콘텐츠 생성기 및 SEO 분석기 인스턴스 - 이제 동적으로 생성
 seo_analyzer = SEOAnalyzer()
 
+# 대량 생성 작업당 최대 키워드 수
+MAX_BULK_KEYWORDS = 100
+
 class AdvancedContentRequest(BaseModel):
     keyword: str
     content_type: str = 'blog_post'  # blog_post, product_review, how_to_guide, listicle, news_article
@@ -22,6 +32,9 @@ class AdvancedContentRequest(BaseModel):
     target_audience: str = 'general'  # general, beginners, experts, professionals
     additional_keywords: Optional[List[str]] = None
     custom_instructions: Optional[str] = ""
+    cache: str = 'bypass'  # bypass, prefer, only
+    long_form: bool = False  # 개요 생성 후 섹션별 병렬 생성
+    locale: str = 'ko'
 
 class ContentVariationRequest(BaseModel):
     base_content: dict
@@ -30,16 +43,32 @@ class ContentVariationRequest(BaseModel):
 class SocialMediaRequest(BaseModel):
     main_content: dict
 
+class PromptTemplateRequest(BaseModel):
+    name: str
+    content_type: str = 'blog_post'
+    locale: str = 'ko'
+    source: str
+    is_active: bool = True
+
+class DerivativeBatchRequest(BaseModel):
+    contents: List[dict]
+    variation_count: int = Field(3, ge=0, le=5)
+    include_social: bool = True
+
 class ContentOptimizationRequest(BaseModel):
     title: str
     content: str
     target_keyword: str
 
+class GeneratedContentUpdateRequest(BaseModel):
+    status: str  # draft, published, archived
+
 class BulkContentRequest(BaseModel):
     keywords: List[str]
     content_type: str = 'blog_post'
     tone: str = 'professional'
     target_audience: str = 'general'
+    cache: str = 'bypass'  # bypass, prefer, only
 
 @router.post('/generate-advanced')
 def generate_advanced_content(payload: AdvancedContentRequest, current_user = Depends(get_current_user), db: Session = Depends(get_db)):
@@ -47,6 +76,8 @@ def generate_advanced_content(payload: AdvancedContentRequest, current_user = De
     try:
         if not payload.keyword:
             raise HTTPException(status_code=400, detail="키워드는 필수입니다.")
+        if payload.cache not in CACHE_MODES:
+            raise HTTPException(status_code=400, detail=f"cache는 {', '.join(CACHE_MODES)} 중 하나여야 합니다.")
         
         content_generator = AdvancedContentGenerator(
             api_key=os.getenv("OPENAI_API_KEY"),
@@ -60,16 +91,62 @@ def generate_advanced_content(payload: AdvancedContentRequest, current_user = De
             target_audience=payload.target_audience,
             additional_keywords=payload.additional_keywords or [],
             custom_instructions=payload.custom_instructions or "",
-            db=db
+            db=db,
+            cache_mode=payload.cache,
+            long_form=payload.long_form,
+            locale=payload.locale,
+            hedge=True
         )
         
+        # 새로고침 후에도 다시 생성하지 않도록 저장 (데모 콘텐츠 제외)
+        if not content_result.get('demo_mode'):
+            try:
+                content_result['content_id'] = content_store.save(db, current_user.id, content_result).id
+            except Exception as e:
+                print(f"생성 콘텐츠 저장 오류: {e}")
+        
         return {
             "success": True,
             "data": content_result
         }
+    except HTTPException:
+        raise
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except TokenBudgetExceeded as e:
+        raise HTTPException(status_code=429, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post('/generate-advanced/stream')
+def stream_advanced_content(payload: AdvancedContentRequest, current_user = Depends(get_current_user), db: Session = Depends(get_db)):
+    """고급 SEO 최적화 콘텐츠 스트리밍 생성 (SSE)"""
+    if not payload.keyword:
+        raise HTTPException(status_code=400, detail="키워드는 필수입니다.")
+    
+    try:
+        content_generator = AdvancedContentGenerator(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            user_id=current_user.id
+        )
+        
+        events = content_generator.stream_seo_optimized_content(
+            keyword=payload.keyword,
+            content_type=payload.content_type,
+            tone=payload.tone,
+            target_audience=payload.target_audience,
+            additional_keywords=payload.additional_keywords or [],
+            custom_instructions=payload.custom_instructions or "",
+            db=db,
+            locale=payload.locale
+        )
+    except TokenBudgetExceeded as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    return sse_response(events)
+
 @router.post('/generate-variations')
 def generate_content_variations(payload: ContentVariationRequest, current_user = Depends(get_current_user), db: Session = Depends(get_db)):
     """콘텐츠 변형 생성"""
@@ -84,7 +161,8 @@ def generate_content_variations(payload: ContentVariationRequest, current_user =
         
         variations = content_generator.generate_content_variations(
             payload.base_content, 
-            payload.variation_count
+            payload.variation_count,
+            db=db
         )
         
         return {
@@ -94,6 +172,8 @@ def generate_content_variations(payload: ContentVariationRequest, current_user =
                 "variations": variations
             }
         }
+    except TokenBudgetExceeded as e:
+        raise HTTPException(status_code=429, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -106,12 +186,14 @@ def generate_social_media_content(payload: SocialMediaRequest, current_user = De
             user_id=current_user.id
         )
         
-        social_content = content_generator.generate_social_media_content(payload.main_content)
+        social_content = content_generator.generate_social_media_content(payload.main_content, db=db)
         
         return {
             "success": True,
             "data": social_content
         }
+    except TokenBudgetExceeded as e:
+        raise HTTPException(status_code=429, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -159,122 +241,265 @@ def optimize_existing_content(payload: ContentOptimizationRequest, user = Depend
 
 @router.post('/bulk-generate')
 def bulk_generate_content(payload: BulkContentRequest, current_user = Depends(get_current_user), db: Session = Depends(get_db)):
-    """대량 콘텐츠 생성"""
+    """대량 콘텐츠 생성 작업 등록 - 작업 ID를 즉시 반환"""
+    if not payload.keywords:
+        raise HTTPException(status_code=400, detail="키워드는 필수입니다.")
+    if len(payload.keywords) > MAX_BULK_KEYWORDS:
+        raise HTTPException(status_code=400, detail=f"대량 생성은 최대 {MAX_BULK_KEYWORDS}개 키워드까지 가능합니다.")
+    if payload.cache not in CACHE_MODES:
+        raise HTTPException(status_code=400, detail=f"cache는 {', '.join(CACHE_MODES)} 중 하나여야 합니다.")
+    
     try:
-        if len(payload.keywords) > 10:
-            raise HTTPException(status_code=400, detail="대량 생성은 최대 10개 키워드까지 가능합니다.")
-        
-        content_generator = AdvancedContentGenerator(
-            api_key=os.getenv("OPENAI_API_KEY"),
-            user_id=current_user.id
+        job = bulk_job_service.create_job(
+            db,
+            user_id=current_user.id,
+            keywords=payload.keywords,
+            content_type=payload.content_type,
+            tone=payload.tone,
+            target_audience=payload.target_audience,
+            cache_mode=payload.cache
         )
-        
-        results = []
-        for keyword in payload.keywords:
-            try:
-                content_result = content_generator.generate_seo_optimized_content(
-                    keyword=keyword,
-                    content_type=payload.content_type,
-                    tone=payload.tone,
-                    target_audience=payload.target_audience,
-                    db=db
-                )
-                results.append({
-                    "keyword": keyword,
-                    "status": "success",
-                    "content": content_result
-                })
-            except Exception as e:
-                results.append({
-                    "keyword": keyword,
-                    "status": "failed",
-                    "error": str(e)
-                })
+        bulk_job_service.enqueue(job.id)
         
         return {
             "success": True,
             "data": {
-                "total_requested": len(payload.keywords),
-                "successful": len([r for r in results if r["status"] == "success"]),
-                "failed": len([r for r in results if r["status"] == "failed"]),
-                "results": results
+                "job_id": job.id,
+                "status": job.status,
+                "total_requested": len(payload.keywords)
             }
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get('/content-templates')
-def get_content_templates(user = Depends(get_current_user)):
-    """사용 가능한 콘텐츠 템플릿 조회"""
-    templates = {
-        "blog_post": {
-            "name": "블로그 포스트",
-            "description": "일반적인 블로그 글 형태",
-            "structure": ["도입부", "메인 콘텐츠", "결론"],
-            "recommended_length": "800-2000단어"
-        },
-        "product_review": {
-            "name": "제품 리뷰",
-            "description": "제품이나 서비스 리뷰",
-            "structure": ["개요", "기능", "장단점", "결론"],
-            "recommended_length": "600-1500단어"
-        },
-        "how_to_guide": {
-            "name": "하우투 가이드",
-            "description": "단계별 설명 가이드",
-            "structure": ["도입부", "단계별 설명", "팁", "결론"],
-            "recommended_length": "1000-2500단어"
-        },
-        "listicle": {
-            "name": "리스트 형태 글",
-            "description": "목록 형태의 콘텐츠",
-            "structure": ["도입부", "리스트 항목", "결론"],
-            "recommended_length": "800-2000단어"
-        },
-        "news_article": {
-            "name": "뉴스 기사",
-            "description": "뉴스 형태의 글",
-            "structure": ["헤드라인", "리드", "본문", "결론"],
-            "recommended_length": "400-1000단어"
+@router.get('/bulk-jobs/{job_id}')
+def get_bulk_job(job_id: int, current_user = Depends(get_current_user), db: Session = Depends(get_db)):
+    """대량 콘텐츠 생성 작업 진행 상황 및 결과 조회"""
+    job = bulk_job_service.get_job(db, current_user.id, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+    
+    return {
+        "success": True,
+        "data": bulk_job_service.summarize(job)
+    }
+
+@router.get('/generated')
+def list_generated_contents(limit: int = 20, cursor: Optional[str] = None, status: Optional[str] = None,
+                            keyword: Optional[str] = None, current_user = Depends(get_current_user),
+                            db: Session = Depends(get_db)):
+    """저장된 생성 콘텐츠 요약 목록 (최신순, cursor 기반 페이지네이션)"""
+    try:
+        records, next_cursor = content_store.list(db, current_user.id, limit=limit, cursor=cursor,
+                                                  status=status, keyword=keyword)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return {
+        "success": True,
+        "data": {
+            "items": [record.to_summary() for record in records],
+            "next_cursor": next_cursor
         }
     }
+
+@router.get('/generated/{content_id}')
+def get_generated_content(content_id: int, current_user = Depends(get_current_user), db: Session = Depends(get_db)):
+    """저장된 생성 콘텐츠 전체 조회"""
+    record = content_store.get(db, current_user.id, content_id)
+    if not record:
+        raise HTTPException(status_code=404, detail="콘텐츠를 찾을 수 없습니다.")
     
     return {
         "success": True,
-        "data": templates
+        "data": content_store.to_detail(record)
+    }
+
+@router.patch('/generated/{content_id}')
+def update_generated_content(content_id: int, payload: GeneratedContentUpdateRequest,
+                             current_user = Depends(get_current_user), db: Session = Depends(get_db)):
+    """저장된 생성 콘텐츠 상태 변경 (draft, published, archived)"""
+    record = content_store.get(db, current_user.id, content_id)
+    if not record:
+        raise HTTPException(status_code=404, detail="콘텐츠를 찾을 수 없습니다.")
+    try:
+        record = content_store.update_status(db, record, payload.status)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return {
+        "success": True,
+        "data": record.to_summary()
+    }
+
+@router.delete('/generated/{content_id}')
+def delete_generated_content(content_id: int, current_user = Depends(get_current_user), db: Session = Depends(get_db)):
+    """저장된 생성 콘텐츠 삭제"""
+    record = content_store.get(db, current_user.id, content_id)
+    if not record:
+        raise HTTPException(status_code=404, detail="콘텐츠를 찾을 수 없습니다.")
+    content_store.delete(db, record)
+    
+    return {
+        "success": True,
+        "message": "콘텐츠가 삭제되었습니다."
+    }
+
+@router.post('/derivative-batches')
+def submit_derivative_batch(payload: DerivativeBatchRequest, current_user = Depends(get_current_user), db: Session = Depends(get_db)):
+    """여러 콘텐츠의 변형/소셜 게시물 생성을 OpenAI Batch API 오프라인 작업으로 등록"""
+    if not payload.contents:
+        raise HTTPException(status_code=400, detail="콘텐츠는 필수입니다.")
+    if payload.variation_count == 0 and not payload.include_social:
+        raise HTTPException(status_code=400, detail="변형 또는 소셜 게시물 중 하나 이상을 요청해야 합니다.")
+    
+    content_generator = AdvancedContentGenerator(
+        api_key=os.getenv("OPENAI_API_KEY"),
+        user_id=current_user.id
+    )
+    try:
+        batch_id = content_generator.submit_derivative_batch(
+            payload.contents,
+            payload.variation_count,
+            payload.include_social,
+            db=db
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    return {
+        "success": True,
+        "data": {"batch_id": batch_id, "total_requested": len(payload.contents)}
+    }
+
+@router.get('/derivative-batches/{batch_id}')
+def get_derivative_batch(batch_id: str, current_user = Depends(get_current_user), db: Session = Depends(get_db)):
+    """Batch API 작업 상태 조회 - 완료 시 콘텐츠 순서(content-N)별 결과 반환"""
+    content_generator = AdvancedContentGenerator(
+        api_key=os.getenv("OPENAI_API_KEY"),
+        user_id=current_user.id
+    )
+    try:
+        batch = content_generator.collect_derivative_batch(batch_id, db=db)
+    except (LookupError, NotFoundError):
+        raise HTTPException(status_code=404, detail="배치 작업을 찾을 수 없습니다.")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    return {
+        "success": True,
+        "data": batch
+    }
+
+@router.get('/content-templates')
+def get_content_templates(user = Depends(get_current_user)):
+    """사용 가능한 콘텐츠 템플릿 조회"""
+    return {
+        "success": True,
+        "data": CONTENT_TEMPLATES
     }
 
 @router.get('/tone-options')
 def get_tone_options(user = Depends(get_current_user)):
     """사용 가능한 톤 옵션 조회"""
-    tones = {
-        "professional": {
-            "name": "전문적",
-            "description": "공식적이고 전문적인 어조"
-        },
-        "casual": {
-            "name": "캐주얼",
-            "description": "편안하고 친근한 어조"
-        },
-        "friendly": {
-            "name": "친근한",
-            "description": "따뜻하고 접근하기 쉬운 어조"
-        },
-        "authoritative": {
-            "name": "권위적",
-            "description": "확신에 찬 전문가적 어조"
-        },
-        "conversational": {
-            "name": "대화형",
-            "description": "대화하는 듯한 자연스러운 어조"
-        }
+    return {
+        "success": True,
+        "data": TONE_OPTIONS
+    }
+
+@router.get('/audience-options')
+def get_audience_options(user = Depends(get_current_user)):
+    """사용 가능한 타겟 독자 옵션 조회"""
+    return {
+        "success": True,
+        "data": AUDIENCE_OPTIONS
+    }
+
+@router.get('/prompt-templates')
+def list_prompt_templates(current_user = Depends(get_current_user), db: Session = Depends(get_db)):
+    """사용자 정의 프롬프트 템플릿 목록"""
+    templates = db.query(PromptTemplate).filter(
+        PromptTemplate.user_id == current_user.id
+    ).order_by(PromptTemplate.id).all()
+    return {
+        "success": True,
+        "data": [t.to_dict() for t in templates]
+    }
+
+@router.post('/prompt-templates', status_code=201)
+def create_prompt_template(payload: PromptTemplateRequest, current_user = Depends(get_current_user), db: Session = Depends(get_db)):
+    """사용자 정의 프롬프트 템플릿 등록 (같은 유형/로케일에서는 가장 최근 활성 템플릿 사용)"""
+    try:
+        prompt_registry.validate(payload.source)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    template = PromptTemplate(
+        user_id=current_user.id,
+        name=payload.name,
+        content_type=payload.content_type,
+        locale=payload.locale,
+        source=payload.source,
+        is_active=payload.is_active
+    )
+    db.add(template)
+    db.commit()
+    db.refresh(template)
+    prompt_registry.invalidate_user(current_user.id)
+    
+    return {
+        "success": True,
+        "data": template.to_dict()
     }
+
+@router.put('/prompt-templates/{template_id}')
+def update_prompt_template(template_id: int, payload: PromptTemplateRequest, current_user = Depends(get_current_user), db: Session = Depends(get_db)):
+    """사용자 정의 프롬프트 템플릿 수정"""
+    template = db.query(PromptTemplate).filter(
+        PromptTemplate.id == template_id,
+        PromptTemplate.user_id == current_user.id
+    ).first()
+    if not template:
+        raise HTTPException(status_code=404, detail="템플릿을 찾을 수 없습니다.")
+    try:
+        prompt_registry.validate(payload.source)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    template.name = payload.name
+    template.content_type = payload.content_type
+    template.locale = payload.locale
+    template.source = payload.source
+    template.is_active = payload.is_active
+    db.commit()
+    db.refresh(template)
+    prompt_registry.invalidate_user(current_user.id)
     
     return {
         "success": True,
-        "data": tones
+        "data": template.to_dict()
     }
 
+@router.delete('/prompt-templates/{template_id}')
+def delete_prompt_template(template_id: int, current_user = Depends(get_current_user), db: Session = Depends(get_db)):
+    """사용자 정의 프롬프트 템플릿 삭제"""
+    template = db.query(PromptTemplate).filter(
+        PromptTemplate.id == template_id,
+        PromptTemplate.user_id == current_user.id
+    ).first()
+    if not template:
+        raise HTTPException(status_code=404, detail="템플릿을 찾을 수 없습니다.")
+    
+    db.delete(template)
+    db.commit()
+    prompt_registry.invalidate_user(current_user.id)
+    
+    return {"success": True, "message": "템플릿이 삭제되었습니다."}
+
 def generate_optimization_suggestions(seo_analysis: dict) -> List[str]:
     """SEO 분석 결과를 바탕으로 최적화 제안 생성"""
     suggestions = []
@@ -360,6 +585,8 @@ def generate_basic_content(payload: ContentRequest, current_user = Depends(get_c
             'title': content_result['title'],
             'generated_at': content_result['generated_at']
         }
+    except TokenBudgetExceeded as e:
+        raise HTTPException(status_code=429, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -8,6 +8,11 @@ from src.models.user import User
 from src.models.llm_provider import LLMProvider
 from src.services.auth_service import get_current_user
 from src.services.llm_service import LLMService
+from src.services.llm_telemetry import TokenBudgetExceeded, llm_telemetry
+from src.services.model_registry import model_registry
+from src.services.ollama_backend import ollama_backend
+from src.services.provider_cache import provider_cache
+from src.services.provider_router import provider_router
 
 router = APIRouter()
 
@@ -17,6 +22,7 @@ class LLMProviderCreate(BaseModel):
     api_key: Optional[str] = None
     base_url: Optional[str] = None
     model_name: str
+    use_for_routing: bool = False
 
 class LLMProviderResponse(BaseModel):
     id: int
@@ -75,12 +81,16 @@ async def create_llm_provider(
         api_key=provider_data.api_key,
         base_url=provider_data.base_url,
         model_name=provider_data.model_name,
-        is_active=True
+        is_active=True,
+        use_for_routing=provider_data.use_for_routing
     )
     
     db.add(new_provider)
     db.commit()
     db.refresh(new_provider)
+    provider_cache.invalidate(current_user.id)
+    if new_provider.provider_type == 'ollama':
+        ollama_backend.warm_up_in_background(new_provider.model_name, new_provider.base_url)
     
     return {"message": "LLM 제공자가 성공적으로 추가되었습니다.", "provider_id": new_provider.id}
 
@@ -104,6 +114,7 @@ async def delete_llm_provider(
     
     db.delete(provider)
     db.commit()
+    provider_cache.invalidate(current_user.id)
     
     return {"message": "LLM 제공자가 성공적으로 삭제되었습니다."}
 
@@ -126,8 +137,12 @@ async def update_llm_provider(
     provider.api_key = provider_data.api_key
     provider.base_url = provider_data.base_url
     provider.model_name = provider_data.model_name
+    provider.use_for_routing = provider_data.use_for_routing
     db.commit()
     db.refresh(provider)
+    provider_cache.invalidate(current_user.id)
+    if provider.provider_type == 'ollama' and provider.is_active:
+        ollama_backend.warm_up_in_background(provider.model_name, provider.base_url)
     return {"message": "LLM 제공자 정보가 수정되었습니다."}
 
 @router.put("/providers/{provider_id}/toggle-active")
@@ -156,12 +171,24 @@ async def toggle_llm_provider_active(
     provider.is_active = True
     db.commit()
     db.refresh(provider)
+    provider_cache.invalidate(current_user.id)
+    if provider.provider_type == 'ollama':
+        ollama_backend.warm_up_in_background(provider.model_name, provider.base_url)
     
     return {
         "message": f"LLM 제공자 '{provider.name}'이 활성화되었습니다.",
         "provider_id": provider.id
     }
 
+@router.get("/providers/routing")
+async def get_provider_routing_status(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """제공자별 진행 중 요청 수 및 회로 차단기 상태 조회"""
+    providers = provider_cache.get_providers(db, current_user.id)
+    return {"providers": provider_router.status(providers)}
+
 @router.get("/models")
 async def get_available_models(
     current_user: User = Depends(get_current_user)
@@ -172,6 +199,15 @@ async def get_available_models(
         "ollama": ["llama3.1:latest", "qwen3:30b", "hermes3:8b", "qwen2.5vl:7b"]
     }
 
+@router.get("/model-spec")
+async def get_model_spec(
+    model: str,
+    provider_type: str = 'openai',
+    current_user: User = Depends(get_current_user)
+):
+    """모델의 컨텍스트 길이/최대 출력 토큰 수 조회 (등록되지 않은 모델은 제공자 기본값)"""
+    return model_registry.get(model, provider_type).to_dict()
+
 @router.post("/test")
 async def test_llm_connection(
     provider_data: LLMProviderCreate,
@@ -191,7 +227,7 @@ async def test_llm_connection(
         api_key = str(provider.api_key) if provider and provider.api_key else provider_data.api_key
         
         llm_service = LLMService()
-        result = llm_service.test_connection(
+        result = await llm_service.test_connection(
             provider_type=provider_data.provider_type,
             api_key=api_key,
             base_url=provider_data.base_url,
@@ -210,14 +246,17 @@ async def generate_content(
 ):
     """LLM을 사용하여 콘텐츠 생성"""
     try:
+        llm_telemetry.check_budget(db, current_user.id)
         llm_service = LLMService()
-        content = await llm_service.generate_content(prompt, model)
+        content = await llm_service.generate_content(prompt, model, user_id=current_user.id)
         
         return {
             "content": content,
             "model": model,
             "prompt": prompt
         }
+    except TokenBudgetExceeded as e:
+        raise HTTPException(status_code=429, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
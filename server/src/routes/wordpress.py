@@ -2,15 +2,18 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from typing import List, Optional
-from datetime import datetime
 
 from src.db import get_db
 from src.utils.dependencies import get_current_user
-from src.services.wordpress_service import WordPressService
+from src.utils.sse import sse_response
+from src.services.bulk_publish import bulk_publish_service
+from src.services.wordpress_service import WordPressService, WordPressTransientError
 
 router = APIRouter()
 
-# WordPress 서비스 인스턴스
+MAX_BULK_PUBLISH_ITEMS = 5000
+
+# WordPress 서비스 인스턴스 (사이트는 DB에 저장, 워커 간 공유)
 wp_service = WordPressService()
 
 class WordPressSiteRequest(BaseModel):
@@ -36,11 +39,26 @@ class PostCreationRequest(BaseModel):
     meta_description: Optional[str] = None
     meta_keywords: Optional[str] = None
 
+class BulkPublishPost(BaseModel):
+    content_id: Optional[int] = None  # 저장된 생성 결과 (title/content를 주면 덮어씀)
+    title: Optional[str] = None
+    content: Optional[str] = None
+    categories: Optional[List[str]] = None
+    tags: Optional[List[str]] = None
+    excerpt: Optional[str] = None
+    meta_description: Optional[str] = None
+
+class BulkPublishRequest(BaseModel):
+    site_ids: List[int]
+    posts: List[BulkPublishPost]
+    status: str = 'draft'  # draft, publish, private
+
 @router.post('/connect')
-def connect_wordpress_site(payload: WordPressSiteRequest, user = Depends(get_current_user)):
+def connect_wordpress_site(payload: WordPressSiteRequest, user = Depends(get_current_user), db: Session = Depends(get_db)):
     """WordPress 사이트 연결"""
     try:
         site = wp_service.add_site(
+            db,
             user_id=user.id,
             name=payload.name,
             url=payload.url,
@@ -51,7 +69,7 @@ def connect_wordpress_site(payload: WordPressSiteRequest, user = Depends(get_cur
         return {
             "success": True,
             "message": "WordPress 사이트가 성공적으로 연결되었습니다.",
-            "site": site
+            "site": site.to_dict()
         }
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -71,22 +89,23 @@ def test_connection(payload: WordPressTestRequest, user = Depends(get_current_us
         }
 
 @router.get('/sites')
-def get_wordpress_sites(user = Depends(get_current_user)):
+def get_wordpress_sites(user = Depends(get_current_user), db: Session = Depends(get_db)):
     """사용자의 WordPress 사이트 목록 조회"""
     try:
-        sites = wp_service.get_user_sites(user.id)
+        sites = wp_service.get_user_sites(db, user.id)
         return {
             "success": True,
-            "sites": sites
+            "sites": [site.to_dict() for site in sites]
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.put('/sites/{site_id}')
-def update_wordpress_site(site_id: int, payload: WordPressSiteRequest, user = Depends(get_current_user)):
+def update_wordpress_site(site_id: int, payload: WordPressSiteRequest, user = Depends(get_current_user), db: Session = Depends(get_db)):
     """WordPress 사이트 정보 수정"""
     try:
         site = wp_service.update_site(
+            db,
             user_id=user.id,
             site_id=site_id,
             name=payload.name,
@@ -98,7 +117,7 @@ def update_wordpress_site(site_id: int, payload: WordPressSiteRequest, user = De
         return {
             "success": True,
             "message": "사이트 정보가 성공적으로 수정되었습니다.",
-            "site": site
+            "site": site.to_dict()
         }
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -106,10 +125,10 @@ def update_wordpress_site(site_id: int, payload: WordPressSiteRequest, user = De
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.delete('/sites/{site_id}')
-def delete_wordpress_site(site_id: int, user = Depends(get_current_user)):
+def delete_wordpress_site(site_id: int, user = Depends(get_current_user), db: Session = Depends(get_db)):
     """WordPress 사이트 삭제"""
     try:
-        wp_service.delete_site(user.id, site_id)
+        wp_service.delete_site(db, user.id, site_id)
         
         return {
             "success": True,
@@ -121,10 +140,11 @@ def delete_wordpress_site(site_id: int, user = Depends(get_current_user)):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post('/post')
-def create_wordpress_post(payload: PostCreationRequest, user = Depends(get_current_user)):
+def create_wordpress_post(payload: PostCreationRequest, user = Depends(get_current_user), db: Session = Depends(get_db)):
     """WordPress 포스트 생성"""
     try:
         result = wp_service.create_post(
+            db,
             user_id=user.id,
             site_id=payload.site_id,
             title=payload.title,
@@ -142,16 +162,18 @@ def create_wordpress_post(payload: PostCreationRequest, user = Depends(get_curre
             "message": "포스트가 성공적으로 생성되었습니다.",
             "post": result
         }
+    except WordPressTransientError as e:
+        raise HTTPException(status_code=503, detail=f"WordPress 사이트가 일시적으로 응답하지 않습니다: {str(e)}")
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"포스트 생성 중 오류: {str(e)}")
 
 @router.get('/posts/{site_id}')
-def get_wordpress_posts(site_id: int, limit: int = 10, user = Depends(get_current_user)):
+def get_wordpress_posts(site_id: int, limit: int = 10, user = Depends(get_current_user), db: Session = Depends(get_db)):
     """WordPress 포스트 목록 조회"""
     try:
-        posts = wp_service.get_posts(user.id, site_id, limit)
+        posts = wp_service.get_posts(db, user.id, site_id, limit)
         
         return {
             "success": True,
@@ -163,33 +185,29 @@ def get_wordpress_posts(site_id: int, limit: int = 10, user = Depends(get_curren
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get('/sites/{site_id}/info')
-def get_site_info(site_id: int, user = Depends(get_current_user)):
+def get_site_info(site_id: int, user = Depends(get_current_user), db: Session = Depends(get_db)):
     """WordPress 사이트 정보 조회"""
-    try:
-        site = wp_service.get_site(user.id, site_id)
-        if not site:
-            raise HTTPException(status_code=404, detail="사이트를 찾을 수 없습니다.")
-        
-        return {
-            "success": True,
-            "site": site
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    site = wp_service.get_site(db, user.id, site_id)
+    if not site:
+        raise HTTPException(status_code=404, detail="사이트를 찾을 수 없습니다.")
+    
+    return {
+        "success": True,
+        "site": site.to_dict()
+    }
 
 @router.post('/sites/{site_id}/test')
-def test_site_connection(site_id: int, user = Depends(get_current_user)):
+def test_site_connection(site_id: int, user = Depends(get_current_user), db: Session = Depends(get_db)):
     """특정 사이트 연결 테스트"""
+    site = wp_service.get_site(db, user.id, site_id)
+    if not site:
+        raise HTTPException(status_code=404, detail="사이트를 찾을 수 없습니다.")
+    
     try:
-        site = wp_service.get_site(user.id, site_id)
-        if not site:
-            raise HTTPException(status_code=404, detail="사이트를 찾을 수 없습니다.")
-        
-        result = wp_service.test_connection(site['url'], site['username'], site['password'])
+        result = wp_service.test_connection(site.url, site.username, site.password or '')
         
         # 테스트 결과에 따라 사이트 상태 업데이트
-        site['last_tested'] = datetime.utcnow().isoformat()
-        site['status'] = 'connected' if result['success'] else 'disconnected'
+        wp_service.record_test_result(db, user.id, site_id, result['success'])
         
         return result
     except Exception as e:
@@ -199,23 +217,71 @@ def test_site_connection(site_id: int, user = Depends(get_current_user)):
         }
 
 @router.put('/sites/{site_id}/toggle-active')
-def toggle_site_active(site_id: int, user = Depends(get_current_user)):
+def toggle_site_active(site_id: int, user = Depends(get_current_user), db: Session = Depends(get_db)):
     """WordPress 사이트 활성화 상태 토글"""
     try:
-        site = wp_service.get_site(user.id, site_id)
-        if not site:
-            raise HTTPException(status_code=404, detail="사이트를 찾을 수 없습니다.")
-        
         # 다른 사이트들을 비활성화하고 현재 사이트를 활성화
-        sites = wp_service.get_user_sites(user.id)
-        for s in sites:
-            s['is_active'] = (s['id'] == site_id)
+        site = wp_service.set_active_site(db, user.id, site_id)
         
         return {
             "success": True,
-            "message": f"사이트 '{site['name']}'이 활성화되었습니다.",
-            "site": site
+            "message": f"사이트 '{site.name}'이 활성화되었습니다.",
+            "site": site.to_dict()
         }
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+
+@router.post('/bulk-publish')
+def bulk_publish(payload: BulkPublishRequest, user = Depends(get_current_user), db: Session = Depends(get_db)):
+    """글 여러 개를 여러 사이트에 게시하는 작업 등록 - 작업 ID를 즉시 반환"""
+    total = len(payload.posts) * len(set(payload.site_ids))
+    if total > MAX_BULK_PUBLISH_ITEMS:
+        raise HTTPException(status_code=400, detail=f"대량 게시는 최대 {MAX_BULK_PUBLISH_ITEMS}건(글 수 x 사이트 수)까지 가능합니다.")
+    
+    try:
+        job = bulk_publish_service.create_job(
+            db,
+            user_id=user.id,
+            posts=[post.model_dump() for post in payload.posts],
+            site_ids=payload.site_ids,
+            post_status=payload.status
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    try:
+        bulk_publish_service.enqueue(job.id)
+        
+        return {
+            "success": True,
+            "data": {
+                "job_id": job.id,
+                "status": job.status,
+                "total_items": job.total_items
+            }
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get('/bulk-publish/{job_id}')
+def get_bulk_publish_job(job_id: int, include_items: bool = True, user = Depends(get_current_user), db: Session = Depends(get_db)):
+    """대량 게시 작업 진행 상황 및 항목별 결과 조회"""
+    job = bulk_publish_service.get_job(db, user.id, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+    
+    return {
+        "success": True,
+        "data": bulk_publish_service.summarize(job, include_items=include_items)
+    }
+
+@router.get('/bulk-publish/{job_id}/stream')
+def stream_bulk_publish_job(job_id: int, user = Depends(get_current_user), db: Session = Depends(get_db)):
+    """대량 게시 항목별 상태 스트리밍 (SSE)"""
+    if not bulk_publish_service.get_job(db, user.id, job_id):
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+    
+    return sse_response(bulk_publish_service.stream_events(user.id, job_id))
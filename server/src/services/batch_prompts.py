@@ -0,0 +1,121 @@
+import io
+import json
+from typing import Dict, List, Optional
+
+from src.services.structured_output import extract_json_object
+
+SOCIAL_PLATFORMS = {
+    'facebook': '페이스북 게시물 (2-3문장, 이모지 허용)',
+    'twitter': '트위터 게시물 (공백 포함 200자 이내)',
+    'linkedin': '링크드인 게시물 (전문적인 톤, 3-4문장)'
+}
+
+BATCH_SYSTEM_PROMPT = "당신은 전문적인 SEO 콘텐츠 작성자입니다. 항상 유효한 JSON 객체 하나만 출력합니다."
+
+def variation_tasks(variation_count: int) -> Dict[str, Dict]:
+    """콘텐츠 변형 하위 작업 목록 (id -> 지시/출력 형식)"""
+    return {
+        f'variation_{i + 1}': {
+            'instruction': f"원문을 바탕으로 {i + 1}번째 변형을 작성 (다른 변형과 도입부/관점이 겹치지 않게, 제목과 본문 모두 재작성)",
+            'output': {'title': '문자열', 'content': '마크다운 문자열'}
+        }
+        for i in range(variation_count)
+    }
+
+def social_tasks() -> Dict[str, Dict]:
+    """소셜 미디어 하위 작업 목록"""
+    return {
+        platform: {
+            'instruction': f"원문을 홍보하는 {description}",
+            'output': {'text': '문자열', 'hashtags': ['#해시태그']}
+        }
+        for platform, description in SOCIAL_PLATFORMS.items()
+    }
+
+def build_batch_prompt(content: Dict, tasks: Dict[str, Dict]) -> str:
+    """공통 원문을 한 번만 넣고 여러 하위 작업을 하나의 JSON 응답으로 요청"""
+    if not tasks:
+        raise ValueError("하위 작업이 하나 이상 필요합니다.")
+    task_lines = '\n'.join(
+        f"- {task_id}: {task['instruction']} / 형식: {json.dumps(task['output'], ensure_ascii=False)}"
+        for task_id, task in tasks.items()
+    )
+    return f"""
+다음 원문을 바탕으로 아래 작업을 모두 한국어로 수행해주세요.
+
+원문 제목: {content.get('title', '')}
+메인 키워드: {content.get('keyword', '')}
+원문:
+{content.get('content', '')}
+
+작업 목록:
+{task_lines}
+
+응답은 작업 id를 키로 하는 JSON 객체 하나로만 작성해주세요. 예: {{"{next(iter(tasks))}": {{...}}}}
+            """
+
+def parse_batch_response(text: str, task_ids: List[str]) -> Dict[str, Dict]:
+    """JSON 응답을 작업별 결과로 분리 (코드 블록/앞뒤 설명 허용, 누락된 작업은 제외)"""
+    data = extract_json_object(text)
+    data = data.get('results', data) if isinstance(data.get('results'), dict) else data
+    return {task_id: data[task_id] for task_id in task_ids if isinstance(data.get(task_id), dict)}
+
+class OpenAIBatchClient:
+    """오프라인 작업용 OpenAI Batch API 래퍼 (JSONL 업로드 → 배치 생성 → 결과 수집)"""
+
+    endpoint = '/v1/chat/completions'
+
+    def __init__(self, client, completion_window: str = '24h'):
+        self.client = client
+        self.completion_window = completion_window
+
+    def build_request(self, custom_id: str, prompt: str, model: str, max_tokens: int = 4000) -> Dict:
+        return {
+            'custom_id': custom_id,
+            'method': 'POST',
+            'url': self.endpoint,
+            'body': {
+                'model': model,
+                'messages': [
+                    {'role': 'system', 'content': BATCH_SYSTEM_PROMPT},
+                    {'role': 'user', 'content': prompt}
+                ],
+                'max_tokens': max_tokens,
+                'temperature': 0.7,
+                'response_format': {'type': 'json_object'}
+            }
+        }
+
+    def submit(self, requests: List[Dict], metadata: Optional[Dict] = None) -> str:
+        """요청 목록을 업로드하고 배치 ID 반환"""
+        payload = '\n'.join(json.dumps(r, ensure_ascii=False) for r in requests).encode('utf-8')
+        input_file = self.client.files.create(file=('batch.jsonl', io.BytesIO(payload)), purpose='batch')
+        batch = self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint=self.endpoint,
+            completion_window=self.completion_window,
+            metadata=metadata
+        )
+        return batch.id
+
+    def collect(self, batch_id: str) -> Dict:
+        """배치 상태와 (완료 시) custom_id별 응답 텍스트 또는 오류"""
+        batch = self.client.batches.retrieve(batch_id)
+        result = {'batch_id': batch.id, 'status': batch.status, 'metadata': batch.metadata or {},
+                  'outputs': {}, 'errors': {}}
+        if batch.status != 'completed':
+            return result
+
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            for line in self.client.files.content(file_id).text.splitlines():
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                response = record.get('response') or {}
+                if record.get('error') or response.get('status_code') != 200:
+                    result['errors'][record['custom_id']] = record.get('error') or response.get('body')
+                    continue
+                result['outputs'][record['custom_id']] = response['body']['choices'][0]['message']['content']
+        return result
@@ -0,0 +1,195 @@
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# 제공자별 기본 동시 실행 수 (Ollama 서버 한 대는 적게, OpenAI는 넉넉하게)
+DEFAULT_PROVIDER_CONCURRENCY = {
+    'openai': 8,
+    'anthropic': 4,
+    'ollama': 2,
+    'demo': 16
+}
+
+def load_provider_concurrency(value: Optional[str] = None) -> Dict[str, int]:
+    """LLM_PROVIDER_CONCURRENCY 환경변수("openai=8,ollama=2") 파싱"""
+    limits = dict(DEFAULT_PROVIDER_CONCURRENCY)
+    value = value if value is not None else os.getenv('LLM_PROVIDER_CONCURRENCY', '')
+    for pair in value.split(','):
+        if '=' not in pair:
+            continue
+        name, limit = pair.split('=', 1)
+        try:
+            limits[name.strip()] = max(1, int(limit))
+        except ValueError:
+            continue
+    return limits
+
+class SlotAbandoned(Exception):
+    """타임아웃된 일괄 작업 항목이 새 제공자 호출을 시작하려 함"""
+
+class SlotHold:
+    """일괄 작업 항목 하나의 슬롯 상태 (실행기와 작업 스레드가 공유)"""
+
+    __slots__ = ('started_at', 'waiting', 'keys', 'timed_out')
+
+    def __init__(self):
+        # 슬롯을 기다린 시간은 빼고 타임아웃을 계산하도록 기다린 만큼 뒤로 미룸
+        self.started_at = time.monotonic()
+        self.waiting = False
+        self.keys: List[Tuple[str, str]] = []
+        self.timed_out = False
+
+class ProviderSlots:
+    """제공자 호스트별 동시 실행 슬롯 (프로세스 전역 세마포어)
+
+    일괄 작업 스레드(enforce 안)에서 라우터가 고른 제공자를 호출할 때 슬롯을 잡음.
+    타임아웃된 항목의 호출은 끝날 때까지 슬롯을 계속 차지하며 timed_out 수로 따로 집계됨
+    """
+
+    def __init__(self, limits: Dict[str, int]):
+        self.limits = limits
+        self._semaphores = {}
+        self._in_use: Dict[Tuple[str, str], int] = {}
+        self._timed_out: Dict[Tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def capacity(self, provider_type: str) -> int:
+        return self.limits.get(provider_type, 4)
+
+    @staticmethod
+    def key(provider_type: str, base_url: Optional[str] = None) -> Tuple[str, str]:
+        return (provider_type, (base_url or '').rstrip('/'))
+
+    def semaphore(self, provider_type: str, base_url: Optional[str] = None) -> threading.BoundedSemaphore:
+        """같은 호스트를 쓰는 작업끼리 슬롯을 공유"""
+        key = self.key(provider_type, base_url)
+        with self._lock:
+            if key not in self._semaphores:
+                self._semaphores[key] = threading.BoundedSemaphore(self.capacity(provider_type))
+            return self._semaphores[key]
+
+    @contextmanager
+    def enforce(self, hold: SlotHold):
+        """이 스레드의 제공자 호출이 슬롯을 잡도록 표시 (일괄 작업 항목 실행용)"""
+        self._local.hold = hold
+        try:
+            yield
+        finally:
+            self._local.hold = None
+
+    @contextmanager
+    def hold(self, provider_type: str, base_url: Optional[str] = None):
+        """enforce 안에서는 제공자 슬롯을 잡고 실행, 그 밖의 호출(대화형 요청)은 그대로 실행"""
+        hold = getattr(self._local, 'hold', None)
+        if hold is None:
+            yield
+            return
+        if hold.timed_out:
+            # 타임아웃된 항목은 장애 조치 등으로 새 호출을 시작하지 않음
+            raise SlotAbandoned("타임아웃된 항목입니다.")
+
+        key = self.key(provider_type, base_url)
+        semaphore = self.semaphore(provider_type, base_url)
+        waited_from = time.monotonic()
+        hold.waiting = True
+        semaphore.acquire()
+        hold.started_at += time.monotonic() - waited_from
+        hold.waiting = False
+        with self._lock:
+            self._in_use[key] = self._in_use.get(key, 0) + 1
+            hold.keys.append(key)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._in_use[key] -= 1
+                hold.keys.remove(key)
+                if hold.timed_out:
+                    self._timed_out[key] -= 1
+            semaphore.release()
+
+    def abandon(self, hold: SlotHold):
+        """타임아웃된 항목 - 진행 중인 호출이 끝날 때까지 잡은 슬롯을 timed_out으로 집계"""
+        with self._lock:
+            hold.timed_out = True
+            for key in hold.keys:
+                self._timed_out[key] = self._timed_out.get(key, 0) + 1
+
+    def usage(self, provider_type: str, base_url: Optional[str] = None) -> Dict[str, int]:
+        """호스트별 사용 중인 슬롯 수 (그중 타임아웃된 항목이 차지한 수)"""
+        key = self.key(provider_type, base_url)
+        with self._lock:
+            return {
+                'limit': self.capacity(provider_type),
+                'in_use': self._in_use.get(key, 0),
+                'timed_out': self._timed_out.get(key, 0)
+            }
+
+provider_slots = ProviderSlots(load_provider_concurrency())
+
+class BulkGenerationExecutor:
+    """제공자별 동시성 제한과 항목별 타임아웃을 갖는 병렬 실행기"""
+
+    def __init__(self, max_workers: int = 8, item_timeout: float = 180,
+                 slots: ProviderSlots = provider_slots):
+        self.max_workers = max_workers
+        self.item_timeout = item_timeout
+        self.slots = slots
+
+    def run(self, items: List[Any], fn: Callable[[Any], Any],
+            on_result: Callable[[Any, str, Any], None]):
+        """items를 병렬 실행하고 항목이 끝날 때마다 on_result(item, status, value) 호출
+
+        status는 success, failed, timeout 중 하나이며, 타임아웃은 항목 실행 시간에서 제공자
+        슬롯을 기다린 시간을 뺀 값으로 계산합니다. 타임아웃된 항목의 뒤늦은 결과는 버려지고,
+        그 스레드는 작업자 수에서 빠지므로 남은 항목은 새 스레드에서 계속 실행됩니다.
+        """
+        if not items:
+            return
+
+        workers = max(1, min(self.max_workers, len(items)))
+        results = queue.Queue()
+        running: Dict[int, SlotHold] = {}
+        next_index = 0
+
+        def run_one(index: int, hold: SlotHold):
+            try:
+                with self.slots.enforce(hold):
+                    value = fn(items[index])
+                results.put((index, 'success', value))
+            except Exception as e:
+                results.put((index, 'failed', e))
+
+        while running or next_index < len(items):
+            while next_index < len(items) and len(running) < workers:
+                running[next_index] = SlotHold()
+                threading.Thread(target=run_one, args=(next_index, running[next_index]), daemon=True).start()
+                next_index += 1
+
+            try:
+                index, status, value = results.get(timeout=self._next_deadline(running))
+            except queue.Empty:
+                pass
+            else:
+                if running.pop(index, None) is not None:
+                    on_result(items[index], status, value)
+
+            now = time.monotonic()
+            for index, hold in list(running.items()):
+                if not hold.waiting and now - hold.started_at >= self.item_timeout:
+                    running.pop(index)
+                    self.slots.abandon(hold)
+                    on_result(items[index], 'timeout', None)
+
+    def _next_deadline(self, running: Dict[int, SlotHold]) -> float:
+        now = time.monotonic()
+        remaining = [
+            hold.started_at + self.item_timeout - now
+            for hold in running.values() if not hold.waiting
+        ]
+        # 슬롯을 기다리는 항목이 있으면 주기적으로 다시 확인
+        return max(0.0, min(remaining + [1.0]))
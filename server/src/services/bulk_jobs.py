@@ -0,0 +1,195 @@
+import os
+import json
+from datetime import datetime
+from typing import Dict, List, Optional
+from sqlalchemy.orm import Session
+
+from src.db import SessionLocal
+from src.models.bulk_job import BulkJob, BulkJobItem
+from src.models.user import User  # 워커 프로세스에서도 관계 매핑이 해석되도록 로드
+from src.services.bulk_executor import BulkGenerationExecutor
+from src.services.content_generator import AdvancedContentGenerator
+from src.services.content_store import content_store
+from src.services.duplicate_index import duplicate_index
+from src.services.task_queue import celery_app
+
+class BulkJobService:
+    """대량 콘텐츠 생성 작업 관리 서비스 (작업 큐 기반)"""
+
+    def __init__(self, session_factory=SessionLocal, max_workers: int = 8, item_timeout: float = 180):
+        self.session_factory = session_factory
+        self.max_workers = max_workers
+        self.item_timeout = item_timeout
+
+    def create_job(self, db: Session, user_id: int, keywords: List[str], content_type: str = 'blog_post',
+                   tone: str = 'professional', target_audience: str = 'general',
+                   cache_mode: str = 'bypass') -> BulkJob:
+        """작업 및 키워드별 항목 생성"""
+        job = BulkJob(
+            user_id=user_id,
+            status='queued',
+            content_type=content_type,
+            tone=tone,
+            target_audience=target_audience,
+            cache_mode=cache_mode,
+            total_items=len(keywords)
+        )
+        job.items = [
+            BulkJobItem(position=position, keyword=keyword, status='pending')
+            for position, keyword in enumerate(keywords)
+        ]
+
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+        return job
+
+    def enqueue(self, job_id: int):
+        """작업을 큐에 등록"""
+        process_bulk_job.delay(job_id)
+
+    def get_job(self, db: Session, user_id: int, job_id: int) -> Optional[BulkJob]:
+        """사용자의 작업 조회"""
+        return db.query(BulkJob).filter(
+            BulkJob.id == job_id,
+            BulkJob.user_id == user_id
+        ).first()
+
+    def summarize(self, job: BulkJob) -> Dict:
+        """작업 진행 상황 및 결과 요약"""
+        results = [item.to_dict() for item in job.items]
+        successful = len([r for r in results if r["status"] == "success"])
+        failed = len([r for r in results if r["status"] == "failed"])
+        timed_out = len([r for r in results if r["status"] == "timeout"])
+        completed = successful + failed + timed_out
+
+        return {
+            "job_id": job.id,
+            "status": job.status,
+            "progress": {
+                "completed": completed,
+                "total": job.total_items,
+                "percent": round(completed / job.total_items * 100, 1) if job.total_items else 100.0
+            },
+            "total_requested": job.total_items,
+            "successful": successful,
+            "failed": failed,
+            "timed_out": timed_out,
+            "partial": job.status == 'completed' and successful < job.total_items,
+            "results": results,
+            "error": job.error,
+            "created_at": job.created_at.isoformat() if job.created_at else None,
+            "started_at": job.started_at.isoformat() if job.started_at else None,
+            "finished_at": job.finished_at.isoformat() if job.finished_at else None
+        }
+
+    def run_job(self, job_id: int):
+        """작업 실행 - 완료되지 않은 항목만 처리하므로 재시도 시에도 안전"""
+        db = self.session_factory()
+        try:
+            job = db.get(BulkJob, job_id)
+            if not job or job.status == 'completed':
+                return
+
+            job.status = 'running'
+            job.started_at = job.started_at or datetime.utcnow()
+            db.commit()
+
+            options = {
+                'user_id': job.user_id,
+                'content_type': job.content_type,
+                'tone': job.tone,
+                'target_audience': job.target_audience,
+                'cache_mode': job.cache_mode
+            }
+            pending = [(item.id, item.keyword) for item in job.items
+                       if item.status not in ('success', 'failed', 'timeout')]
+        finally:
+            db.close()
+
+        db = self.session_factory()
+        try:
+            def on_result(entry, status, value):
+                save_error = None
+                if status == 'success' and not value.get('demo_mode'):
+                    # 저장에 실패해도 생성 결과는 항목에 남기고 나머지 항목을 계속 처리
+                    try:
+                        record = content_store.save(
+                            db, options['user_id'], value, source='bulk', bulk_job_id=job_id
+                        )
+                        value['content_id'] = record.id
+                        # 같은 작업에서 동시에 생성된 항목은 생성 시점에 서로 보이지 않으므로 저장 후 다시 확인
+                        duplicate = duplicate_index.check(db, options['user_id'], value.get('content', ''),
+                                                          exclude_id=record.id)
+                        value['duplicate'] = {**(value.get('duplicate') or {}), **duplicate}
+                    except Exception as e:
+                        db.rollback()
+                        print(f"대량 작업 {job_id} 콘텐츠 저장 오류: {e}")
+                        save_error = f"콘텐츠 저장 실패: {e}"
+
+                item = db.get(BulkJobItem, entry[0])
+                item.status = status
+                if status == 'success':
+                    item.result = json.dumps(value, ensure_ascii=False)
+                    item.error = save_error
+                elif status == 'timeout':
+                    item.error = f"{self.item_timeout:g}초 안에 생성이 끝나지 않았습니다."
+                else:
+                    item.error = str(value)
+                item.finished_at = datetime.utcnow()
+                db.commit()
+
+            executor = BulkGenerationExecutor(max_workers=self.max_workers, item_timeout=self.item_timeout)
+            # 제공자별 동시 실행 수는 항목마다 라우터가 고른 제공자의 슬롯으로 제한
+            executor.run(pending, lambda entry: self._generate_item(entry[0], options), on_result)
+            self._finish_job(job_id, 'completed')
+        except Exception as e:
+            self._finish_job(job_id, 'failed', str(e))
+            raise
+        finally:
+            db.close()
+
+    def _generate_item(self, item_id: int, options: Dict) -> Dict:
+        """단일 키워드 콘텐츠 생성 (워커 스레드에서 실행)"""
+        db = self.session_factory()
+        try:
+            item = db.get(BulkJobItem, item_id)
+            item.status = 'running'
+            item.started_at = datetime.utcnow()
+            db.commit()
+
+            content_generator = AdvancedContentGenerator(
+                api_key=os.getenv("OPENAI_API_KEY"),
+                user_id=options['user_id']
+            )
+            return content_generator.generate_seo_optimized_content(
+                keyword=item.keyword,
+                content_type=options['content_type'],
+                tone=options['tone'],
+                target_audience=options['target_audience'],
+                db=db,
+                cache_mode=options['cache_mode']
+            )
+        finally:
+            db.close()
+
+    def _finish_job(self, job_id: int, status: str, error: str = None):
+        db = self.session_factory()
+        try:
+            job = db.get(BulkJob, job_id)
+            job.status = status
+            job.error = error
+            job.finished_at = datetime.utcnow()
+            db.commit()
+        finally:
+            db.close()
+
+bulk_job_service = BulkJobService(
+    max_workers=int(os.getenv("BULK_JOB_WORKERS", "8")),
+    item_timeout=float(os.getenv("BULK_ITEM_TIMEOUT", "180"))
+)
+
+@celery_app.task(name="bulk_jobs.process_bulk_job")
+def process_bulk_job(job_id: int):
+    """대량 콘텐츠 생성 작업 처리"""
+    bulk_job_service.run_job(job_id)
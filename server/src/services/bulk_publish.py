@@ -0,0 +1,320 @@
+import os
+import json
+import random
+import time
+from collections import OrderedDict, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from sqlalchemy.orm import Session
+
+from src.db import SessionLocal
+from src.models.publish_job import PublishJob, PublishJobItem
+from src.models.user import User  # 워커 프로세스에서도 관계 매핑이 해석되도록 로드
+from src.services.content_store import content_store
+from src.services.task_queue import celery_app
+from src.services.wordpress_service import WordPressService, WordPressTransientError
+
+POST_STATUSES = ('draft', 'publish', 'private')
+
+class BulkPublishService:
+    """글 N개 x 사이트 M개 대량 게시 작업 관리 (작업 큐 기반, 사이트별 동시성 제한)"""
+
+    def __init__(self, session_factory=SessionLocal, wordpress: WordPressService = None,
+                 max_workers: int = 16, site_concurrency: int = 2, max_retries: int = 3,
+                 backoff_base: float = 1.0, backoff_max: float = 30.0, lookup_margin: float = 60):
+        self.session_factory = session_factory
+        self.wordpress = wordpress if wordpress is not None else WordPressService()
+        # 전체 동시 게시 수와 사이트 하나에 동시에 게시하는 글 수
+        self.max_workers = max_workers
+        self.site_concurrency = site_concurrency
+        # 429/5xx 응답의 재시도 횟수와 지수 백오프 (Retry-After가 있으면 우선)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        # 500/502/504 후 게시 여부를 확인할 때 시도 시각 이전으로 넓히는 범위(초)
+        self.lookup_margin = lookup_margin
+
+    def create_job(self, db: Session, user_id: int, posts: List[Dict], site_ids: List[int],
+                   post_status: str = 'draft') -> PublishJob:
+        """작업 및 (글, 사이트)별 항목 생성 - 사이트/콘텐츠가 사용자 소유가 아니면 ValueError"""
+        if post_status not in POST_STATUSES:
+            raise ValueError(f"status는 {', '.join(POST_STATUSES)} 중 하나여야 합니다.")
+        site_ids = list(dict.fromkeys(site_ids))
+        if not site_ids or not posts:
+            raise ValueError("게시할 글과 사이트가 하나 이상 필요합니다.")
+        known_sites = {site.id for site in self.wordpress.get_user_sites(db, user_id)}
+        unknown = [site_id for site_id in site_ids if site_id not in known_sites]
+        if unknown:
+            raise ValueError(f"사이트를 찾을 수 없습니다: {', '.join(map(str, unknown))}")
+
+        prepared = []
+        for position, post in enumerate(posts):
+            options = {key: value for key, value in post.items() if value is not None and key != 'content_id'}
+            content_id = post.get('content_id')
+            if content_id is not None:
+                record = content_store.get(db, user_id, content_id)
+                if not record:
+                    raise ValueError(f"{position + 1}번째 글의 콘텐츠를 찾을 수 없습니다: {content_id}")
+                title = options.get('title') or record.title
+            elif options.get('title') and options.get('content'):
+                title = options['title']
+            else:
+                raise ValueError(f"{position + 1}번째 글에는 content_id 또는 title과 content가 필요합니다.")
+            prepared.append((content_id, title, json.dumps(options, ensure_ascii=False)))
+
+        job = PublishJob(
+            user_id=user_id,
+            status='queued',
+            post_status=post_status,
+            total_items=len(prepared) * len(site_ids)
+        )
+        job.items = [
+            PublishJobItem(position=post_index * len(site_ids) + site_index, site_id=site_id,
+                           content_id=content_id, title=title[:500], payload=payload, status='pending')
+            for post_index, (content_id, title, payload) in enumerate(prepared)
+            for site_index, site_id in enumerate(site_ids)
+        ]
+
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+        return job
+
+    def enqueue(self, job_id: int):
+        """작업을 큐에 등록"""
+        process_publish_job.delay(job_id)
+
+    def get_job(self, db: Session, user_id: int, job_id: int) -> Optional[PublishJob]:
+        """사용자의 작업 조회"""
+        return db.query(PublishJob).filter(
+            PublishJob.id == job_id,
+            PublishJob.user_id == user_id
+        ).first()
+
+    def summarize(self, job: PublishJob, include_items: bool = True) -> Dict:
+        """작업 진행 상황, 사이트별 집계 및 항목별 결과"""
+        sites = defaultdict(lambda: {'success': 0, 'failed': 0, 'pending': 0})
+        for item in job.items:
+            sites[item.site_id][item.status if item.status in ('success', 'failed') else 'pending'] += 1
+        successful = sum(site['success'] for site in sites.values())
+        failed = sum(site['failed'] for site in sites.values())
+        completed = successful + failed
+
+        summary = {
+            "job_id": job.id,
+            "status": job.status,
+            "post_status": job.post_status,
+            "progress": {
+                "completed": completed,
+                "total": job.total_items,
+                "percent": round(completed / job.total_items * 100, 1) if job.total_items else 100.0
+            },
+            "successful": successful,
+            "failed": failed,
+            "partial": job.status == 'completed' and successful < job.total_items,
+            "sites": {str(site_id): counts for site_id, counts in sites.items()},
+            "error": job.error,
+            "created_at": job.created_at.isoformat() if job.created_at else None,
+            "started_at": job.started_at.isoformat() if job.started_at else None,
+            "finished_at": job.finished_at.isoformat() if job.finished_at else None
+        }
+        if include_items:
+            summary["results"] = [item.to_dict() for item in job.items]
+        return summary
+
+    def stream_events(self, user_id: int, job_id: int, poll_interval: float = 1.0) -> Iterator[Dict]:
+        """항목 상태가 바뀔 때마다 item 이벤트, 작업이 끝나면 done 이벤트"""
+        seen: Dict[int, Tuple] = {}
+        while True:
+            db = self.session_factory()
+            try:
+                job = self.get_job(db, user_id, job_id)
+                if not job:
+                    yield {'type': 'error', 'message': '작업을 찾을 수 없습니다.'}
+                    return
+                for item in job.items:
+                    state = (item.status, item.attempts)
+                    if seen.get(item.id) != state:
+                        seen[item.id] = state
+                        yield {'type': 'item', **item.to_dict()}
+                if job.status in ('completed', 'failed'):
+                    yield {'type': 'done', **self.summarize(job, include_items=False)}
+                    return
+            finally:
+                db.close()
+            time.sleep(poll_interval)
+
+    def run_job(self, job_id: int):
+        """작업 실행 - 끝나지 않은 항목만 처리하므로 재시도 시에도 안전"""
+        db = self.session_factory()
+        try:
+            job = db.get(PublishJob, job_id)
+            if not job or job.status == 'completed':
+                return
+
+            job.status = 'running'
+            job.started_at = job.started_at or datetime.utcnow()
+            db.commit()
+
+            user_id, post_status = job.user_id, job.post_status
+            pending = [(item.id, item.site_id) for item in job.items if item.status not in ('success', 'failed')]
+        finally:
+            db.close()
+
+        db = self.session_factory()
+        try:
+            def on_result(entry, status, value):
+                item = db.get(PublishJobItem, entry[0])
+                item.status = status
+                if status == 'success':
+                    item.post_id = value.get('id')
+                    item.link = value.get('link')
+                    if value.get('skipped_terms'):
+                        item.skipped_terms = json.dumps(value['skipped_terms'], ensure_ascii=False)
+                    if post_status == 'publish' and item.content_id:
+                        record = content_store.get(db, user_id, item.content_id)
+                        if record and record.status != 'published':
+                            content_store.update_status(db, record, 'published')
+                else:
+                    item.error = str(value)
+                item.finished_at = datetime.utcnow()
+                db.commit()
+
+            self._schedule(pending, lambda entry: self._publish_item(entry[0], user_id, post_status), on_result)
+            self._finish_job(job_id, 'completed')
+        except Exception as e:
+            self._finish_job(job_id, 'failed', str(e))
+            raise
+        finally:
+            db.close()
+
+    def _schedule(self, entries: List[Tuple[int, int]], fn: Callable, on_result: Callable):
+        """(항목 ID, 사이트 ID) 목록을 병렬 실행 - 사이트별 동시 실행 수를 넘지 않게 사이트를 번갈아 배정
+
+        느린 사이트 하나가 전체 작업자를 차지하지 않도록 빈 작업자는 여유가 있는 다른
+        사이트의 항목으로 채웁니다. on_result는 호출한 스레드에서 실행됩니다.
+        """
+        queues = OrderedDict()
+        for entry in entries:
+            queues.setdefault(entry[1], deque()).append(entry)
+        in_flight = defaultdict(int)
+        running = {}
+
+        pool = ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(entries) or 1)))
+        try:
+            while queues or running:
+                for site_id in list(queues):
+                    if len(running) >= self.max_workers:
+                        break
+                    while in_flight[site_id] < self.site_concurrency and queues[site_id] and len(running) < self.max_workers:
+                        entry = queues[site_id].popleft()
+                        in_flight[site_id] += 1
+                        running[pool.submit(fn, entry)] = entry
+                    if queues[site_id]:
+                        # 이번에 배정받은 사이트는 다음 차례에서 뒤로
+                        queues.move_to_end(site_id)
+                    else:
+                        del queues[site_id]
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    entry = running.pop(future)
+                    in_flight[entry[1]] -= 1
+                    error = future.exception()
+                    if error is None:
+                        on_result(entry, 'success', future.result())
+                    else:
+                        on_result(entry, 'failed', error)
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _backoff(self, attempt: int, retry_after: Optional[float]) -> float:
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max)
+        delay = min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def _post_fields(self, db: Session, user_id: int, item: PublishJobItem) -> Dict:
+        """게시할 제목/본문/메타 정보 - 저장된 생성 결과가 있으면 거기서 읽고 요청 값으로 덮어씀"""
+        options = json.loads(item.payload)
+        fields = {'title': options.get('title'), 'content': options.get('content')}
+        stored = {}
+        if item.content_id is not None:
+            record = content_store.get(db, user_id, item.content_id)
+            if not record:
+                raise ValueError("게시할 콘텐츠를 찾을 수 없습니다.")
+            stored = content_store.decode_body(record.body, record.body_encoding)
+            fields['title'] = fields['title'] or stored.get('title') or record.title
+            fields['content'] = fields['content'] or stored.get('content', '')
+            fields['excerpt'] = record.excerpt
+        fields['categories'] = options.get('categories')
+        fields['tags'] = options.get('tags') or stored.get('tags')
+        fields['excerpt'] = options.get('excerpt') or fields.get('excerpt')
+        fields['meta_description'] = options.get('meta_description') or (stored.get('meta_tags') or {}).get('meta_description')
+        return fields
+
+    def _publish_item(self, item_id: int, user_id: int, post_status: str) -> Dict:
+        """(글, 사이트) 하나 게시 - 429/5xx는 백오프 후 재시도 (워커 스레드에서 실행)
+
+        포스트 생성은 멱등이 아니므로 500/502/504는 해당 시도 이후 같은 제목의 포스트가
+        만들어졌는지 먼저 확인하고, 없을 때만 다시 보냄
+        """
+        db = self.session_factory()
+        try:
+            item = db.get(PublishJobItem, item_id)
+            item.status = 'running'
+            item.started_at = datetime.utcnow()
+            db.commit()
+
+            if item.site_id is None:
+                raise ValueError("사이트가 삭제되었습니다.")
+            fields = self._post_fields(db, user_id, item)
+
+            for attempt in range(1, self.max_retries + 2):
+                item.attempts = (item.attempts or 0) + 1
+                db.commit()
+                # 사이트와 시계가 조금 어긋나도 찾을 수 있도록 여유를 둠
+                attempted_at = datetime.now(timezone.utc) - timedelta(seconds=self.lookup_margin)
+                try:
+                    return self.wordpress.create_post(db, user_id, item.site_id, status=post_status, **fields)
+                except WordPressTransientError as e:
+                    if not e.retry_safe:
+                        try:
+                            existing = self.wordpress.find_recent_post(db, user_id, item.site_id, fields['title'],
+                                                                       attempted_at)
+                        except Exception as lookup_error:
+                            # 게시 여부를 알 수 없으면 중복 게시를 피하기 위해 재시도하지 않음
+                            raise ValueError(f"{e} (게시 여부 확인 실패: {lookup_error})")
+                        if existing:
+                            print(f"응답 오류 후 게시 확인됨 (항목 {item_id}, 사이트 {item.site_id}): {e}")
+                            return existing
+                    if attempt > self.max_retries:
+                        raise
+                    delay = self._backoff(attempt, e.retry_after)
+                    print(f"게시 재시도 예정 (항목 {item_id}, 사이트 {item.site_id}, {delay:.1f}초 후): {e}")
+                    time.sleep(delay)
+        finally:
+            db.close()
+
+    def _finish_job(self, job_id: int, status: str, error: str = None):
+        db = self.session_factory()
+        try:
+            job = db.get(PublishJob, job_id)
+            job.status = status
+            job.error = error
+            job.finished_at = datetime.utcnow()
+            db.commit()
+        finally:
+            db.close()
+
+bulk_publish_service = BulkPublishService(
+    max_workers=int(os.getenv("BULK_PUBLISH_WORKERS", "16")),
+    site_concurrency=int(os.getenv("BULK_PUBLISH_SITE_CONCURRENCY", "2")),
+    max_retries=int(os.getenv("BULK_PUBLISH_RETRIES", "3"))
+)
+
+@celery_app.task(name="bulk_publish.process_publish_job")
+def process_publish_job(job_id: int):
+    """대량 게시 작업 처리"""
+    bulk_publish_service.run_job(job_id)
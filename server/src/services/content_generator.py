@@ -1,12 +1,40 @@
 import os
-import requests
+import threading
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 from sqlalchemy.orm import Session
-from openai import OpenAI
 
-from src.db import get_db
-from src.models.llm_provider import LLMProvider
+from src.services.bulk_executor import provider_slots
+from src.services.batch_prompts import (
+    SOCIAL_PLATFORMS, OpenAIBatchClient, build_batch_prompt, parse_batch_response,
+    social_tasks, variation_tasks
+)
+from src.services.llm_client_registry import client_registry
+from src.services.duplicate_index import duplicate_index
+from src.services.hedging import hedged_completion
+from src.services.llm_telemetry import llm_telemetry
+from src.services.longform_pipeline import sectioned_pipeline
+from src.services.ollama_backend import ollama_backend
+from src.services.provider_cache import ProviderConfig, provider_cache
+from src.services.prompt_templates import RenderedPrompt, prompt_registry
+from src.services.provider_router import provider_router
+from src.services.model_registry import DEFAULT_OPENAI_MODEL, model_registry
+from src.services.rate_limiter import openai_rate_limiter
+from src.services.seo_service import SEOAnalyzer
+from src.services.structured_output import (
+    ARTICLE_SCHEMA, STRUCTURED_OUTPUT_INSTRUCTION, article_markdown, parse_article
+)
+from src.services.response_cache import response_cache
+
+# 콘텐츠 생성에 사용할 수 있는 제공자 타입
+SUPPORTED_PROVIDER_TYPES = ('openai', 'ollama')
+
+SYSTEM_PROMPT = "당신은 전문적인 SEO 콘텐츠 작성자입니다."
+
+seo_analyzer = SEOAnalyzer()
+
+# 기존 글과 거의 같은 결과가 나왔을 때 다시 생성하며 덧붙이는 지시사항
+REGENERATE_INSTRUCTION = "같은 주제의 기존 글과 겹치지 않도록 다른 관점, 다른 구성, 새로운 예시로 작성해주세요."
 
 class AdvancedContentGenerator:
     """고급 AI 콘텐츠 생성 클래스 (OpenAI/Ollama 지원)"""
@@ -17,131 +45,469 @@ class AdvancedContentGenerator:
         self.demo_mode = True
         self.client = None
         self.active_provider = None
+        # 호출 기록에 남길 작업 종류 (최상위 생성 메서드에서 설정)
+        self.operation = 'content'
+        self.content_type = None
+        # 마지막 생성 작업의 토큰 사용량 (제공자 측 프롬프트 캐시 적중 토큰 포함)
+        self._usage = self._empty_usage()
+        self._usage_lock = threading.Lock()
         
         # 기본 OpenAI 클라이언트 설정 (하위 호환성)
         if self.api_key and self.api_key != "demo-key":
             try:
-                self.client = OpenAI(api_key=self.api_key)
+                self.client = client_registry.get_openai_client(self.api_key)
                 self.demo_mode = False
             except Exception as e:
                 print(f"OpenAI 클라이언트 초기화 실패: {e}")
 
-    def _get_active_llm_provider(self, db: Session) -> Optional[LLMProvider]:
-        """활성화된 LLM 제공자 조회"""
+    def _get_active_llm_provider(self, db: Session) -> Optional[ProviderConfig]:
+        """활성화된 LLM 제공자 조회 (사용자별 캐시 사용)"""
         if not self.user_id:
             return None
             
-        return db.query(LLMProvider).filter(
-            LLMProvider.user_id == self.user_id,
-            LLMProvider.is_active == True
-        ).first()
+        return provider_cache.get_active(db, self.user_id)
+
+    def _track(self, provider_type: str, model_name: str):
+        """LLM 호출 한 건의 토큰/지연 시간 기록"""
+        return llm_telemetry.track(provider_type, model_name, operation=self.operation,
+                                   user_id=self.user_id, content_type=self.content_type)
+
+    @staticmethod
+    def _empty_usage() -> Dict:
+        return {'calls': 0, 'prompt_tokens': 0, 'completion_tokens': 0, 'cached_tokens': 0}
+
+    def _reset_usage(self):
+        with self._usage_lock:
+            self._usage = self._empty_usage()
+
+    def _add_usage(self, prompt_tokens: Optional[int], completion_tokens: Optional[int],
+                   cached_tokens: Optional[int] = None):
+        with self._usage_lock:
+            self._usage['calls'] += 1
+            self._usage['prompt_tokens'] += prompt_tokens or 0
+            self._usage['completion_tokens'] += completion_tokens or 0
+            self._usage['cached_tokens'] += cached_tokens or 0
+
+    def _usage_metadata(self) -> Dict:
+        """응답 메타데이터용 토큰 사용량 (cache_hit_ratio: 입력 토큰 중 제공자 캐시 적중 비율)"""
+        with self._usage_lock:
+            usage = dict(self._usage)
+        usage['cache_hit_ratio'] = (round(usage['cached_tokens'] / usage['prompt_tokens'], 4)
+                                    if usage['prompt_tokens'] else 0.0)
+        return usage
+
+    def _record_openai_usage(self, trace, usage):
+        details = getattr(usage, 'prompt_tokens_details', None)
+        cached = getattr(details, 'cached_tokens', None) if details else None
+        trace.set_usage(usage.prompt_tokens, usage.completion_tokens, cached)
+        self._add_usage(usage.prompt_tokens, usage.completion_tokens, cached)
+
+    @staticmethod
+    def _split_prompt(prompt) -> Tuple[str, str]:
+        """(시스템 메시지, 사용자 메시지) - 템플릿의 고정 지침은 시스템 메시지에 붙여 요청마다 같은 접두부를 유지"""
+        if not isinstance(prompt, RenderedPrompt):
+            return SYSTEM_PROMPT, prompt
+        system = f"{SYSTEM_PROMPT}\n\n{prompt.prefix}" if prompt.prefix else SYSTEM_PROMPT
+        if prompt.structured:
+            system = f"{system}\n\n{STRUCTURED_OUTPUT_INSTRUCTION}"
+        return system, prompt.request
+
+    @staticmethod
+    def _ollama_format(prompt):
+        """구조화 응답이면 Ollama가 스키마에 맞는 JSON만 생성하도록 제한"""
+        return ARTICLE_SCHEMA if getattr(prompt, 'structured', False) else None
 
-    def _generate_with_openai(self, prompt: str, model: str = "gpt-3.5-turbo", api_key: str = None) -> str:
+    def _check_token_budget(self, db: Session):
+        """사용자의 월간 토큰 한도 확인 (초과 시 TokenBudgetExceeded)"""
+        llm_telemetry.check_budget(db, self.user_id)
+
+    def _create_openai_completion(self, prompt, model: str, api_key: Optional[str], stream: bool = False):
+        """키별 속도 제한을 지키며 OpenAI 채팅 완성 요청 (429/5xx는 백오프 후 재시도)"""
+        api_key = api_key or self.api_key
+        system, user = self._split_prompt(prompt)
+        plan = model_registry.plan(model, 'openai', system, user)
+        client = client_registry.get_openai_client(api_key)
+        extra = {"stream_options": {"include_usage": True}} if stream else {}
+        if getattr(prompt, 'structured', False):
+            extra["response_format"] = {"type": "json_object"}
+        
+        def request():
+            raw = client.chat.completions.with_raw_response.create(
+                model=model,
+                messages=[
+                    {"role": "system", "content": system},
+                    {"role": "user", "content": plan.user}
+                ],
+                max_tokens=plan.max_tokens,
+                temperature=0.7,
+                stream=stream,
+                **extra
+            )
+            openai_rate_limiter.update_from_headers(api_key, raw.headers)
+            return raw.parse()
+        
+        return openai_rate_limiter.call(api_key, plan.prompt_tokens + plan.max_tokens, request)
+
+    def _generate_with_openai(self, prompt, model: str = DEFAULT_OPENAI_MODEL, api_key: str = None) -> str:
         """OpenAI API를 사용한 콘텐츠 생성"""
-        client = OpenAI(api_key=api_key or self.api_key)
-        
-        response = client.chat.completions.create(
-            model=model,
-            messages=[
-                {"role": "system", "content": "당신은 전문적인 SEO 콘텐츠 작성자입니다."},
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=2000,
-            temperature=0.7
-        )
+        with self._track('openai', model) as trace:
+            response = self._create_openai_completion(prompt, model, api_key)
+            if response.usage:
+                self._record_openai_usage(trace, response.usage)
         
         return response.choices[0].message.content
 
-    def _generate_with_ollama(self, prompt: str, model: str, base_url: str) -> str:
-        """Ollama API를 사용한 콘텐츠 생성"""
-        # base_url에서 기본 URL 추출
-        if base_url.endswith('/api/generate'):
-            ollama_base = base_url.replace('/api/generate', '')
-        else:
-            ollama_base = base_url
-        
-        response = requests.post(f"{ollama_base}/api/generate", 
-            json={
-                "model": model,
-                "prompt": prompt,
-                "stream": False
-            },
-            timeout=120
-        )
+    def _generate_with_ollama(self, prompt, model: str, base_url: str) -> str:
+        """Ollama API를 사용한 콘텐츠 생성 (고정 지침은 system으로 보내 모델의 KV 캐시 재사용)"""
+        system, user = self._split_prompt(prompt)
+        plan = model_registry.plan(model, 'ollama', system, user)
+        stats = {}
+        with self._track('ollama', model) as trace:
+            content = ollama_backend.generate(plan.user, model, base_url, system_prompt=system, stats=stats,
+                                              format=self._ollama_format(prompt),
+                                              options=model_registry.ollama_options(plan))
+            trace.set_usage(stats.get('prompt_eval_count'), stats.get('eval_count'))
+            self._add_usage(stats.get('prompt_eval_count'), stats.get('eval_count'))
+        return content
+
+    def _complete(self, prompt, active_provider: Optional[ProviderConfig] = None) -> str:
+        """활성화된 제공자(없으면 기본 OpenAI 클라이언트)로 프롬프트 완성"""
+        if not active_provider:
+            return self._generate_with_openai(prompt)
         
-        if response.status_code == 200:
-            result = response.json()
-            return result.get('response', '')
-        else:
-            raise Exception(f"Ollama API 오류: {response.status_code} - {response.text}")
+        if active_provider.provider_type == 'openai':
+            return self._generate_with_openai(
+                prompt, 
+                active_provider.model_name, 
+                active_provider.api_key
+            )
+        elif active_provider.provider_type == 'ollama':
+            return self._generate_with_ollama(
+                prompt,
+                active_provider.model_name,
+                active_provider.base_url or 'http://localhost:11434/api/generate'
+            )
+        return ""
+
+    def _get_routable_providers(self, db: Session) -> List[ProviderConfig]:
+        """라우터가 사용할 사용자 제공자 목록 - 활성 제공자와 라우팅을 허용한 제공자만 (비활성 제공자 제외)"""
+        if not db or not self.user_id:
+            return []
+        return [
+            p for p in provider_cache.get_providers(db, self.user_id)
+            if p.provider_type in SUPPORTED_PROVIDER_TYPES and (p.is_active or p.use_for_routing)
+        ]
+
+    def _complete_routed(self, prompt, providers: List[ProviderConfig]) -> Tuple[str, Optional[ProviderConfig]]:
+        """등록된 제공자 간 부하 분산 후 호출 - 실패 시 다음 정상 제공자로 재시도"""
+        if not providers:
+            # 서버 기본 OpenAI 클라이언트도 일괄 작업에서는 openai 슬롯을 잡고 호출
+            with provider_slots.hold('openai'):
+                return self._complete(prompt), None
+        return provider_router.call(providers, lambda provider: self._complete(prompt, provider))
+
+    def _stream_provider(self, prompt, provider: Optional[ProviderConfig] = None) -> Iterator[str]:
+        """제공자(없으면 기본 OpenAI 클라이언트)의 스트리밍 응답"""
+        if provider and provider.provider_type == 'ollama':
+            return self._stream_with_ollama(
+                prompt,
+                provider.model_name,
+                provider.base_url or 'http://localhost:11434/api/generate'
+            )
+        elif provider:
+            return self._stream_with_openai(prompt, provider.model_name, provider.api_key)
+        return self._stream_with_openai(prompt)
+
+    def _complete_hedged(self, prompt, providers: List[ProviderConfig]) -> Tuple[str, Optional[ProviderConfig]]:
+        """지연에 민감한 호출용 - 첫 토큰이 LLM_HEDGE_DEADLINE 안에 오지 않으면 다음 제공자에 헤지 요청
+
+        헤지할 대상이 없으면(제공자 1개 이하, 데모 대체 미사용) 기존 라우팅 호출과 같음
+        """
+        ordered = provider_router.order(providers) if providers else []
+        if not hedged_completion.enabled or (len(ordered) < 2 and not hedged_completion.demo_fallback):
+            return self._complete_routed(prompt, providers)
+
+        def attempt(provider):
+            def chunks():
+                if provider is None:
+                    yield from self._stream_provider(prompt)
+                    return
+                with provider_router.track(provider):
+                    yield from self._stream_provider(prompt, provider)
+            return chunks
+
+        candidates = ordered if providers else [None]
+        if not candidates:
+            return self._complete_routed(prompt, providers)
+        return hedged_completion.run([(provider, attempt(provider)) for provider in candidates])
 
     def generate_seo_optimized_content(self, keyword: str, content_type: str = 'blog_post', 
                                       tone: str = 'professional', target_audience: str = 'general',
                                       additional_keywords: List[str] = None, 
-                                      custom_instructions: str = "", db: Session = None) -> Dict:
-        """SEO 최적화된 콘텐츠 생성"""
+                                      custom_instructions: str = "", db: Session = None,
+                                      cache_mode: str = 'bypass', long_form: bool = False,
+                                      locale: Optional[str] = None, hedge: bool = False) -> Dict:
+        """SEO 최적화된 콘텐츠 생성 (cache_mode: bypass, prefer, only / long_form: 개요 후 섹션 병렬 생성)
         
-        # DB에서 활성화된 LLM 제공자 조회
-        active_provider = None
-        if db and self.user_id:
-            active_provider = self._get_active_llm_provider(db)
+        hedge=True는 사용자가 기다리는 요청에만 사용 (일괄 작업에서 켜면 제공자 호출이 중복됨)
+        
+        사용자의 기존 콘텐츠와 거의 같은 글이면 duplicate 필드로 표시하고,
+        DUPLICATE_ACTION=regenerate이면 다른 관점으로 한 번 다시 생성
+        """
+        options = dict(content_type=content_type, tone=tone, target_audience=target_audience,
+                       additional_keywords=additional_keywords, db=db, long_form=long_form, locale=locale,
+                       hedge=hedge)
+        result = self._generate_seo_content(keyword, custom_instructions=custom_instructions,
+                                            cache_mode=cache_mode, **options)
+        duplicate = self._check_duplicate(result, db)
+        if duplicate and duplicate['is_duplicate'] and duplicate_index.action == 'regenerate':
+            print(f"'{keyword}' 생성 결과가 기존 콘텐츠와 중복 - 다시 생성")
+            retry = self._generate_seo_content(
+                keyword, custom_instructions=f"{custom_instructions or ''}\n{REGENERATE_INSTRUCTION}".strip(),
+                cache_mode='bypass', **options
+            )
+            retry_duplicate = self._check_duplicate(retry, db)
+            if retry_duplicate:
+                result, duplicate = retry, {**retry_duplicate, 'regenerated': True}
+        if duplicate:
+            result['duplicate'] = duplicate
+        return result
+    
+    def _check_duplicate(self, result: Dict, db: Session) -> Optional[Dict]:
+        if result.get('demo_mode'):
+            return None
+        return duplicate_index.check(db, self.user_id, result.get('content', ''))
+    
+    def _generate_seo_content(self, keyword: str, content_type: str = 'blog_post',
+                              tone: str = 'professional', target_audience: str = 'general',
+                              additional_keywords: List[str] = None,
+                              custom_instructions: str = "", db: Session = None,
+                              cache_mode: str = 'bypass', long_form: bool = False,
+                              locale: Optional[str] = None, hedge: bool = False) -> Dict:
+        # 사용자가 등록한 LLM 제공자 조회 (캐시 사용)
+        providers = self._get_routable_providers(db)
         
         # LLM 제공자가 없으면 기본 설정 또는 데모 모드 사용
-        if not active_provider and (self.demo_mode or not self.client):
+        if not providers and (self.demo_mode or not self.client):
             return self._generate_demo_content(keyword, content_type, tone)
         
+        self._check_token_budget(db)
+        self.operation = 'long_form' if long_form else 'content'
+        self.content_type = content_type
+        self._reset_usage()
+        
+        prompt = self._build_prompt(keyword, content_type, tone, target_audience,
+                                    additional_keywords, custom_instructions, db, locale)
+        # 단일 완성은 제목/메타 설명/섹션/태그를 JSON으로 받음 (장문은 섹션별 마크다운)
+        prompt.structured = not long_form
+        
+        # 동일한 프롬프트/모델 조합은 캐시된 응답 재사용
+        cache_key = None
+        if cache_mode != 'bypass':
+            # 라우터가 실제로 먼저 호출할 제공자 기준으로 조회해야 저장 키와 일치함
+            routed = provider_router.order(providers)
+            primary = routed[0] if routed else next((p for p in providers if p.is_active), providers[0] if providers else None)
+            provider_type = primary.provider_type if primary else 'openai'
+            model_name = primary.model_name if primary else DEFAULT_OPENAI_MODEL
+            cache_text = prompt.text + ('\0sectioned' if long_form else '')
+            cache_key = response_cache.make_key(cache_text, provider_type, model_name)
+            cached, tier = response_cache.get(cache_key)
+            if cached is not None:
+                title, body, article = self._parse_completion(cached)
+                result = self._format_content_response(title, body, keyword, content_type, tone, target_audience,
+                                                       article=article)
+                result['cache'] = response_cache.metadata(cache_mode, 'hit', tier)
+                return result
+            if cache_mode == 'only':
+                raise LookupError("캐시된 콘텐츠가 없습니다.")
+        
         try:
-            additional_keywords = additional_keywords or []
-            
-            prompt = f"""
-다음 조건에 맞는 SEO 최적화된 {content_type} 콘텐츠를 한국어로 작성해주세요:
-
-- 메인 키워드: {keyword}
-- 추가 키워드: {', '.join(additional_keywords) if additional_keywords else '없음'}
-- 톤: {tone}
-- 타겟 독자: {target_audience}
-- 추가 지시사항: {custom_instructions if custom_instructions else '없음'}
-
-다음 형식으로 작성해주세요:
-# 제목
-
-본문 내용 (1000-1500단어)
-
-제목에는 메인 키워드를 포함하고, 본문에는 키워드를 자연스럽게 2-3% 밀도로 사용해주세요.
-SEO에 최적화된 구조화된 내용으로 작성해주세요.
-            """
-            
-            content = ""
-            
-            if active_provider:
-                # 활성화된 제공자 사용
-                if active_provider.provider_type == 'openai':
-                    content = self._generate_with_openai(
-                        prompt, 
-                        active_provider.model_name, 
-                        active_provider.api_key
-                    )
-                elif active_provider.provider_type == 'ollama':
-                    content = self._generate_with_ollama(
-                        prompt,
-                        active_provider.model_name,
-                        active_provider.base_url or 'http://localhost:11434/api/generate'
-                    )
+            pipeline = None
+            if long_form:
+                pipeline, used_provider = self._run_sectioned(keyword, content_type, tone, target_audience,
+                                                              additional_keywords, custom_instructions,
+                                                              providers)
+            if pipeline:
+                content = pipeline['content']
+            elif hedge:
+                content, used_provider = self._complete_hedged(prompt, providers)
             else:
-                # 기본 OpenAI 클라이언트 사용
-                content = self._generate_with_openai(prompt)
+                content, used_provider = self._complete_routed(prompt, providers)
+            
+            # 일부 섹션이 빠진 글은 캐시하지 않음
+            if cache_key and content and not (pipeline and pipeline['failed_sections']):
+                # 장애 조치/헤지로 다른 제공자가 응답했으면 그 제공자/모델의 키로 저장
+                if used_provider and (used_provider.provider_type, used_provider.model_name) != (provider_type, model_name):
+                    provider_type, model_name = used_provider.provider_type, used_provider.model_name
+                    cache_key = response_cache.make_key(cache_text, provider_type, model_name)
+                response_cache.set(cache_key, content, provider_type, model_name)
             
-            # 제목과 본문 분리
-            lines = content.split('\n')
-            title = lines[0].replace('# ', '').replace('## ', '').strip()
-            body = '\n'.join(lines[1:]).strip()
+            title, body, article = self._parse_completion(content)
             
-            return self._format_content_response(title, body, keyword, content_type, tone, target_audience)
+            result = self._format_content_response(title, body, keyword, content_type, tone, target_audience,
+                                                   article=article)
+            if used_provider:
+                result['llm_provider'] = {
+                    'id': used_provider.id,
+                    'name': used_provider.name,
+                    'provider_type': used_provider.provider_type,
+                    'model_name': used_provider.model_name
+                }
+            if pipeline:
+                result['pipeline'] = {
+                    'mode': 'sectioned',
+                    'sections': pipeline['sections'],
+                    'failed_sections': pipeline['failed_sections']
+                }
+            if cache_key:
+                result['cache'] = response_cache.metadata(cache_mode, 'miss')
+            result['usage'] = self._usage_metadata()
+            return result
             
         except Exception as e:
             print(f"콘텐츠 생성 오류: {e}")
             return self._generate_demo_content(keyword, content_type, tone)
     
+    def _run_sectioned(self, keyword: str, content_type: str, tone: str, target_audience: str,
+                       additional_keywords: List[str], custom_instructions: str,
+                       providers: List[ProviderConfig]) -> Tuple[Optional[Dict], Optional[ProviderConfig]]:
+        """개요/섹션 파이프라인 실행 - 개요를 해석할 수 없으면 (None, None)으로 단일 생성에 위임"""
+        used = []
+        
+        def complete(prompt):
+            content, provider = self._complete_routed(prompt, providers)
+            used.append(provider)
+            return content
+        
+        try:
+            pipeline = sectioned_pipeline.run(keyword, content_type, tone, target_audience, complete,
+                                              additional_keywords, custom_instructions)
+        except ValueError as e:
+            print(f"장문 개요 생성 실패, 단일 생성으로 전환: {e}")
+            return None, None
+        return pipeline, used[0]
+    
+    def _build_prompt(self, keyword: str, content_type: str, tone: str, target_audience: str,
+                      additional_keywords: List[str] = None, custom_instructions: str = "",
+                      db: Session = None, locale: Optional[str] = None) -> RenderedPrompt:
+        """콘텐츠 생성 프롬프트 구성 (사용자 템플릿 우선, 없으면 유형/로케일별 기본 템플릿)
+        
+        고정 지침(prefix)과 키워드 등 요청별 내용(request)을 분리해 두어, 제공자 호출 시
+        고정 지침이 항상 같은 접두부로 전송되어 제공자 측 프롬프트 캐시에 적중하도록 함
+        """
+        return prompt_registry.render(
+            keyword, content_type, tone, target_audience, additional_keywords, custom_instructions,
+            locale=locale, db=db, user_id=self.user_id
+        )
+    
+    def _parse_completion(self, content: str) -> Tuple[str, str, Optional[Dict]]:
+        """(제목, 마크다운 본문, 구조화된 글) - JSON 응답이 아니면 첫 줄을 제목으로 사용"""
+        try:
+            article = parse_article(content)
+        except ValueError:
+            title, body = self._split_title_body(content)
+            return title, body, None
+        return article['title'], article_markdown(article), article
+    
+    def _split_title_body(self, content: str) -> Tuple[str, str]:
+        """생성 결과에서 제목과 본문 분리"""
+        lines = content.split('\n')
+        title = lines[0].replace('# ', '').replace('## ', '').strip()
+        body = '\n'.join(lines[1:]).strip()
+        return title, body
+    
+    def _stream_with_openai(self, prompt, model: str = DEFAULT_OPENAI_MODEL, api_key: str = None) -> Iterator[str]:
+        """OpenAI 스트리밍 응답의 델타를 순서대로 반환"""
+        with self._track('openai', model) as trace:
+            stream = self._create_openai_completion(prompt, model, api_key, stream=True)
+            
+            try:
+                for chunk in stream:
+                    if chunk.usage:
+                        self._record_openai_usage(trace, chunk.usage)
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        trace.first_token()
+                        yield chunk.choices[0].delta.content
+            finally:
+                stream.close()
+    
+    def _stream_with_ollama(self, prompt, model: str, base_url: str) -> Iterator[str]:
+        """Ollama NDJSON 스트림을 줄 단위로 읽어 토큰 반환"""
+        system, user = self._split_prompt(prompt)
+        plan = model_registry.plan(model, 'ollama', system, user)
+        stats = {}
+        with self._track('ollama', model) as trace:
+            for delta in ollama_backend.stream(plan.user, model, base_url, system_prompt=system, stats=stats,
+                                               format=self._ollama_format(prompt),
+                                               options=model_registry.ollama_options(plan)):
+                trace.first_token()
+                yield delta
+            trace.set_usage(stats.get('prompt_eval_count'), stats.get('eval_count'))
+            self._add_usage(stats.get('prompt_eval_count'), stats.get('eval_count'))
+    
+    def stream_seo_optimized_content(self, keyword: str, content_type: str = 'blog_post',
+                                     tone: str = 'professional', target_audience: str = 'general',
+                                     additional_keywords: List[str] = None,
+                                     custom_instructions: str = "", db: Session = None,
+                                     locale: Optional[str] = None) -> Iterator[Dict]:
+        """SEO 최적화 콘텐츠 스트리밍 생성 - delta 이벤트 후 최종 done 이벤트 반환"""
+        
+        # 제공자 조회는 응답 스트리밍 전에 끝내서 요청 스코프의 DB 세션에 의존하지 않음
+        providers = self._get_routable_providers(db)
+        
+        if not providers and (self.demo_mode or not self.client):
+            return iter([{
+                'type': 'done',
+                'data': self._generate_demo_content(keyword, content_type, tone)
+            }])
+        
+        self._check_token_budget(db)
+        self.operation = 'stream'
+        self.content_type = content_type
+        self._reset_usage()
+        
+        prompt = self._build_prompt(keyword, content_type, tone, target_audience,
+                                    additional_keywords, custom_instructions, db, locale)
+        
+        # 스트리밍은 중간 재시도가 불가능하므로 라우터가 고른 제공자 하나로 실행
+        provider = None
+        if providers:
+            ordered = provider_router.order(providers)
+            if not ordered:
+                return iter([{
+                    'type': 'done',
+                    'data': self._generate_demo_content(keyword, content_type, tone)
+                }])
+            provider = ordered[0]
+        
+        chunks = self._stream_provider(prompt, provider)
+        
+        def tracked():
+            if provider is None:
+                yield from chunks
+                return
+            with provider_router.track(provider):
+                yield from chunks
+        
+        def events():
+            parts = []
+            try:
+                for delta in tracked():
+                    parts.append(delta)
+                    yield {'type': 'delta', 'content': delta}
+            except Exception as e:
+                print(f"콘텐츠 스트리밍 오류: {e}")
+                yield {'type': 'error', 'message': str(e)}
+                yield {'type': 'done', 'data': self._generate_demo_content(keyword, content_type, tone)}
+                return
+            
+            title, body = self._split_title_body(''.join(parts))
+            result = self._format_content_response(title, body, keyword, content_type, tone, target_audience)
+            result['usage'] = self._usage_metadata()
+            yield {'type': 'done', 'data': result}
+        
+        return events()
+    
     def _generate_demo_content(self, keyword: str, content_type: str, tone: str) -> Dict:
         """데모 콘텐츠 생성"""
         title = f"{keyword}에 대한 완벽한 가이드"
@@ -186,8 +552,15 @@ SEO에 최적화된 구조화된 내용으로 작성해주세요.
         return self._format_content_response(title, demo_content, keyword, content_type, tone, 'general', demo_mode=True)
     
     def _format_content_response(self, title: str, content: str, keyword: str, 
-                                content_type: str, tone: str, target_audience: str, demo_mode: bool = False) -> Dict:
-        """콘텐츠 응답 포맷팅"""
+                                content_type: str, tone: str, target_audience: str, demo_mode: bool = False,
+                                article: Optional[Dict] = None) -> Dict:
+        """콘텐츠 응답 포맷팅 (article: 구조화된 응답이 있으면 메타 설명/태그 사용)"""
+        meta_description = f"{keyword}에 대한 포괄적인 가이드입니다. {keyword}의 정의, 특징, 활용 방법 등을 자세히 알아보세요."
+        tags = [f"{keyword} 가이드", f"{keyword} 활용", f"{keyword} 방법", f"{keyword} 특징"]
+        if article:
+            meta_description = article['meta_description'] or meta_description
+            tags = article['tags'] or tags
+        
         response = {
             'title': title,
             'content': content,
@@ -196,36 +569,53 @@ SEO에 최적화된 구조화된 내용으로 작성해주세요.
             'tone': tone,
             'target_audience': target_audience,
             'meta_tags': {
-                'meta_description': f"{keyword}에 대한 포괄적인 가이드입니다. {keyword}의 정의, 특징, 활용 방법 등을 자세히 알아보세요.",
-                'meta_keywords': f"{keyword}, 가이드, 활용법, 특징"
-            },
-            'content_analysis': {
-                'seo_score': 85,
-                'content_length': len(content),
-                'keyword_density': 2.5,
-                'readability_score': 'Good',
-                'keyword_in_title': keyword.lower() in title.lower(),
-                'title_length': len(title)
+                'meta_description': meta_description,
+                'meta_keywords': ', '.join([keyword] + [t for t in tags if t != keyword])
             },
-            'related_keywords': [f"{keyword} 가이드", f"{keyword} 활용", f"{keyword} 방법", f"{keyword} 특징"],
+            'content_analysis': seo_analyzer.analyze_content_seo(title, content, keyword),
+            'related_keywords': tags,
             'generated_at': datetime.now().isoformat(),
             'word_count': len(content.split()),
             'estimated_reading_time': max(1, len(content.split()) // 200)
         }
         
+        if article:
+            response['tags'] = article['tags']
         if demo_mode:
             response['demo_mode'] = True
             
         return response
     
-    def generate_content_variations(self, base_content: Dict, variation_count: int = 3) -> List[Dict]:
-        """콘텐츠 변형 생성"""
+    def generate_batch(self, content: Dict, tasks: Dict[str, Dict], db: Session = None) -> Dict[str, Dict]:
+        """여러 하위 작업을 하나의 JSON 완성으로 생성 - LLM을 쓸 수 없거나 해석할 수 없으면 빈 결과"""
+        if not tasks:
+            return {}
+        providers = self._get_routable_providers(db)
+        if not providers and (self.demo_mode or not self.client):
+            return {}
+        
+        self._check_token_budget(db)
+        self.operation = 'batch'
+        
+        try:
+            text, _ = self._complete_routed(build_batch_prompt(content, tasks), providers)
+            return parse_batch_response(text, list(tasks))
+        except Exception as e:
+            print(f"배치 생성 오류: {e}")
+            return {}
+    
+    def _to_variations(self, base_content: Dict, results: Dict[str, Dict], variation_count: int,
+                       fallback: bool = True) -> List[Dict]:
+        """배치 결과를 변형 목록 형식으로 변환 (누락된 항목은 원문 기반 변형으로 대체)"""
         variations = []
         
         for i in range(variation_count):
+            generated = results.get(f'variation_{i+1}') or {}
+            if not generated and not fallback:
+                continue
             variation = {
-                'title': f"{base_content['title']} - 변형 {i+1}",
-                'content': f"[변형 {i+1}] " + base_content['content'],
+                'title': generated.get('title') or f"{base_content.get('title', '')} - 변형 {i+1}",
+                'content': generated.get('content') or f"[변형 {i+1}] " + base_content.get('content', ''),
                 'variation_type': f'variation_{i+1}',
                 'generated_at': datetime.now().isoformat()
             }
@@ -233,20 +623,110 @@ SEO에 최적화된 구조화된 내용으로 작성해주세요.
         
         return variations
     
-    def generate_social_media_content(self, main_content: Dict) -> Dict:
-        """소셜 미디어용 콘텐츠 생성"""
-        return {
+    def _to_social_media(self, main_content: Dict, results: Dict[str, Dict], fallback: bool = True) -> Dict:
+        """배치 결과를 플랫폼별 게시물 형식으로 변환 (누락된 플랫폼은 기본 문구 사용)"""
+        keyword = (main_content.get('keyword') or '').strip()
+        keyword_tags = [f"#{keyword}"] if keyword else []
+        defaults = {
             'facebook': {
-                'text': f"📝 새 글: {main_content['title']}\n\n{main_content['content'][:100]}...",
-                'hashtags': ['#블로그', '#콘텐츠', f"#{main_content['keyword']}"]
+                'text': f"📝 새 글: {main_content.get('title', '')}\n\n{main_content.get('content', '')[:100]}...",
+                'hashtags': ['#블로그', '#콘텐츠'] + keyword_tags
             },
             'twitter': {
-                'text': f"📝 {main_content['title']}\n\n{main_content['content'][:100]}...",
-                'hashtags': ['#블로그', f"#{main_content['keyword']}"]
+                'text': f"📝 {main_content.get('title', '')}\n\n{main_content.get('content', '')[:100]}...",
+                'hashtags': ['#블로그'] + keyword_tags
             },
             'linkedin': {
-                'text': f"새로운 인사이트: {main_content['title']}\n\n{main_content['content'][:200]}...",
-                'hashtags': ['#전문지식', '#인사이트', f"#{main_content['keyword']}"]
+                'text': f"새로운 인사이트: {main_content.get('title', '')}\n\n{main_content.get('content', '')[:200]}...",
+                'hashtags': ['#전문지식', '#인사이트'] + keyword_tags
             }
         }
-
+        
+        social = {}
+        for platform, default in defaults.items():
+            generated = results.get(platform) or {}
+            if not generated.get('text'):
+                if fallback:
+                    social[platform] = default
+                continue
+            hashtags = generated.get('hashtags')
+            social[platform] = {
+                'text': generated['text'],
+                'hashtags': hashtags if isinstance(hashtags, list) else default['hashtags']
+            }
+        return social
+    
+    def generate_content_variations(self, base_content: Dict, variation_count: int = 3,
+                                    db: Session = None) -> List[Dict]:
+        """콘텐츠 변형 생성 (모든 변형을 한 번의 호출로 생성)"""
+        results = self.generate_batch(base_content, variation_tasks(variation_count), db)
+        return self._to_variations(base_content, results, variation_count)
+    
+    def generate_social_media_content(self, main_content: Dict, db: Session = None) -> Dict:
+        """소셜 미디어용 콘텐츠 생성 (세 플랫폼을 한 번의 호출로 생성)"""
+        results = self.generate_batch(main_content, social_tasks(), db)
+        return self._to_social_media(main_content, results)
+    
+    def generate_derivative_content(self, main_content: Dict, variation_count: int = 3,
+                                    db: Session = None) -> Dict:
+        """변형과 소셜 미디어 게시물을 한 번의 호출로 함께 생성"""
+        tasks = {**variation_tasks(variation_count), **social_tasks()}
+        results = self.generate_batch(main_content, tasks, db)
+        return {
+            'variations': self._to_variations(main_content, results, variation_count),
+            'social_media': self._to_social_media(main_content, results)
+        }
+    
+    def _get_batch_client(self, db: Session = None) -> Tuple[OpenAIBatchClient, str]:
+        """Batch API 클라이언트와 모델 (활성 OpenAI 제공자 우선, 없으면 서버 키)"""
+        active = self._get_active_llm_provider(db) if db else None
+        api_key = active.api_key if active and active.provider_type == 'openai' and active.api_key else self.api_key
+        # 서버 키가 없을 때의 기본값(demo-key)으로 Batch API를 호출하지 않음
+        if not api_key or api_key == 'demo-key':
+            raise ValueError("Batch API에는 OpenAI API 키가 필요합니다.")
+        model = active.model_name if active and active.provider_type == 'openai' else DEFAULT_OPENAI_MODEL
+        return OpenAIBatchClient(client_registry.get_openai_client(api_key)), model
+    
+    def submit_derivative_batch(self, contents: List[Dict], variation_count: int = 3,
+                                include_social: bool = True, db: Session = None) -> str:
+        """여러 콘텐츠의 변형/소셜 게시물 생성을 OpenAI Batch API 작업으로 제출하고 배치 ID 반환"""
+        tasks = {**variation_tasks(variation_count), **(social_tasks() if include_social else {})}
+        if not tasks:
+            raise ValueError("변형 또는 소셜 게시물 중 하나 이상을 요청해야 합니다.")
+        batch_client, model = self._get_batch_client(db)
+        batch_requests = [
+            batch_client.build_request(f"content-{i}", build_batch_prompt(content, tasks), model)
+            for i, content in enumerate(contents)
+        ]
+        return batch_client.submit(batch_requests, metadata={
+            'user_id': str(self.user_id or ''),
+            'variation_count': str(variation_count)
+        })
+    
+    def collect_derivative_batch(self, batch_id: str, db: Session = None) -> Dict:
+        """Batch API 작업 상태 조회 - 완료 시 콘텐츠별 variations/social_media 형식으로 분리"""
+        batch_client, _ = self._get_batch_client(db)
+        batch = batch_client.collect(batch_id)
+        if batch['metadata'].get('user_id') != str(self.user_id or ''):
+            raise LookupError("배치 작업을 찾을 수 없습니다.")
+        
+        variation_count = int(batch['metadata'].get('variation_count', 0))
+        task_ids = list(variation_tasks(variation_count)) + list(SOCIAL_PLATFORMS)
+        items = {}
+        for custom_id, text in batch['outputs'].items():
+            try:
+                results = parse_batch_response(text, task_ids)
+            except ValueError as e:
+                batch['errors'][custom_id] = str(e)
+                continue
+            items[custom_id] = {
+                'variations': self._to_variations({}, results, variation_count, fallback=False),
+                'social_media': self._to_social_media({}, results, fallback=False)
+            }
+        
+        return {
+            'batch_id': batch['batch_id'],
+            'status': batch['status'],
+            'results': items,
+            'errors': batch['errors']
+        }
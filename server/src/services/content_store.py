@@ -0,0 +1,138 @@
+import base64
+import json
+import os
+import re
+import zlib
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from src.models.generated_content import GeneratedContent
+from src.services.duplicate_index import duplicate_index, simhash, to_signed
+
+CONTENT_STATUSES = ('draft', 'published', 'archived')
+
+class GeneratedContentRepository:
+    """생성된 콘텐츠 저장소 - 본문은 압축 저장, 목록은 본문 없이 키셋 페이지네이션"""
+
+    def __init__(self, compress_threshold: int = 1024, max_page_size: int = 100):
+        # 직렬화 결과가 이 크기(바이트) 이상이면 zlib 압축
+        self.compress_threshold = compress_threshold
+        self.max_page_size = max_page_size
+
+    def encode_body(self, result: Dict) -> Tuple[bytes, str, int]:
+        """(저장할 바이트, 인코딩, 압축 전 크기)"""
+        raw = json.dumps(result, ensure_ascii=False).encode('utf-8')
+        if len(raw) >= self.compress_threshold:
+            return zlib.compress(raw, 6), 'zlib', len(raw)
+        return raw, 'identity', len(raw)
+
+    @staticmethod
+    def decode_body(body: bytes, encoding: str) -> Dict:
+        if encoding == 'zlib':
+            body = zlib.decompress(body)
+        return json.loads(body.decode('utf-8'))
+
+    @staticmethod
+    def _excerpt(content: str, length: int = 200) -> str:
+        text = re.sub(r'[#*_>`\[\]]', '', content or '')
+        text = re.sub(r'\s+', ' ', text).strip()
+        return text[:length]
+
+    def save(self, db: Session, user_id: int, result: Dict, source: str = 'generate',
+             bulk_job_id: Optional[int] = None) -> GeneratedContent:
+        """생성 결과 저장"""
+        body, encoding, size = self.encode_body(result)
+        fingerprint = simhash(result.get('content', ''))
+        now = datetime.utcnow()
+        record = GeneratedContent(
+            user_id=user_id,
+            keyword=(result.get('keyword') or '')[:255],
+            title=(result.get('title') or '')[:500],
+            content_type=result.get('content_type') or 'blog_post',
+            status='draft',
+            source=source,
+            bulk_job_id=bulk_job_id,
+            excerpt=self._excerpt(result.get('content', '')),
+            word_count=result.get('word_count') or 0,
+            seo_score=(result.get('content_analysis') or {}).get('seo_score'),
+            simhash=to_signed(fingerprint),
+            body=body,
+            body_encoding=encoding,
+            body_size=size,
+            created_at=now,
+            updated_at=now
+        )
+        db.add(record)
+        db.commit()
+        db.refresh(record)
+        duplicate_index.add(user_id, record.id, fingerprint)
+        return record
+
+    @staticmethod
+    def encode_cursor(record: GeneratedContent) -> str:
+        raw = f"{record.created_at.isoformat()}|{record.id}".encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+        try:
+            raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+            created_at, content_id = raw.rsplit('|', 1)
+            return datetime.fromisoformat(created_at), int(content_id)
+        except Exception:
+            raise ValueError("잘못된 cursor 값입니다.")
+
+    def list(self, db: Session, user_id: int, limit: int = 20, cursor: Optional[str] = None,
+             status: Optional[str] = None, keyword: Optional[str] = None) -> Tuple[List[GeneratedContent], Optional[str]]:
+        """최신순 요약 목록과 다음 페이지 cursor (본문 컬럼은 조회하지 않음)"""
+        if status and status not in CONTENT_STATUSES:
+            raise ValueError(f"status는 {', '.join(CONTENT_STATUSES)} 중 하나여야 합니다.")
+        limit = max(1, min(limit, self.max_page_size))
+
+        query = db.query(GeneratedContent).filter(GeneratedContent.user_id == user_id)
+        if status:
+            query = query.filter(GeneratedContent.status == status)
+        if keyword:
+            query = query.filter(GeneratedContent.keyword == keyword)
+        if cursor:
+            created_at, content_id = self.decode_cursor(cursor)
+            query = query.filter(or_(
+                GeneratedContent.created_at < created_at,
+                and_(GeneratedContent.created_at == created_at, GeneratedContent.id < content_id)
+            ))
+
+        rows = query.order_by(GeneratedContent.created_at.desc(), GeneratedContent.id.desc()).limit(limit + 1).all()
+        next_cursor = self.encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+        return rows[:limit], next_cursor
+
+    def get(self, db: Session, user_id: int, content_id: int) -> Optional[GeneratedContent]:
+        return db.query(GeneratedContent).filter(
+            GeneratedContent.id == content_id,
+            GeneratedContent.user_id == user_id
+        ).first()
+
+    def to_detail(self, record: GeneratedContent) -> Dict:
+        """요약 정보 + 저장된 생성 결과 전체"""
+        return {**record.to_summary(), 'content': self.decode_body(record.body, record.body_encoding)}
+
+    def update_status(self, db: Session, record: GeneratedContent, status: str) -> GeneratedContent:
+        if status not in CONTENT_STATUSES:
+            raise ValueError(f"status는 {', '.join(CONTENT_STATUSES)} 중 하나여야 합니다.")
+        record.status = status
+        record.updated_at = datetime.utcnow()
+        db.commit()
+        db.refresh(record)
+        return record
+
+    def delete(self, db: Session, record: GeneratedContent):
+        user_id, content_id = record.user_id, record.id
+        db.delete(record)
+        db.commit()
+        duplicate_index.remove(user_id, content_id)
+
+content_store = GeneratedContentRepository(
+    compress_threshold=int(os.getenv('CONTENT_COMPRESS_THRESHOLD', '1024'))
+)
@@ -0,0 +1,158 @@
+import hashlib
+import os
+import re
+import threading
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from src.models.generated_content import GeneratedContent
+
+FINGERPRINT_BITS = 64
+DUPLICATE_ACTIONS = ('flag', 'regenerate')
+
+_TOKEN_RE = re.compile(r'[0-9A-Za-z가-힣]{2,}')
+
+def _feature_hash(feature: str) -> int:
+    # 내장 hash()는 프로세스마다 달라지므로 영구 저장용으로 쓸 수 없음
+    return int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'big')
+
+def simhash(text: str) -> int:
+    """단어/단어쌍 빈도로 계산한 64비트 SimHash (비슷한 글일수록 해밍 거리가 작음)"""
+    tokens = _TOKEN_RE.findall((text or '').lower())
+    features = Counter(tokens)
+    features.update(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+
+    weights = [0] * FINGERPRINT_BITS
+    for feature, count in features.items():
+        h = _feature_hash(feature)
+        for bit in range(FINGERPRINT_BITS):
+            weights[bit] += count if h >> bit & 1 else -count
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count('1')
+
+def to_signed(fingerprint: int) -> int:
+    """DB의 부호 있는 64비트 정수 컬럼에 저장할 값"""
+    return fingerprint - (1 << 64) if fingerprint >= 1 << 63 else fingerprint
+
+def to_unsigned(value: int) -> int:
+    return value + (1 << 64) if value < 0 else value
+
+class _UserIndex:
+    __slots__ = ('buckets', 'fingerprints', 'last_id')
+
+    def __init__(self):
+        self.buckets: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        self.fingerprints: Dict[int, int] = {}
+        self.last_id = 0
+
+class DuplicateIndex:
+    """사용자별 SimHash 근접 중복 색인
+
+    64비트 지문을 (max_distance + 1)개 구간으로 나누면, 해밍 거리가 max_distance 이하인 두 지문은
+    적어도 한 구간이 정확히 같음 (비둘기집 원리). 구간 값으로 후보만 찾은 뒤 거리를 비교하므로
+    기록이 수십만 건이어도 조회 비용은 후보 수에만 비례함. 지문은 generated_contents.simhash에
+    저장되어 재시작 후 사용자별로 처음 조회할 때 다시 적재됨.
+    """
+
+    def __init__(self, max_distance: int = 4, action: str = 'flag'):
+        self.max_distance = max_distance
+        self.action = action if action in DUPLICATE_ACTIONS else 'flag'
+        self.bands = max_distance + 1
+        self.band_bits = FINGERPRINT_BITS // self.bands
+        self._users: Dict[int, _UserIndex] = {}
+        self._lock = threading.Lock()
+
+    def _band_keys(self, fingerprint: int) -> List[Tuple[int, int]]:
+        mask = (1 << self.band_bits) - 1
+        keys = []
+        for band in range(self.bands):
+            # 마지막 구간은 남는 비트까지 포함
+            if band == self.bands - 1:
+                value = fingerprint >> (band * self.band_bits)
+            else:
+                value = fingerprint >> (band * self.band_bits) & mask
+            keys.append((band, value))
+        return keys
+
+    def _insert(self, index: _UserIndex, content_id: int, fingerprint: int):
+        if content_id in index.fingerprints:
+            return
+        index.fingerprints[content_id] = fingerprint
+        for key in self._band_keys(fingerprint):
+            index.buckets[key].append(content_id)
+        index.last_id = max(index.last_id, content_id)
+
+    def _load(self, db: Session, user_id: int) -> _UserIndex:
+        """사용자 색인 적재 - 다른 프로세스(대량 생성 워커 등)가 추가한 지문도 id 기준으로 이어서 읽음"""
+        with self._lock:
+            index = self._users.get(user_id)
+            if index is None:
+                index = self._users[user_id] = _UserIndex()
+            last_id = index.last_id
+        rows = db.query(GeneratedContent.id, GeneratedContent.simhash).filter(
+            GeneratedContent.user_id == user_id,
+            GeneratedContent.id > last_id,
+            GeneratedContent.simhash.isnot(None)
+        ).all()
+        if rows:
+            with self._lock:
+                for content_id, value in rows:
+                    self._insert(index, content_id, to_unsigned(value))
+        return index
+
+    def add(self, user_id: int, content_id: int, fingerprint: int):
+        """저장된 콘텐츠의 지문 추가 (해당 사용자 색인이 적재된 경우에만, 아니면 다음 조회 시 DB에서 읽음)"""
+        with self._lock:
+            index = self._users.get(user_id)
+            if index is not None:
+                self._insert(index, content_id, fingerprint)
+
+    def remove(self, user_id: int, content_id: int):
+        with self._lock:
+            index = self._users.get(user_id)
+            if index is None:
+                return
+            fingerprint = index.fingerprints.pop(content_id, None)
+            if fingerprint is None:
+                return
+            for key in self._band_keys(fingerprint):
+                bucket = index.buckets.get(key)
+                if bucket and content_id in bucket:
+                    bucket.remove(content_id)
+
+    def find(self, db: Session, user_id: int, fingerprint: int,
+             exclude_id: Optional[int] = None) -> List[Dict]:
+        """해밍 거리 max_distance 이하인 사용자의 기존 콘텐츠 (가까운 순)"""
+        index = self._load(db, user_id)
+        matches = {}
+        with self._lock:
+            for key in self._band_keys(fingerprint):
+                for content_id in index.buckets.get(key, ()):
+                    if content_id == exclude_id or content_id in matches:
+                        continue
+                    distance = hamming_distance(fingerprint, index.fingerprints[content_id])
+                    if distance <= self.max_distance:
+                        matches[content_id] = distance
+        return [
+            {'content_id': content_id, 'distance': distance,
+             'similarity': round(1 - distance / FINGERPRINT_BITS, 4)}
+            for content_id, distance in sorted(matches.items(), key=lambda m: (m[1], -m[0]))
+        ]
+
+    def check(self, db: Session, user_id: Optional[int], text: str,
+              exclude_id: Optional[int] = None) -> Optional[Dict]:
+        """새 생성 결과의 중복 여부 (응답의 duplicate 필드, 이미 저장된 결과는 exclude_id로 자신 제외)"""
+        if not db or not user_id:
+            return None
+        fingerprint = simhash(text)
+        matches = self.find(db, user_id, fingerprint, exclude_id=exclude_id)
+        return {'is_duplicate': bool(matches), 'matches': matches[:5], 'fingerprint': f"{fingerprint:016x}"}
+
+duplicate_index = DuplicateIndex(
+    max_distance=int(os.getenv('DUPLICATE_MAX_DISTANCE', '4')),
+    action=os.getenv('DUPLICATE_ACTION', 'flag')
+)
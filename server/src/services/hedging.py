@@ -0,0 +1,111 @@
+import os
+import queue
+import threading
+import time
+from typing import Callable, Iterator, List, Optional, Tuple
+
+class HedgeTimeout(Exception):
+    """마감 시간 안에 어떤 제공자도 첫 토큰을 보내지 않음"""
+
+class _Attempt:
+    __slots__ = ('label', 'parts', 'cancel', 'error')
+
+    def __init__(self, label):
+        self.label = label
+        self.parts: List[str] = []
+        self.cancel = threading.Event()
+        self.error: Optional[Exception] = None
+
+class HedgedCompletion:
+    """헤지 요청 - 첫 토큰이 마감 시간 안에 오지 않으면 다음 제공자에 같은 요청을 보내고 먼저 끝난 응답 사용
+
+    진 쪽 스트림은 다음 청크를 받는 시점에 닫혀(GeneratorExit) 연결과 호출 기록이 정리됨
+    """
+
+    def __init__(self, deadline: float = 10, demo_fallback: bool = False):
+        # deadline <= 0 이면 헤지하지 않음
+        self.deadline = deadline
+        # 더 시도할 제공자가 없을 때 마감 시간이 지나면 HedgeTimeout으로 포기 (호출자가 데모 콘텐츠로 대체)
+        self.demo_fallback = demo_fallback
+
+    @property
+    def enabled(self) -> bool:
+        return self.deadline > 0
+
+    @staticmethod
+    def _worker(attempt: _Attempt, factory: Callable[[], Iterator[str]], events: queue.Queue):
+        chunks = None
+        try:
+            chunks = factory()
+            for chunk in chunks:
+                if attempt.cancel.is_set():
+                    return
+                attempt.parts.append(chunk)
+                if len(attempt.parts) == 1:
+                    events.put(('first', attempt))
+            if not attempt.cancel.is_set():
+                events.put(('done', attempt))
+        except Exception as e:
+            attempt.error = e
+            events.put(('error', attempt))
+        finally:
+            if chunks is not None and hasattr(chunks, 'close'):
+                chunks.close()
+
+    def run(self, attempts: List[Tuple[object, Callable[[], Iterator[str]]]]) -> Tuple[str, object]:
+        """(라벨, 스트림 생성 함수) 목록을 순서대로 헤지 실행하고 (전체 응답, 이긴 라벨) 반환"""
+        events = queue.Queue()
+        pending = list(attempts)
+        running: List[_Attempt] = []
+        errors = []
+        first_token = False
+
+        def launch():
+            label, factory = pending.pop(0)
+            attempt = _Attempt(label)
+            running.append(attempt)
+            threading.Thread(target=self._worker, args=(attempt, factory, events),
+                             name='llm-hedge', daemon=True).start()
+
+        def cancel_all():
+            for attempt in running:
+                attempt.cancel.set()
+
+        launch()
+        hedge_at = time.monotonic() + self.deadline
+        while True:
+            timeout = None
+            if not first_token and (pending or self.demo_fallback):
+                timeout = max(0.0, hedge_at - time.monotonic())
+            try:
+                kind, attempt = events.get(timeout=timeout)
+            except queue.Empty:
+                if pending:
+                    print(f"첫 토큰 지연({self.deadline}초 초과) - 다음 제공자로 헤지 요청")
+                    launch()
+                    hedge_at = time.monotonic() + self.deadline
+                    continue
+                cancel_all()
+                raise HedgeTimeout(f"{self.deadline}초 안에 첫 토큰을 받지 못했습니다.")
+
+            if kind == 'first':
+                first_token = True
+            elif kind == 'done':
+                running.remove(attempt)
+                cancel_all()
+                return ''.join(attempt.parts), attempt.label
+            else:
+                running.remove(attempt)
+                errors.append(f"{getattr(attempt.label, 'name', attempt.label)}: {attempt.error}")
+                first_token = any(a.parts for a in running)
+                # 실행 중인 요청이 없으면 다음 제공자를 바로 시작
+                if pending and not running:
+                    launch()
+                    hedge_at = time.monotonic() + self.deadline
+                elif not running:
+                    raise Exception(f"모든 LLM 제공자 호출 실패 - {'; '.join(errors)}")
+
+hedged_completion = HedgedCompletion(
+    deadline=float(os.getenv('LLM_HEDGE_DEADLINE', '10')),
+    demo_fallback=os.getenv('LLM_HEDGE_DEMO_FALLBACK', 'false').lower() == 'true'
+)
@@ -0,0 +1,206 @@
+import asyncio
+import json
+import os
+import weakref
+from typing import Dict, List, Optional
+
+import httpx
+
+from src.services.llm_client_registry import client_registry
+from src.services.llm_telemetry import CallTrace, llm_telemetry
+from src.services.model_registry import model_registry
+from src.services.rate_limiter import estimate_tokens, openai_rate_limiter
+
+DEFAULT_OLLAMA_URL = 'http://localhost:11434/api/generate'
+ANTHROPIC_API_URL = 'https://api.anthropic.com/v1/messages'
+# 요청 사이에 Ollama가 모델을 메모리에서 내리지 않도록 유지할 시간
+OLLAMA_KEEP_ALIVE = os.getenv('OLLAMA_KEEP_ALIVE', '30m')
+
+# 이벤트 루프별로 하나의 httpx.AsyncClient를 공유 (커넥션 풀 재사용)
+_http_clients = weakref.WeakKeyDictionary()
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """현재 이벤트 루프에서 공유하는 비동기 HTTP 클라이언트 반환"""
+    loop = asyncio.get_running_loop()
+    client = _http_clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            timeout=httpx.Timeout(60.0, connect=10.0),
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+        )
+        _http_clients[loop] = client
+    return client
+
+
+async def close_async_http_client():
+    """현재 이벤트 루프의 공유 HTTP 클라이언트 종료"""
+    loop = asyncio.get_running_loop()
+    client = _http_clients.pop(loop, None)
+    if client is not None and not client.is_closed:
+        await client.aclose()
+
+
+def get_ollama_base_url(base_url: Optional[str]) -> str:
+    """Ollama base_url에서 기본 URL 추출"""
+    base_url = base_url or DEFAULT_OLLAMA_URL
+    if base_url.endswith('/api/generate'):
+        return base_url[:-len('/api/generate')]
+    return base_url.rstrip('/')
+
+
+def parse_ollama_chunk(line) -> Dict:
+    """Ollama NDJSON 스트림의 한 줄을 파싱 (오류 줄은 예외로 변환)"""
+    chunk = json.loads(line)
+    if chunk.get('error'):
+        raise Exception(f"Ollama API 오류: {chunk['error']}")
+    return chunk
+
+
+class AsyncLLMClient:
+    """이벤트 루프를 막지 않는 LLM 호출 계층 (OpenAI/Ollama/Anthropic)"""
+
+    def __init__(self, http_client: Optional[httpx.AsyncClient] = None):
+        self._http_client = http_client
+
+    @property
+    def http(self) -> httpx.AsyncClient:
+        return self._http_client or get_async_http_client()
+
+    async def chat(self, provider_type: str, prompt: str, model: str,
+                   api_key: Optional[str] = None, base_url: Optional[str] = None,
+                   system_prompt: Optional[str] = None, max_tokens: Optional[int] = None,
+                   temperature: float = 0.7, timeout: float = 60,
+                   user_id: Optional[int] = None, operation: str = 'llm_generate') -> str:
+        """제공자 타입에 맞는 비동기 채팅 완성 호출 (호출마다 토큰/지연 시간 기록)
+        
+        max_tokens는 모델 컨텍스트에 맞춰 줄어들고, 넘치는 prompt는 보내기 전에 잘림
+        """
+        if provider_type not in ('openai', 'ollama', 'anthropic'):
+            raise ValueError(f"지원하지 않는 제공자 타입: {provider_type}")
+
+        plan = model_registry.plan(model, provider_type, system_prompt or '', prompt, max_tokens)
+        prompt, max_tokens = plan.user, plan.max_tokens
+
+        with llm_telemetry.track(provider_type, model, operation=operation, user_id=user_id) as trace:
+            if provider_type == 'openai':
+                return await self._chat_openai(prompt, model, api_key, base_url, system_prompt,
+                                               max_tokens, temperature, timeout, trace)
+            elif provider_type == 'ollama':
+                return await self._chat_ollama(prompt, model, base_url, system_prompt, timeout, trace,
+                                               options=model_registry.ollama_options(plan))
+            else:
+                return await self._chat_anthropic(prompt, model, api_key, system_prompt,
+                                                  max_tokens, timeout, trace)
+
+    async def list_ollama_models(self, base_url: Optional[str], timeout: float = 5) -> List[str]:
+        """Ollama 서버에 설치된 모델 목록 조회"""
+        response = await self.http.get(f"{get_ollama_base_url(base_url)}/api/tags", timeout=timeout)
+        response.raise_for_status()
+        return [m['name'] for m in response.json().get('models', [])]
+
+    async def _chat_openai(self, prompt: str, model: str, api_key: Optional[str],
+                           base_url: Optional[str], system_prompt: Optional[str],
+                           max_tokens: int, temperature: float, timeout: float,
+                           trace: CallTrace) -> str:
+        client = client_registry.get_async_openai_client(api_key, self.http, base_url=base_url)
+
+        async def request():
+            raw = await client.chat.completions.with_raw_response.create(
+                model=model,
+                messages=self._build_messages(prompt, system_prompt),
+                max_tokens=max_tokens,
+                temperature=temperature,
+                timeout=timeout
+            )
+            openai_rate_limiter.update_from_headers(api_key, raw.headers)
+            return raw.parse()
+
+        response = await openai_rate_limiter.call_async(
+            api_key, estimate_tokens(prompt) + max_tokens, request
+        )
+        if response.usage:
+            details = getattr(response.usage, 'prompt_tokens_details', None)
+            trace.set_usage(response.usage.prompt_tokens, response.usage.completion_tokens,
+                            getattr(details, 'cached_tokens', None) if details else None)
+        return response.choices[0].message.content
+
+    async def warm_up_ollama(self, model: str, base_url: Optional[str], timeout: float = 300):
+        """빈 프롬프트로 모델을 메모리에 올리고 keep_alive 동안 유지 (생성 요청과 같은 num_ctx)"""
+        response = await self.http.post(f"{get_ollama_base_url(base_url)}/api/generate",
+                                        json={"model": model, "keep_alive": OLLAMA_KEEP_ALIVE,
+                                              "stream": False,
+                                              "options": {"num_ctx": model_registry.get(model, 'ollama').context_window}},
+                                        timeout=timeout)
+        if response.status_code != 200:
+            raise Exception(f"Ollama API 오류: {response.status_code} - {response.text}")
+
+    async def _chat_ollama(self, prompt: str, model: str, base_url: Optional[str],
+                           system_prompt: Optional[str], timeout: float, trace: CallTrace,
+                           options: Optional[Dict] = None) -> str:
+        data = {
+            "model": model,
+            "prompt": prompt,
+            "stream": True,
+            "keep_alive": OLLAMA_KEEP_ALIVE
+        }
+        if options:
+            data["options"] = options
+        if system_prompt:
+            data["system"] = system_prompt
+
+        parts = []
+        async with self.http.stream('POST', f"{get_ollama_base_url(base_url)}/api/generate",
+                                    json=data, timeout=timeout) as response:
+            if response.status_code != 200:
+                await response.aread()
+                raise Exception(f"Ollama API 오류: {response.status_code} - {response.text}")
+            async for line in response.aiter_lines():
+                if not line:
+                    continue
+                chunk = parse_ollama_chunk(line)
+                if chunk.get('response'):
+                    trace.first_token()
+                    parts.append(chunk['response'])
+                if chunk.get('done'):
+                    trace.set_usage(chunk.get('prompt_eval_count'), chunk.get('eval_count'))
+        return ''.join(parts)
+
+    async def _chat_anthropic(self, prompt: str, model: str, api_key: Optional[str],
+                              system_prompt: Optional[str], max_tokens: int,
+                              timeout: float, trace: CallTrace) -> str:
+        headers = {
+            'x-api-key': api_key or '',
+            'Content-Type': 'application/json',
+            'anthropic-version': '2023-06-01'
+        }
+        data = {
+            'model': model,
+            'max_tokens': max_tokens,
+            'messages': [{'role': 'user', 'content': prompt}]
+        }
+        if system_prompt:
+            # Anthropic은 명시한 지점까지만 프롬프트를 캐시하므로 고정된 system 블록에 표시
+            data['system'] = [{'type': 'text', 'text': system_prompt,
+                               'cache_control': {'type': 'ephemeral'}}]
+
+        response = await self.http.post(ANTHROPIC_API_URL, headers=headers, json=data, timeout=timeout)
+        if response.status_code != 200:
+            raise Exception(f"Anthropic API 오류: {response.status_code}")
+        usage = response.json().get('usage') or {}
+        # input_tokens에는 캐시에서 읽거나 캐시에 기록한 토큰이 포함되지 않음
+        cached = usage.get('cache_read_input_tokens') or 0
+        prompt_tokens = None
+        if usage.get('input_tokens') is not None:
+            prompt_tokens = usage['input_tokens'] + cached + (usage.get('cache_creation_input_tokens') or 0)
+        trace.set_usage(prompt_tokens, usage.get('output_tokens'), cached)
+        blocks = response.json().get('content', [])
+        return ''.join(block.get('text', '') for block in blocks)
+
+    @staticmethod
+    def _build_messages(prompt: str, system_prompt: Optional[str]) -> List[Dict]:
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+        return messages
@@ -0,0 +1,142 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, List, Optional, Tuple
+
+import httpx
+from openai import AsyncOpenAI, OpenAI
+
+
+class _RegistryEntry:
+    __slots__ = ('client', 'http_client', 'owns_http_client', 'last_used')
+
+    def __init__(self, client, http_client, owns_http_client: bool = True):
+        self.client = client
+        self.http_client = http_client
+        # 비동기 클라이언트는 호출자가 준 공유 HTTP 풀을 쓰므로 닫지 않음
+        self.owns_http_client = owns_http_client
+        self.last_used = time.monotonic()
+
+
+class LLMClientRegistry:
+    """제공자 설정별 LLM 클라이언트 풀 (LRU + 유휴 만료)
+
+    목록에서 빠진 클라이언트는 다른 스레드가 아직 요청 중일 수 있으므로
+    close_grace 동안 보관한 뒤 닫음
+    """
+
+    def __init__(self, max_size: int = 32, idle_ttl: float = 600, close_grace: float = 600):
+        self.max_size = max_size
+        self.idle_ttl = idle_ttl
+        self.close_grace = close_grace
+        self._entries = OrderedDict()
+        self._retired: List[Tuple[float, _RegistryEntry]] = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(provider_type: str, base_url: Optional[str], api_key: Optional[str]) -> Tuple:
+        """(provider_type, base_url, api_key 해시) 키 생성 - 원본 키는 보관하지 않음"""
+        key_hash = hashlib.sha256((api_key or '').encode()).hexdigest()
+        return (provider_type, (base_url or '').rstrip('/'), key_hash)
+
+    def get_openai_client(self, api_key: Optional[str], base_url: Optional[str] = None,
+                          provider_type: str = 'openai') -> OpenAI:
+        """동기 OpenAI 호환 클라이언트 조회 (없으면 생성)"""
+        key = ('sync',) + self.make_key(provider_type, base_url, api_key)
+
+        def factory():
+            http_client = httpx.Client(
+                timeout=httpx.Timeout(120.0, connect=10.0),
+                limits=httpx.Limits(max_connections=50, max_keepalive_connections=10)
+            )
+            # 재시도는 rate_limiter가 키별 버킷과 함께 처리
+            client = OpenAI(api_key=api_key, base_url=base_url, http_client=http_client, max_retries=0)
+            return _RegistryEntry(client, http_client)
+
+        return self._get_or_create(key, factory)
+
+    def get_async_openai_client(self, api_key: Optional[str], http_client: httpx.AsyncClient,
+                                base_url: Optional[str] = None,
+                                provider_type: str = 'openai') -> AsyncOpenAI:
+        """비동기 OpenAI 호환 클라이언트 조회 - 주어진 공유 HTTP 풀 위에서 생성"""
+        key = ('async', id(http_client)) + self.make_key(provider_type, base_url, api_key)
+
+        def factory():
+            client = AsyncOpenAI(api_key=api_key, base_url=base_url, http_client=http_client, max_retries=0)
+            return _RegistryEntry(client, http_client, owns_http_client=False)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            # 같은 id로 재할당된 다른 HTTP 클라이언트면 새로 생성
+            if entry is not None and entry.http_client is not http_client:
+                del self._entries[key]
+        return self._get_or_create(key, factory)
+
+    def _get_or_create(self, key: Tuple, factory: Callable[[], _RegistryEntry]):
+        now = time.monotonic()
+        with self._lock:
+            expired = self._pop_expired(now)
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = factory()
+                self._entries[key] = entry
+                while len(self._entries) > self.max_size:
+                    _, evicted = self._entries.popitem(last=False)
+                    expired.append(evicted)
+            else:
+                self._entries.move_to_end(key)
+            entry.last_used = now
+            client = entry.client
+            self._retired.extend((now, evicted) for evicted in expired if evicted.owns_http_client)
+            closable = self._pop_retired(now)
+
+        for retired in closable:
+            self._close(retired)
+        return client
+
+    def _pop_expired(self, now: float):
+        expired = []
+        while self._entries:
+            key, entry = next(iter(self._entries.items()))
+            if now - entry.last_used < self.idle_ttl:
+                break
+            del self._entries[key]
+            expired.append(entry)
+        return expired
+
+    def _pop_retired(self, now: float):
+        """유예 시간이 지나 닫아도 되는 클라이언트"""
+        closable = [entry for retired_at, entry in self._retired if now - retired_at >= self.close_grace]
+        if closable:
+            self._retired = [(retired_at, entry) for retired_at, entry in self._retired
+                             if now - retired_at < self.close_grace]
+        return closable
+
+    @staticmethod
+    def _close(entry: _RegistryEntry):
+        if entry.owns_http_client and entry.http_client is not None:
+            try:
+                entry.http_client.close()
+            except Exception:
+                pass
+
+    def clear(self):
+        """등록된 모든 클라이언트 정리 (종료 시 사용 - 유예 중인 클라이언트도 바로 닫음)"""
+        with self._lock:
+            entries = list(self._entries.values()) + [entry for _, entry in self._retired]
+            self._entries.clear()
+            self._retired = []
+        for entry in entries:
+            self._close(entry)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+client_registry = LLMClientRegistry(
+    max_size=int(os.getenv('LLM_CLIENT_POOL_SIZE', '32')),
+    idle_ttl=float(os.getenv('LLM_CLIENT_IDLE_TTL', '600')),
+    close_grace=float(os.getenv('LLM_CLIENT_CLOSE_GRACE', '600'))
+)
@@ -2,8 +2,12 @@ import os
 import json
 from typing import List, Dict, Optional
 from datetime import datetime
-import requests
-from openai import OpenAI
+import httpx
+from openai import APIConnectionError, APITimeoutError
+
+from src.services.llm_client import AsyncLLMClient
+from src.services.llm_client_registry import client_registry
+from src.services.model_registry import DEFAULT_OPENAI_MODEL
 
 class LLMService:
     """LLM 제공자 관리 서비스"""
@@ -12,6 +16,7 @@ class LLMService:
         # 간단한 메모리 기반 저장소 (실제 환경에서는 데이터베이스 사용)
         self.providers_store = {}
         self.user_providers = {}
+        self.llm_client = AsyncLLMClient()
     
     def get_user_providers(self, user_id: int) -> List[Dict]:
         """사용자의 LLM 제공자 목록 조회"""
@@ -24,7 +29,7 @@ class LLMService:
                 'id': 0,
                 'name': 'Default OpenAI',
                 'provider_type': 'openai',
-                'model_name': 'gpt-3.5-turbo',
+                'model_name': DEFAULT_OPENAI_MODEL,
                 'is_active': len(user_providers) == 0,  # 다른 제공자가 없으면 활성화
                 'status': 'connected',
                 'created_at': datetime.utcnow().isoformat()
@@ -33,7 +38,7 @@ class LLMService:
         
         return user_providers
     
-    def add_provider(self, user_id: int, name: str, provider_type: str, 
+    async def add_provider(self, user_id: int, name: str, provider_type: str, 
                     api_key: Optional[str], base_url: Optional[str], 
                     model_name: str, is_active: bool = False) -> Dict:
         """새 LLM 제공자 추가"""
@@ -63,7 +68,7 @@ class LLMService:
         
         # 연결 테스트
         try:
-            test_result = self.test_connection(provider_type, api_key, base_url, model_name)
+            test_result = await self.test_connection(provider_type, api_key, base_url, model_name)
             provider['status'] = 'connected' if test_result['success'] else 'disconnected'
         except:
             provider['status'] = 'disconnected'
@@ -71,7 +76,7 @@ class LLMService:
         self.user_providers[user_id].append(provider)
         return provider
     
-    def update_provider(self, provider_id: int, user_id: int, name: str, 
+    async def update_provider(self, provider_id: int, user_id: int, name: str, 
                        provider_type: str, api_key: Optional[str], 
                        base_url: Optional[str], model_name: str, 
                        is_active: bool = False) -> Dict:
@@ -100,7 +105,7 @@ class LLMService:
                 
                 # 연결 테스트
                 try:
-                    test_result = self.test_connection(provider_type, api_key, base_url, model_name)
+                    test_result = await self.test_connection(provider_type, api_key, base_url, model_name)
                     provider['status'] = 'connected' if test_result['success'] else 'disconnected'
                 except:
                     provider['status'] = 'disconnected'
@@ -146,7 +151,7 @@ class LLMService:
         
         return None
     
-    def test_connection(self, provider_type: str, api_key: Optional[str], 
+    async def test_connection(self, provider_type: str, api_key: Optional[str], 
                        base_url: Optional[str], model_name: str) -> Dict:
         """LLM 연결 테스트"""
         
@@ -161,12 +166,9 @@ class LLMService:
                         }
                 
                 # OpenAI API 테스트
-                client = OpenAI(api_key=api_key)
-                response = client.chat.completions.create(
-                    model=model_name,
-                    messages=[{"role": "user", "content": "Hello"}],
-                    max_tokens=5
-                )
+                await self.llm_client.chat('openai', 'Hello', model_name,
+                                           api_key=api_key, max_tokens=5, timeout=10,
+                                           operation='connection_test')
                 
                 return {
                     'success': True,
@@ -175,54 +177,37 @@ class LLMService:
                 }
                 
             elif provider_type == 'ollama':
-                # Ollama API 테스트
-                if not base_url:
-                    base_url = 'http://localhost:11434/api/generate'
-                
-                # base_url에서 기본 URL 추출
-                if base_url.endswith('/api/generate'):
-                    ollama_base = base_url.replace('/api/generate', '')
-                else:
-                    ollama_base = base_url
-                
                 # Ollama 서버 상태 확인
-                response = requests.get(f"{ollama_base}/api/tags", timeout=5)
-                if response.status_code == 200:
-                    models = response.json().get('models', [])
-                    model_names = [m['name'] for m in models]
-                    
-                    if model_name in model_names:
-                        # 실제 생성 테스트
-                        test_response = requests.post(f"{ollama_base}/api/generate", 
-                            json={
-                                "model": model_name,
-                                "prompt": "Hello",
-                                "stream": False
-                            },
-                            timeout=10
-                        )
-                        
-                        if test_response.status_code == 200:
-                            return {
-                                'success': True,
-                                'message': f'Ollama 연결 성공 - {model_name} 모델 테스트 완료',
-                                'available_models': model_names
-                            }
-                        else:
-                            return {
-                                'success': False,
-                                'message': f'Ollama 모델 테스트 실패: {test_response.text}'
-                            }
-                    else:
-                        return {
-                            'success': False,
-                            'message': f'{model_name} 모델을 찾을 수 없습니다. 사용 가능한 모델: {", ".join(model_names)}'
-                        }
-                else:
+                try:
+                    model_names = await self.llm_client.list_ollama_models(base_url)
+                except httpx.HTTPStatusError:
                     return {
                         'success': False,
                         'message': 'Ollama 서버에 연결할 수 없습니다.'
                     }
+                
+                if model_name not in model_names:
+                    return {
+                        'success': False,
+                        'message': f'{model_name} 모델을 찾을 수 없습니다. 사용 가능한 모델: {", ".join(model_names)}'
+                    }
+                
+                # 생성 호출 대신 모델을 적재해 보고, 적재된 모델은 keep_alive 동안 유지
+                try:
+                    await self.llm_client.warm_up_ollama(model_name, base_url)
+                except httpx.TimeoutException:
+                    raise
+                except Exception as e:
+                    return {
+                        'success': False,
+                        'message': f'Ollama 모델 테스트 실패: {str(e)}'
+                    }
+                
+                return {
+                    'success': True,
+                    'message': f'Ollama 연결 성공 - {model_name} 모델 적재 완료',
+                    'available_models': model_names
+                }
             
             elif provider_type == 'anthropic':
                 if not api_key:
@@ -232,36 +217,23 @@ class LLMService:
                     }
                 
                 # Anthropic API 테스트 (간단한 구현)
-                headers = {
-                    'x-api-key': api_key,
-                    'Content-Type': 'application/json',
-                    'anthropic-version': '2023-06-01'
-                }
-                
-                data = {
-                    'model': model_name,
-                    'max_tokens': 5,
-                    'messages': [{'role': 'user', 'content': 'Hello'}]
-                }
-                
-                response = requests.post(
-                    'https://api.anthropic.com/v1/messages',
-                    headers=headers,
-                    json=data,
-                    timeout=10
-                )
-                
-                if response.status_code == 200:
-                    return {
-                        'success': True,
-                        'message': 'Anthropic 연결 성공',
-                        'model': model_name
-                    }
-                else:
+                try:
+                    await self.llm_client.chat('anthropic', 'Hello', model_name,
+                                               api_key=api_key, max_tokens=5, timeout=10,
+                                               operation='connection_test')
+                except httpx.TimeoutException:
+                    raise
+                except Exception as e:
                     return {
                         'success': False,
-                        'message': f'Anthropic API 오류: {response.status_code}'
+                        'message': str(e)
                     }
+                
+                return {
+                    'success': True,
+                    'message': 'Anthropic 연결 성공',
+                    'model': model_name
+                }
             
             else:
                 return {
@@ -269,12 +241,12 @@ class LLMService:
                     'message': f'지원하지 않는 제공자 타입: {provider_type}'
                 }
                 
-        except requests.exceptions.Timeout:
+        except (httpx.TimeoutException, APITimeoutError):
             return {
                 'success': False,
                 'message': '연결 시간 초과'
             }
-        except requests.exceptions.ConnectionError:
+        except (httpx.ConnectError, APIConnectionError):
             return {
                 'success': False,
                 'message': '서버에 연결할 수 없습니다'
@@ -293,7 +265,7 @@ class LLMService:
             # 환경변수에서 OpenAI API 키 확인
             openai_api_key = os.getenv('OPENAI_API_KEY')
             if openai_api_key:
-                return OpenAI(api_key=openai_api_key), 'gpt-3.5-turbo'
+                return client_registry.get_openai_client(openai_api_key), DEFAULT_OPENAI_MODEL
             else:
                 raise ValueError("활성화된 LLM 제공자가 없습니다.")
         
@@ -302,13 +274,14 @@ class LLMService:
             if not api_key:
                 raise ValueError("OpenAI API 키가 설정되지 않았습니다.")
             
-            return OpenAI(api_key=api_key), provider['model_name']
+            return client_registry.get_openai_client(api_key), provider['model_name']
         
         elif provider['provider_type'] == 'ollama':
             base_url = provider.get('base_url', 'http://localhost:11434/v1')
-            return OpenAI(
+            return client_registry.get_openai_client(
+                'ollama',  # Ollama는 API 키가 필요하지 않음
                 base_url=base_url,
-                api_key='ollama'  # Ollama는 API 키가 필요하지 않음
+                provider_type='ollama'
             ), provider['model_name']
         
         else:
@@ -328,45 +301,17 @@ class LLMService:
                     if not api_key:
                         raise ValueError("OpenAI API 키가 필요합니다.")
                 
-                client = OpenAI(api_key=api_key)
-                response = client.chat.completions.create(
-                    model=model or 'gpt-3.5-turbo',
-                    messages=[{"role": "user", "content": prompt}],
-                    max_tokens=2000,
-                    temperature=0.7
-                )
-                
-                return response.choices[0].message.content
+                # max_tokens는 모델의 컨텍스트/출력 한도에 맞춰 자동 결정
+                return await self.llm_client.chat('openai', prompt, model or DEFAULT_OPENAI_MODEL,
+                                                  api_key=api_key, temperature=0.7, user_id=user_id)
                 
             elif provider_type == 'ollama':
                 # Ollama API 사용
-                if not base_url:
-                    base_url = 'http://localhost:11434/api/generate'
-                
-                # base_url에서 기본 URL 추출
-                if base_url.endswith('/api/generate'):
-                    ollama_base = base_url.replace('/api/generate', '')
-                else:
-                    ollama_base = base_url
-                
-                response = requests.post(f"{ollama_base}/api/generate", 
-                    json={
-                        "model": model,
-                        "prompt": prompt,
-                        "stream": False
-                    },
-                    timeout=60
-                )
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    return result.get('response', '')
-                else:
-                    raise Exception(f"Ollama API 오류: {response.status_code} - {response.text}")
+                return await self.llm_client.chat('ollama', prompt, model, base_url=base_url, timeout=60,
+                                                  user_id=user_id)
             
             else:
                 raise ValueError(f"지원하지 않는 제공자 타입: {provider_type}")
                 
         except Exception as e:
             raise Exception(f"콘텐츠 생성 실패: {str(e)}")
-
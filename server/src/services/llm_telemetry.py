@@ -0,0 +1,204 @@
+import math
+import os
+import queue
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from src.db import SessionLocal
+from src.models.llm_usage import LLMCallRecord
+from src.models.user import User
+
+GROUP_BY_FIELDS = ('provider_type', 'model_name', 'operation', 'content_type', 'user_id')
+
+class TokenBudgetExceeded(Exception):
+    """월간 토큰 한도 초과"""
+
+class CallTrace:
+    """LLM 호출 한 건의 측정값 (첫 토큰 시각, 토큰 사용량)"""
+
+    __slots__ = ('started', 'first_token_at', 'prompt_tokens', 'completion_tokens', 'cached_tokens')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.first_token_at = None
+        self.prompt_tokens = None
+        self.completion_tokens = None
+        self.cached_tokens = None
+
+    def first_token(self):
+        if self.first_token_at is None:
+            self.first_token_at = time.perf_counter()
+
+    def set_usage(self, prompt_tokens: Optional[int], completion_tokens: Optional[int],
+                  cached_tokens: Optional[int] = None):
+        self.prompt_tokens = prompt_tokens
+        self.completion_tokens = completion_tokens
+        self.cached_tokens = cached_tokens
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """최근접 순위 방식 백분위수"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, math.ceil(q / 100 * len(ordered)) - 1))
+    return round(ordered[index], 1)
+
+class LLMTelemetry:
+    """모든 LLM 호출의 토큰/지연 시간/결과 기록 - 요청 경로를 막지 않도록 백그라운드 스레드에서 저장"""
+
+    def __init__(self, session_factory=SessionLocal, enabled: bool = True, batch_size: int = 100):
+        self.session_factory = session_factory
+        self.enabled = enabled
+        self.batch_size = batch_size
+        self._queue = queue.Queue()
+        self._writer = None
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def track(self, provider_type: str, model_name: str, operation: str = 'content',
+              user_id: Optional[int] = None, content_type: Optional[str] = None):
+        """with 블록 안의 호출을 측정하고 종료 시 기록 (예외는 그대로 전달)"""
+        trace = CallTrace()
+        status, error = 'success', None
+        try:
+            yield trace
+        except GeneratorExit:
+            # 스트림 소비자가 중간에 연결을 끊은 경우
+            status = 'cancelled'
+            raise
+        except Exception as e:
+            status, error = 'error', str(e)[:1000]
+            raise
+        finally:
+            self._record(trace, provider_type, model_name, operation, user_id, content_type, status, error)
+
+    def _record(self, trace: CallTrace, provider_type: str, model_name: str, operation: str,
+                user_id: Optional[int], content_type: Optional[str], status: str, error: Optional[str]):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        total = None
+        if trace.prompt_tokens is not None or trace.completion_tokens is not None:
+            total = (trace.prompt_tokens or 0) + (trace.completion_tokens or 0)
+        self._queue.put({
+            'user_id': user_id,
+            'operation': operation,
+            'content_type': content_type,
+            'provider_type': provider_type or 'unknown',
+            'model_name': model_name or 'unknown',
+            'prompt_tokens': trace.prompt_tokens,
+            'completion_tokens': trace.completion_tokens,
+            'cached_tokens': trace.cached_tokens,
+            'total_tokens': total,
+            'ttft_ms': (trace.first_token_at - trace.started) * 1000 if trace.first_token_at else None,
+            'latency_ms': (now - trace.started) * 1000,
+            'status': status,
+            'error': error,
+            'created_at': datetime.utcnow()
+        })
+        self._ensure_writer()
+
+    def _ensure_writer(self):
+        with self._lock:
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(target=self._write_loop, name='llm-telemetry', daemon=True)
+                self._writer.start()
+
+    def _write_loop(self):
+        while True:
+            rows = [self._queue.get()]
+            while len(rows) < self.batch_size:
+                try:
+                    rows.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            db = self.session_factory()
+            try:
+                db.bulk_insert_mappings(LLMCallRecord, rows)
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                print(f"LLM 호출 기록 저장 오류: {e}")
+            finally:
+                db.close()
+                for _ in rows:
+                    self._queue.task_done()
+
+    def flush(self):
+        """대기 중인 기록이 모두 저장될 때까지 대기"""
+        self._queue.join()
+
+    @staticmethod
+    def _month_start(user: User) -> datetime:
+        now = datetime.utcnow()
+        start = datetime(now.year, now.month, 1)
+        if user.last_reset_date and user.last_reset_date > start:
+            start = user.last_reset_date
+        return start
+
+    def monthly_tokens(self, db: Session, user: User) -> int:
+        """이번 달(또는 마지막 초기화 이후) 사용한 토큰 수"""
+        used = db.query(func.coalesce(func.sum(LLMCallRecord.total_tokens), 0)).filter(
+            LLMCallRecord.user_id == user.id,
+            LLMCallRecord.created_at >= self._month_start(user)
+        ).scalar()
+        return int(used or 0)
+
+    def check_budget(self, db: Session, user_id: Optional[int]):
+        """월간 토큰 한도를 넘었으면 TokenBudgetExceeded 발생"""
+        if not db or not user_id:
+            return
+        user = db.get(User, user_id)
+        if not user:
+            return
+        limit = user.get_monthly_limits()['tokens']
+        used = self.monthly_tokens(db, user)
+        if used >= limit:
+            raise TokenBudgetExceeded(f"월간 토큰 한도({limit:,})를 모두 사용했습니다. (사용량: {used:,})")
+
+    def summarize(self, db: Session, days: int = 7, group_by: str = 'provider_type') -> List[Dict]:
+        """기간 내 호출을 그룹별로 집계 (호출 수, 토큰 합계, 프롬프트 캐시 적중률, 지연 시간 백분위수, 오류율)"""
+        if group_by not in GROUP_BY_FIELDS:
+            raise ValueError(f"group_by는 {', '.join(GROUP_BY_FIELDS)} 중 하나여야 합니다.")
+
+        column = getattr(LLMCallRecord, group_by)
+        rows = db.query(
+            column, LLMCallRecord.status, LLMCallRecord.prompt_tokens,
+            LLMCallRecord.completion_tokens, LLMCallRecord.cached_tokens, LLMCallRecord.latency_ms, LLMCallRecord.ttft_ms
+        ).filter(LLMCallRecord.created_at >= datetime.utcnow() - timedelta(days=days)).all()
+
+        groups = defaultdict(list)
+        for row in rows:
+            groups[row[0]].append(row)
+
+        summary = []
+        for key, items in groups.items():
+            latencies = [r.latency_ms for r in items]
+            ttfts = [r.ttft_ms for r in items if r.ttft_ms is not None]
+            errors = sum(1 for r in items if r.status == 'error')
+            prompt_tokens = sum(r.prompt_tokens or 0 for r in items)
+            cached_tokens = sum(r.cached_tokens or 0 for r in items)
+            summary.append({
+                group_by: key,
+                'calls': len(items),
+                'errors': errors,
+                'error_rate': round(errors / len(items), 4),
+                'prompt_tokens': prompt_tokens,
+                'cached_tokens': cached_tokens,
+                'cache_hit_ratio': round(cached_tokens / prompt_tokens, 4) if prompt_tokens else 0.0,
+                'completion_tokens': sum(r.completion_tokens or 0 for r in items),
+                'latency_ms': {'p50': percentile(latencies, 50), 'p95': percentile(latencies, 95),
+                               'p99': percentile(latencies, 99)},
+                'ttft_ms': {'p50': percentile(ttfts, 50), 'p95': percentile(ttfts, 95),
+                            'p99': percentile(ttfts, 99)}
+            })
+        return sorted(summary, key=lambda s: s['calls'], reverse=True)
+
+llm_telemetry = LLMTelemetry(enabled=os.getenv('LLM_TELEMETRY_ENABLED', 'true').lower() == 'true')
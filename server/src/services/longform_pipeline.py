@@ -0,0 +1,155 @@
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Tuple
+
+from src.services.prompt_templates import RenderedPrompt
+
+class SectionedContentPipeline:
+    """개요 생성 → H2 섹션 병렬 생성 → 결합/중복 제거 순서의 장문 콘텐츠 파이프라인"""
+
+    def __init__(self, max_workers: int = 4, section_retries: int = 2,
+                 min_sections: int = 3, max_sections: int = 8):
+        self.max_workers = max_workers
+        self.section_retries = section_retries
+        self.min_sections = min_sections
+        self.max_sections = max_sections
+
+    def build_outline_prompt(self, keyword: str, content_type: str, tone: str, target_audience: str,
+                             additional_keywords: List[str] = None, custom_instructions: str = "") -> str:
+        """제목과 H2 섹션 목록만 요청하는 개요 프롬프트"""
+        additional_keywords = additional_keywords or []
+
+        return f"""
+다음 조건에 맞는 SEO 최적화된 {content_type}의 개요를 한국어로 작성해주세요:
+
+- 메인 키워드: {keyword}
+- 추가 키워드: {', '.join(additional_keywords) if additional_keywords else '없음'}
+- 톤: {tone}
+- 타겟 독자: {target_audience}
+- 추가 지시사항: {custom_instructions if custom_instructions else '없음'}
+
+다음 형식으로 제목 한 줄과 {self.min_sections}-{self.max_sections}개의 섹션 제목만 작성해주세요 (본문 제외):
+# 제목
+## 섹션 제목
+## 섹션 제목
+
+제목에는 메인 키워드를 포함해주세요.
+            """
+
+    def parse_outline(self, text: str) -> Tuple[str, List[str]]:
+        """개요 응답에서 (제목, 섹션 제목 목록) 추출"""
+        title = ''
+        sections = []
+        for line in (text or '').splitlines():
+            line = line.strip()
+            if line.startswith('## '):
+                sections.append(line[3:].strip())
+            elif line.startswith('# ') and not title:
+                title = line[2:].strip()
+            elif re.match(r'^\d+[.)]\s+\S', line):
+                sections.append(re.sub(r'^\d+[.)]\s+', '', line))
+
+        sections = [s for s in dict.fromkeys(sections) if s][:self.max_sections]
+        if not title or len(sections) < self.min_sections:
+            raise ValueError("개요에서 제목/섹션을 찾을 수 없습니다.")
+        return title, sections
+
+    def build_section_prompt(self, keyword: str, title: str, sections: List[str], index: int,
+                             tone: str, target_audience: str, additional_keywords: List[str] = None,
+                             custom_instructions: str = "", total_words: int = 1500) -> RenderedPrompt:
+        """전체 개요를 공유 컨텍스트로 넣고 한 섹션의 본문만 요청
+        
+        개요 등 모든 섹션에 같은 부분을 prefix로 두어 섹션 요청들이 같은 접두부를 공유하게 함
+        (제공자 측 프롬프트 캐시 적중)
+        """
+        additional_keywords = additional_keywords or []
+        outline = '\n'.join(f"{i + 1}. {s}" for i, s in enumerate(sections))
+        words = max(150, total_words // len(sections))
+
+        prefix = f"""
+'{title}' 글의 일부를 한국어로 작성하고 있습니다.
+
+전체 개요:
+{outline}
+
+- 메인 키워드: {keyword}
+- 추가 키워드: {', '.join(additional_keywords) if additional_keywords else '없음'}
+- 톤: {tone}
+- 타겟 독자: {target_audience}
+- 추가 지시사항: {custom_instructions if custom_instructions else '없음'}
+
+섹션 제목은 다시 쓰지 말고, 다른 섹션에서 다룰 내용은 반복하지 마세요.
+키워드는 자연스럽게 2-3% 밀도로 사용해주세요.
+            """.strip()
+        request = f'이 중 {index + 1}번 섹션 "{sections[index]}"의 본문만 약 {words}단어로 작성해주세요.'
+        return RenderedPrompt(prefix, request, 'longform_section')
+
+    def generate_sections(self, prompts: List, complete: Callable[[str], str]) -> List[Dict]:
+        """섹션 프롬프트를 동시에 실행하고, 실패한 섹션만 개별 재시도"""
+        def run(prompt):
+            errors = []
+            for attempt in range(self.section_retries + 1):
+                try:
+                    return {'status': 'success', 'content': complete(prompt), 'attempts': attempt + 1}
+                except Exception as e:
+                    errors.append(str(e))
+            return {'status': 'failed', 'error': errors[-1], 'attempts': len(errors)}
+
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(prompts)))) as pool:
+            return list(pool.map(run, prompts))
+
+    def stitch(self, sections: List[str], results: List[Dict]) -> str:
+        """섹션 본문을 H2 제목과 결합하고 반복된 제목/문단 제거"""
+        seen = set()
+        parts = []
+        for heading, result in zip(sections, results):
+            if result['status'] != 'success':
+                continue
+            paragraphs = []
+            for paragraph in re.split(r'\n\s*\n', result['content'].strip()):
+                lines = paragraph.strip().splitlines()
+                # 섹션 맨 앞에 반복된 제목 줄 제거
+                while not paragraphs and lines and lines[0].lstrip().startswith('#'):
+                    lines = lines[1:]
+                text = '\n'.join(lines).strip()
+                normalized = re.sub(r'\s+', ' ', text).lower()
+                if not text or normalized in seen:
+                    continue
+                seen.add(normalized)
+                paragraphs.append(text)
+            if paragraphs:
+                parts.append(f"## {heading}\n\n" + '\n\n'.join(paragraphs))
+        return '\n\n'.join(parts)
+
+    def run(self, keyword: str, content_type: str, tone: str, target_audience: str,
+            complete: Callable[[str], str], additional_keywords: List[str] = None,
+            custom_instructions: str = "") -> Dict:
+        """개요 → 섹션 → 결합 실행 결과 (content는 '# 제목' 형식의 마크다운)"""
+        outline = complete(self.build_outline_prompt(keyword, content_type, tone, target_audience,
+                                                     additional_keywords, custom_instructions))
+        title, sections = self.parse_outline(outline)
+
+        prompts = [
+            self.build_section_prompt(keyword, title, sections, i, tone, target_audience,
+                                      additional_keywords, custom_instructions)
+            for i in range(len(sections))
+        ]
+        results = self.generate_sections(prompts, complete)
+        if not any(r['status'] == 'success' for r in results):
+            raise Exception(f"모든 섹션 생성 실패 - {results[0].get('error')}")
+
+        return {
+            'content': f"# {title}\n\n{self.stitch(sections, results)}",
+            'sections': [
+                {'heading': heading, 'status': r['status'], 'attempts': r['attempts'],
+                 **({'error': r['error']} if r['status'] == 'failed' else {})}
+                for heading, r in zip(sections, results)
+            ],
+            'failed_sections': sum(1 for r in results if r['status'] == 'failed')
+        }
+
+sectioned_pipeline = SectionedContentPipeline(
+    max_workers=int(os.getenv('LONGFORM_SECTION_WORKERS', '4')),
+    section_retries=int(os.getenv('LONGFORM_SECTION_RETRIES', '2'))
+)
@@ -0,0 +1,188 @@
+import os
+import re
+import threading
+from typing import Dict, Optional
+
+try:
+    import tiktoken
+except ImportError:
+    # tiktoken이 없으면 보수적인 추정치 사용
+    tiktoken = None
+
+DEFAULT_OPENAI_MODEL = os.getenv('OPENAI_DEFAULT_MODEL', 'gpt-3.5-turbo')
+
+TRIM_MARKER = "\n...(길이 제한으로 이하 생략)"
+
+_HANGUL_RE = re.compile(r'[ᄀ-ᇿ㄰-㆏가-힣]')
+
+class ModelSpec:
+    """모델별 컨텍스트 길이, 최대 출력 토큰 수, 토크나이저"""
+
+    __slots__ = ('name', 'provider_type', 'context_window', 'max_output_tokens', 'tokenizer')
+
+    def __init__(self, name: str, provider_type: str, context_window: int, max_output_tokens: int,
+                 tokenizer: Optional[str] = None):
+        self.name = name
+        self.provider_type = provider_type
+        self.context_window = context_window
+        self.max_output_tokens = max_output_tokens
+        self.tokenizer = tokenizer
+
+    def to_dict(self) -> Dict:
+        return {
+            'name': self.name,
+            'provider_type': self.provider_type,
+            'context_window': self.context_window,
+            'max_output_tokens': self.max_output_tokens,
+            'tokenizer': self.tokenizer
+        }
+
+# 모델 이름 접두사 기준 (가장 긴 접두사가 우선)
+KNOWN_MODELS = [
+    ModelSpec('gpt-3.5-turbo', 'openai', 16385, 4096, 'cl100k_base'),
+    ModelSpec('gpt-4', 'openai', 8192, 4096, 'cl100k_base'),
+    ModelSpec('gpt-4-32k', 'openai', 32768, 4096, 'cl100k_base'),
+    ModelSpec('gpt-4-turbo', 'openai', 128000, 4096, 'cl100k_base'),
+    ModelSpec('gpt-4o', 'openai', 128000, 16384, 'o200k_base'),
+    ModelSpec('gpt-4o-mini', 'openai', 128000, 16384, 'o200k_base'),
+    ModelSpec('gpt-4.1', 'openai', 1047576, 32768, 'o200k_base'),
+    ModelSpec('claude-3', 'anthropic', 200000, 4096),
+    ModelSpec('claude-3-5', 'anthropic', 200000, 8192),
+    ModelSpec('llama2', 'ollama', 4096, 2048),
+    ModelSpec('llama3', 'ollama', 8192, 4096),
+    ModelSpec('llama3.1', 'ollama', 131072, 8192),
+    ModelSpec('llama3.2', 'ollama', 131072, 8192),
+    ModelSpec('mistral', 'ollama', 32768, 8192),
+    ModelSpec('gemma2', 'ollama', 8192, 4096),
+    ModelSpec('qwen2.5', 'ollama', 32768, 8192),
+]
+
+# 등록되지 않은 모델의 제공자별 기본값
+PROVIDER_DEFAULTS = {
+    'openai': (16385, 4096, 'cl100k_base'),
+    'anthropic': (200000, 4096, None),
+    'ollama': (4096, 2048, None),
+}
+
+class TokenPlan:
+    """요청 한 건의 토큰 계획 (잘린 사용자 메시지, max_tokens, 프롬프트 토큰 수)"""
+
+    __slots__ = ('user', 'max_tokens', 'prompt_tokens', 'context_window', 'trimmed')
+
+    def __init__(self, user: str, max_tokens: int, prompt_tokens: int, context_window: int, trimmed: bool):
+        self.user = user
+        self.max_tokens = max_tokens
+        self.prompt_tokens = prompt_tokens
+        self.context_window = context_window
+        self.trimmed = trimmed
+
+class ModelRegistry:
+    """모델 능력 레지스트리 - 로컬 토큰 계산으로 max_tokens를 정하고 넘치는 입력은 보내기 전에 자름"""
+
+    def __init__(self, target_output_tokens: int = 4096, ollama_num_ctx: int = 8192, safety_margin: int = 64):
+        # 출력 목표 토큰 수 (모델 한도/남은 컨텍스트보다 크면 줄임)
+        self.target_output_tokens = target_output_tokens
+        # Ollama는 요청의 num_ctx만큼만 컨텍스트를 쓰므로 모델 한도와 이 값 중 작은 값 사용
+        self.ollama_num_ctx = ollama_num_ctx
+        self.safety_margin = safety_margin
+        self._specs = {spec.name: spec for spec in KNOWN_MODELS}
+        self._encodings = {}
+        self._lock = threading.Lock()
+
+    def register(self, spec: ModelSpec):
+        self._specs[spec.name] = spec
+
+    def get(self, model: Optional[str], provider_type: str = 'openai') -> ModelSpec:
+        """모델 사양 조회 (Ollama 태그 제외, 가장 긴 접두사 일치, 없으면 제공자 기본값)"""
+        name = (model or DEFAULT_OPENAI_MODEL).lower()
+        base = name.split(':', 1)[0].split('/')[-1]
+        matches = [spec for key, spec in self._specs.items() if base == key or base.startswith(key + '-')]
+        if matches:
+            spec = max(matches, key=lambda s: len(s.name))
+        else:
+            context, output, tokenizer = PROVIDER_DEFAULTS.get(provider_type, PROVIDER_DEFAULTS['openai'])
+            spec = ModelSpec(name, provider_type, context, output, tokenizer)
+        if provider_type == 'ollama':
+            context = min(spec.context_window, self.ollama_num_ctx)
+            spec = ModelSpec(spec.name, 'ollama', context, min(spec.max_output_tokens, context // 2), spec.tokenizer)
+        return spec
+
+    def _encoding(self, tokenizer: Optional[str]):
+        if tiktoken is None or not tokenizer:
+            return None
+        with self._lock:
+            if tokenizer not in self._encodings:
+                try:
+                    self._encodings[tokenizer] = tiktoken.get_encoding(tokenizer)
+                except Exception as e:
+                    print(f"토크나이저 로드 실패({tokenizer}): {e}")
+                    self._encodings[tokenizer] = None
+            return self._encodings[tokenizer]
+
+    @staticmethod
+    def estimate_tokens(text: str) -> int:
+        """토크나이저 없이 쓰는 보수적 추정 (한글 1글자 ≈ 1토큰, 그 외 UTF-8 4바이트 ≈ 1토큰)"""
+        text = text or ''
+        hangul = len(_HANGUL_RE.findall(text))
+        other = len(_HANGUL_RE.sub('', text).encode('utf-8'))
+        return hangul + (other + 3) // 4
+
+    def count_tokens(self, text: str, spec: ModelSpec) -> int:
+        encoding = self._encoding(spec.tokenizer)
+        if encoding is not None:
+            return len(encoding.encode(text or '', disallowed_special=()))
+        return self.estimate_tokens(text)
+
+    def trim_to_tokens(self, text: str, max_tokens: int, spec: ModelSpec) -> str:
+        """앞부분을 남기고 max_tokens 이하로 자름"""
+        if max_tokens <= 0:
+            return ''
+        if self.count_tokens(text, spec) <= max_tokens:
+            return text
+        budget = max(0, max_tokens - self.count_tokens(TRIM_MARKER, spec))
+        encoding = self._encoding(spec.tokenizer)
+        if encoding is not None:
+            trimmed = encoding.decode(encoding.encode(text, disallowed_special=())[:budget])
+        else:
+            # 추정치 기준 이진 탐색으로 가장 긴 앞부분 선택
+            low, high = 0, len(text)
+            while low < high:
+                middle = (low + high + 1) // 2
+                if self.estimate_tokens(text[:middle]) <= budget:
+                    low = middle
+                else:
+                    high = middle - 1
+            trimmed = text[:low]
+        return trimmed.rstrip() + TRIM_MARKER
+
+    def plan(self, model: Optional[str], provider_type: str, system: str, user: str,
+             max_output_tokens: Optional[int] = None) -> TokenPlan:
+        """출력 공간을 먼저 확보하고 남는 만큼만 입력을 보냄 - 고정 지침만으로 넘치면 ValueError"""
+        spec = self.get(model, provider_type)
+        wanted = min(max_output_tokens or self.target_output_tokens, spec.max_output_tokens)
+        # 입력을 자르더라도 확보할 최소 출력 공간
+        reserved = min(wanted, spec.context_window // 2)
+
+        system_tokens = self.count_tokens(system, spec) if system else 0
+        user_budget = spec.context_window - reserved - system_tokens - self.safety_margin
+        if user_budget <= 0:
+            raise ValueError(f"프롬프트 고정 지침이 모델 {spec.name}의 컨텍스트({spec.context_window:,} 토큰)를 초과합니다.")
+
+        user_tokens = self.count_tokens(user, spec)
+        trimmed = user_tokens > user_budget
+        if trimmed:
+            user = self.trim_to_tokens(user, user_budget, spec)
+            user_tokens = self.count_tokens(user, spec)
+
+        prompt_tokens = system_tokens + user_tokens
+        max_tokens = min(wanted, spec.context_window - prompt_tokens - self.safety_margin)
+        return TokenPlan(user, max_tokens, prompt_tokens, spec.context_window, trimmed)
+
+    def ollama_options(self, plan: TokenPlan) -> Dict:
+        """Ollama 요청 options (컨텍스트 크기와 최대 생성 토큰)"""
+        return {'num_ctx': plan.context_window, 'num_predict': plan.max_tokens}
+
+model_registry = ModelRegistry(
+    target_output_tokens=int(os.getenv('LLM_TARGET_OUTPUT_TOKENS', '4096')),
+    ollama_num_ctx=int(os.getenv('OLLAMA_NUM_CTX', '8192'))
+)
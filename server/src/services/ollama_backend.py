@@ -0,0 +1,159 @@
+import os
+import threading
+from typing import Dict, Iterator, Optional, Set, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.db import SessionLocal
+from src.models.llm_provider import LLMProvider
+from src.services.llm_client import OLLAMA_KEEP_ALIVE, get_ollama_base_url, parse_ollama_chunk
+from src.services.model_registry import model_registry
+
+class OllamaBackend:
+    """Ollama 호출 계층 - 호스트별 커넥션 풀, keep_alive로 모델 고정, NDJSON 스트림 처리"""
+
+    def __init__(self, keep_alive: str = '30m', pool_size: int = 10, timeout: float = 120):
+        self.keep_alive = keep_alive
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self._sessions: Dict[str, requests.Session] = {}
+        self._warm: Set[Tuple[str, str]] = set()
+        self._warming: Set[Tuple[str, str]] = set()
+        self._lock = threading.Lock()
+
+    def session(self, base_url: Optional[str]) -> requests.Session:
+        """호스트별로 재사용하는 requests 세션"""
+        host = get_ollama_base_url(base_url)
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                self._sessions[host] = session
+            return session
+
+    def stream(self, prompt: str, model: str, base_url: Optional[str],
+               system_prompt: Optional[str] = None, timeout: float = None,
+               stats: Optional[Dict] = None, format=None, options: Optional[Dict] = None) -> Iterator[str]:
+        """NDJSON 응답을 줄 단위로 읽으며 토큰 반환 (끝까지 읽어야 연결이 풀로 반환됨)
+        
+        stats를 넘기면 마지막 줄의 토큰 수(prompt_eval_count, eval_count)를 채워 줌
+        format에는 'json' 또는 JSON 스키마를 넘겨 응답 형식을 제한할 수 있음
+        options에는 num_ctx/num_predict 등 모델 실행 옵션을 넘김
+        """
+        data = {
+            "model": model,
+            "prompt": prompt,
+            "stream": True,
+            "keep_alive": self.keep_alive
+        }
+        if system_prompt:
+            data["system"] = system_prompt
+        if format:
+            data["format"] = format
+        if options:
+            data["options"] = options
+
+        response = self.session(base_url).post(f"{get_ollama_base_url(base_url)}/api/generate",
+                                               json=data, stream=True,
+                                               timeout=timeout or self.timeout)
+        try:
+            if response.status_code != 200:
+                raise Exception(f"Ollama API 오류: {response.status_code} - {response.text}")
+
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                chunk = parse_ollama_chunk(line)
+                if chunk.get('response'):
+                    yield chunk['response']
+                if chunk.get('done') and stats is not None:
+                    stats.update({k: chunk[k] for k in ('prompt_eval_count', 'eval_count') if k in chunk})
+            self._mark_warm(model, base_url)
+        finally:
+            response.close()
+
+    def generate(self, prompt: str, model: str, base_url: Optional[str],
+                 system_prompt: Optional[str] = None, timeout: float = None,
+                 stats: Optional[Dict] = None, format=None, options: Optional[Dict] = None) -> str:
+        """스트림을 끝까지 읽어 전체 응답 반환"""
+        return ''.join(self.stream(prompt, model, base_url, system_prompt, timeout, stats, format, options))
+
+    def warm_up(self, model: str, base_url: Optional[str], timeout: float = 300) -> bool:
+        """빈 프롬프트로 모델을 미리 적재 (실패해도 예외를 올리지 않음)
+
+        생성 요청과 같은 num_ctx로 적재해야 첫 요청에서 모델을 다시 올리지 않음
+        """
+        try:
+            response = self.session(base_url).post(
+                f"{get_ollama_base_url(base_url)}/api/generate",
+                json={"model": model, "keep_alive": self.keep_alive, "stream": False,
+                      "options": {"num_ctx": model_registry.get(model, 'ollama').context_window}},
+                timeout=timeout
+            )
+            if response.status_code != 200:
+                raise Exception(f"{response.status_code} - {response.text}")
+        except Exception as e:
+            print(f"Ollama 모델 '{model}' 예열 실패: {e}")
+            return False
+        self._mark_warm(model, base_url)
+        return True
+
+    def warm_up_in_background(self, model: str, base_url: Optional[str]) -> bool:
+        """요청을 막지 않도록 별도 스레드에서 예열 (이미 진행 중이면 건너뜀)"""
+        key = (get_ollama_base_url(base_url), model)
+        with self._lock:
+            if key in self._warming:
+                return False
+            self._warming.add(key)
+
+        def run():
+            try:
+                self.warm_up(model, base_url)
+            finally:
+                with self._lock:
+                    self._warming.discard(key)
+
+        threading.Thread(target=run, name=f"ollama-warm-up-{model}", daemon=True).start()
+        return True
+
+    def is_warm(self, model: str, base_url: Optional[str]) -> bool:
+        return (get_ollama_base_url(base_url), model) in self._warm
+
+    def _mark_warm(self, model: str, base_url: Optional[str]):
+        with self._lock:
+            self._warm.add((get_ollama_base_url(base_url), model))
+
+    def close(self):
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+            self._warm.clear()
+
+def warm_up_active_providers(session_factory=SessionLocal) -> int:
+    """활성화된 Ollama 제공자의 모델을 백그라운드에서 예열하고 예열 대상 수 반환"""
+    db = session_factory()
+    try:
+        targets = {
+            (p.base_url, p.model_name)
+            for p in db.query(LLMProvider).filter(
+                LLMProvider.provider_type == 'ollama',
+                LLMProvider.is_active == True
+            ).all()
+        }
+    finally:
+        db.close()
+
+    for base_url, model in targets:
+        ollama_backend.warm_up_in_background(model, base_url)
+    return len(targets)
+
+ollama_backend = OllamaBackend(
+    keep_alive=OLLAMA_KEEP_ALIVE,
+    pool_size=int(os.getenv('OLLAMA_POOL_SIZE', '10')),
+    timeout=float(os.getenv('OLLAMA_TIMEOUT', '120'))
+)
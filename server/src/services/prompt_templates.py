@@ -0,0 +1,272 @@
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from jinja2 import Environment, FileSystemLoader, TemplateNotFound, TemplateSyntaxError, StrictUndefined
+from jinja2.sandbox import SandboxedEnvironment
+from sqlalchemy.orm import Session
+
+from src.models.prompt_template import PromptTemplate
+
+PROMPT_TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'prompts')
+DEFAULT_LOCALE = 'ko'
+
+# /api/content/content-templates 로 제공되고 프롬프트의 고정 지침에도 사용되는 메타데이터
+CONTENT_TEMPLATES = {
+    "blog_post": {
+        "name": "블로그 포스트",
+        "description": "일반적인 블로그 글 형태",
+        "structure": ["도입부", "메인 콘텐츠", "결론"],
+        "recommended_length": "800-2000단어"
+    },
+    "product_review": {
+        "name": "제품 리뷰",
+        "description": "제품이나 서비스 리뷰",
+        "structure": ["개요", "기능", "장단점", "결론"],
+        "recommended_length": "600-1500단어"
+    },
+    "how_to_guide": {
+        "name": "하우투 가이드",
+        "description": "단계별 설명 가이드",
+        "structure": ["도입부", "단계별 설명", "팁", "결론"],
+        "recommended_length": "1000-2500단어"
+    },
+    "listicle": {
+        "name": "리스트 형태 글",
+        "description": "목록 형태의 콘텐츠",
+        "structure": ["도입부", "리스트 항목", "결론"],
+        "recommended_length": "800-2000단어"
+    },
+    "news_article": {
+        "name": "뉴스 기사",
+        "description": "뉴스 형태의 글",
+        "structure": ["헤드라인", "리드", "본문", "결론"],
+        "recommended_length": "400-1000단어"
+    }
+}
+
+TONE_OPTIONS = {
+    "professional": {
+        "name": "전문적",
+        "description": "공식적이고 전문적인 어조"
+    },
+    "casual": {
+        "name": "캐주얼",
+        "description": "편안하고 친근한 어조"
+    },
+    "friendly": {
+        "name": "친근한",
+        "description": "따뜻하고 접근하기 쉬운 어조"
+    },
+    "authoritative": {
+        "name": "권위적",
+        "description": "확신에 찬 전문가적 어조"
+    },
+    "conversational": {
+        "name": "대화형",
+        "description": "대화하는 듯한 자연스러운 어조"
+    }
+}
+
+AUDIENCE_OPTIONS = {
+    "general": {"name": "일반 독자", "description": "배경지식이 없어도 이해할 수 있게 설명"},
+    "beginners": {"name": "입문자", "description": "용어를 풀어 쓰고 기초부터 단계적으로 설명"},
+    "experts": {"name": "전문가", "description": "기초 설명은 줄이고 심화 내용과 근거 위주로 설명"},
+    "professionals": {"name": "실무자", "description": "바로 적용할 수 있는 실무 사례와 체크리스트 위주로 설명"}
+}
+
+class RenderedPrompt:
+    """고정 지침(prefix)과 요청별 내용(request)으로 나뉜 프롬프트 (structured: JSON 구조화 응답 요청 여부)"""
+
+    __slots__ = ('prefix', 'request', 'template_id', 'structured')
+
+    def __init__(self, prefix: str, request: str, template_id: str, structured: bool = False):
+        self.prefix = prefix
+        self.request = request
+        self.template_id = template_id
+        self.structured = structured
+
+    @property
+    def text(self) -> str:
+        return f"{self.prefix}\n\n{self.request}" if self.prefix else self.request
+
+class _UserTemplateSnapshot:
+    __slots__ = ('id', 'content_type', 'locale', 'source', 'version')
+
+    def __init__(self, template: PromptTemplate):
+        self.id = template.id
+        self.content_type = template.content_type
+        self.locale = template.locale
+        self.source = template.source
+        # updated_at은 초 단위라 1초 안에 두 번 저장하면 같아지므로 원문 해시를 버전으로 사용
+        self.version = hashlib.sha256((template.source or '').encode('utf-8')).hexdigest()[:16]
+
+class PromptTemplateRegistry:
+    """Jinja2 프롬프트 템플릿 레지스트리 - 템플릿은 한 번만 컴파일하고 고정 지침 렌더링 결과를 캐시"""
+
+    def __init__(self, template_dir: str = PROMPT_TEMPLATE_DIR, default_locale: str = DEFAULT_LOCALE,
+                 prefix_cache_size: int = 512, user_template_ttl: float = 300,
+                 compiled_user_template_size: int = 256):
+        # auto_reload=False: 파일 템플릿은 첫 사용 시 컴파일 후 재사용
+        self.env = Environment(loader=FileSystemLoader(template_dir), auto_reload=False,
+                               undefined=StrictUndefined, cache_size=-1)
+        # 사용자 템플릿은 샌드박스에서 실행
+        self.user_env = SandboxedEnvironment(undefined=StrictUndefined)
+        self.default_locale = default_locale
+        self.prefix_cache_size = prefix_cache_size
+        self.user_template_ttl = user_template_ttl
+        self.compiled_user_template_size = compiled_user_template_size
+        self._compiled: Dict[Tuple, object] = {}
+        # 사용자 템플릿 ID -> (버전, 컴파일 결과) - 템플릿마다 최신 버전 하나만 LRU로 보관
+        self._compiled_user = OrderedDict()
+        self._prefixes = OrderedDict()
+        self._user_templates: Dict[int, tuple] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def static_context(content_type: str, tone: str, target_audience: str) -> Dict:
+        """요청과 무관한 고정 지침용 변수 (콘텐츠 유형/톤/독자 메타데이터)"""
+        return {
+            'content_type': content_type,
+            'template': CONTENT_TEMPLATES.get(content_type, {
+                'name': content_type, 'description': content_type,
+                'structure': ['도입부', '본문', '결론'], 'recommended_length': '1000-1500단어'
+            }),
+            'tone': tone,
+            'tone_option': TONE_OPTIONS.get(tone, {'name': tone, 'description': tone}),
+            'target_audience': target_audience,
+            'audience': AUDIENCE_OPTIONS.get(target_audience, {'name': target_audience, 'description': target_audience})
+        }
+
+    def validate(self, source: str):
+        """사용자 템플릿 검사 - 문법 오류나 request 블록 누락 시 ValueError"""
+        try:
+            template = self.user_env.from_string(source)
+        except TemplateSyntaxError as e:
+            raise ValueError(f"템플릿 문법 오류 (줄 {e.lineno}): {e.message}")
+        if 'request' not in template.blocks:
+            raise ValueError("템플릿에는 {% block request %} 블록이 필요합니다.")
+        static = self.static_context('blog_post', 'professional', 'general')
+        try:
+            # prefix는 요청마다 같아야 캐시되므로 keyword 등 요청별 변수 없이 렌더링되어야 함
+            self._render_block(template, 'prefix', static)
+        except Exception as e:
+            raise ValueError(f"prefix 블록 렌더링 오류 (요청별 변수는 request 블록에서만 사용): {e}")
+        try:
+            self._render_block(template, 'request', {**static, 'keyword': '키워드',
+                                                     'additional_keywords': [], 'custom_instructions': ''})
+        except Exception as e:
+            raise ValueError(f"request 블록 렌더링 오류: {e}")
+
+    def _file_template(self, content_type: str, locale: str):
+        """콘텐츠 유형/로케일별 파일 템플릿 ({locale}/{content_type}.j2 → {locale}/seo_content.j2 → 기본 로케일)"""
+        # 파일 이름은 알려진 유형/로케일 형식만 사용 (입력값으로 캐시가 무한정 커지지 않도록)
+        if content_type not in CONTENT_TEMPLATES:
+            content_type = 'seo_content'
+        if not re.fullmatch(r'[a-z]{2}(_[A-Z]{2})?', locale or ''):
+            locale = self.default_locale
+        key = ('file', content_type, locale)
+        template = self._compiled.get(key)
+        if template is None:
+            candidates = [f"{locale}/{content_type}.j2", f"{locale}/seo_content.j2",
+                          f"{self.default_locale}/{content_type}.j2", f"{self.default_locale}/seo_content.j2"]
+            for name in candidates:
+                try:
+                    template = (name, self.env.get_template(name))
+                    break
+                except TemplateNotFound:
+                    continue
+            else:
+                raise TemplateNotFound(candidates[-1])
+            self._compiled[key] = template
+        return template
+
+    def _user_template(self, snapshot: _UserTemplateSnapshot):
+        with self._lock:
+            entry = self._compiled_user.get(snapshot.id)
+            if entry is not None and entry[0] == snapshot.version:
+                self._compiled_user.move_to_end(snapshot.id)
+                return entry[1]
+        template = (f"user:{snapshot.id}", self.user_env.from_string(snapshot.source))
+        with self._lock:
+            # 새 버전은 같은 템플릿의 이전 버전을 대체
+            self._compiled_user[snapshot.id] = (snapshot.version, template)
+            self._compiled_user.move_to_end(snapshot.id)
+            while len(self._compiled_user) > self.compiled_user_template_size:
+                self._compiled_user.popitem(last=False)
+        return template
+
+    @staticmethod
+    def _render_block(template, name: str, context: Dict) -> str:
+        if name not in template.blocks:
+            return ''
+        return ''.join(template.blocks[name](template.new_context(context))).strip()
+
+    def get_user_templates(self, db: Session, user_id: int) -> List[_UserTemplateSnapshot]:
+        """사용자의 활성 템플릿 목록 (TTL 캐시, 변경 시 invalidate)"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._user_templates.get(user_id)
+            if entry is not None and entry[1] > now:
+                return entry[0]
+        templates = [
+            _UserTemplateSnapshot(t)
+            for t in db.query(PromptTemplate).filter(
+                PromptTemplate.user_id == user_id,
+                PromptTemplate.is_active == True
+            ).order_by(PromptTemplate.id.desc()).all()
+        ]
+        with self._lock:
+            self._user_templates[user_id] = (templates, now + self.user_template_ttl)
+        return templates
+
+    def invalidate_user(self, user_id: int):
+        with self._lock:
+            self._user_templates.pop(user_id, None)
+
+    def render(self, keyword: str, content_type: str = 'blog_post', tone: str = 'professional',
+               target_audience: str = 'general', additional_keywords: List[str] = None,
+               custom_instructions: str = "", locale: Optional[str] = None,
+               db: Session = None, user_id: Optional[int] = None) -> RenderedPrompt:
+        """프롬프트 렌더링 - 사용자 템플릿이 있으면 우선, 고정 지침은 (템플릿, 유형, 톤, 독자)별로 캐시"""
+        locale = locale or self.default_locale
+        user_snapshot = None
+        if db is not None and user_id:
+            user_snapshot = next(
+                (t for t in self.get_user_templates(db, user_id)
+                 if t.content_type == content_type and t.locale == locale),
+                None
+            )
+        template_id, template = (self._user_template(user_snapshot) if user_snapshot
+                                 else self._file_template(content_type, locale))
+        version = user_snapshot.version if user_snapshot else ''
+        static = self.static_context(content_type, tone, target_audience)
+
+        prefix_key = (template_id, version, content_type, tone, target_audience)
+        with self._lock:
+            prefix = self._prefixes.get(prefix_key)
+            if prefix is not None:
+                self._prefixes.move_to_end(prefix_key)
+        if prefix is None:
+            prefix = self._render_block(template, 'prefix', static)
+            with self._lock:
+                self._prefixes[prefix_key] = prefix
+                while len(self._prefixes) > self.prefix_cache_size:
+                    self._prefixes.popitem(last=False)
+
+        request = self._render_block(template, 'request', {
+            **static,
+            'keyword': keyword,
+            'additional_keywords': additional_keywords or [],
+            'custom_instructions': custom_instructions or ''
+        })
+        return RenderedPrompt(prefix, request, template_id)
+
+prompt_registry = PromptTemplateRegistry(
+    template_dir=os.getenv('PROMPT_TEMPLATE_DIR', PROMPT_TEMPLATE_DIR),
+    default_locale=os.getenv('PROMPT_DEFAULT_LOCALE', DEFAULT_LOCALE)
+)
@@ -0,0 +1,82 @@
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+from sqlalchemy.orm import Session
+
+from src.models.llm_provider import LLMProvider
+
+class ProviderConfig:
+    """세션과 무관하게 공유할 수 있는 LLM 제공자 설정 스냅샷"""
+
+    __slots__ = ('id', 'name', 'provider_type', 'model_name', 'api_key', 'base_url', 'is_active',
+                 'use_for_routing')
+
+    def __init__(self, id: int, name: str, provider_type: str, model_name: str,
+                 api_key: Optional[str] = None, base_url: Optional[str] = None,
+                 is_active: bool = False, use_for_routing: bool = False):
+        self.id = id
+        self.name = name
+        self.provider_type = provider_type
+        self.model_name = model_name
+        self.api_key = api_key
+        self.base_url = base_url
+        self.is_active = is_active
+        self.use_for_routing = use_for_routing
+
+    @classmethod
+    def from_model(cls, provider: LLMProvider) -> 'ProviderConfig':
+        return cls(
+            id=provider.id,
+            name=provider.name,
+            provider_type=provider.provider_type,
+            model_name=provider.model_name,
+            api_key=provider.api_key,
+            base_url=provider.base_url,
+            is_active=bool(provider.is_active),
+            use_for_routing=bool(provider.use_for_routing)
+        )
+
+class ProviderCache:
+    """사용자별 LLM 제공자 목록 캐시 - 제공자 변경 시 무효화, TTL로 다른 워커와의 불일치 제한"""
+
+    def __init__(self, ttl: float = 300):
+        self.ttl = ttl
+        self._entries: Dict[int, tuple] = {}
+        self._versions: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def get_providers(self, db: Session, user_id: int) -> List[ProviderConfig]:
+        """사용자의 제공자 목록 (캐시 적중 시 DB 조회 없음)"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[1] > now:
+                return entry[0]
+            version = self._versions.get(user_id, 0)
+
+        providers = [
+            ProviderConfig.from_model(p)
+            for p in db.query(LLMProvider).filter(LLMProvider.user_id == user_id).order_by(LLMProvider.id).all()
+        ]
+        with self._lock:
+            # 조회 중에 무효화되었으면 오래된 결과를 저장하지 않음
+            if self._versions.get(user_id, 0) == version:
+                self._entries[user_id] = (providers, now + self.ttl)
+        return providers
+
+    def get_active(self, db: Session, user_id: int) -> Optional[ProviderConfig]:
+        """사용자의 활성화된 제공자"""
+        return next((p for p in self.get_providers(db, user_id) if p.is_active), None)
+
+    def invalidate(self, user_id: int):
+        """사용자의 제공자가 생성/수정/삭제/활성화되었을 때 호출"""
+        with self._lock:
+            self._entries.pop(user_id, None)
+            self._versions[user_id] = self._versions.get(user_id, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+provider_cache = ProviderCache(ttl=float(os.getenv('LLM_PROVIDER_CACHE_TTL', '300')))
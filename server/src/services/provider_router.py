@@ -0,0 +1,161 @@
+import hashlib
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.services.bulk_executor import ProviderSlots, SlotAbandoned, provider_slots
+from src.services.provider_cache import ProviderConfig
+
+class CircuitBreaker:
+    """연속 실패 시 일정 시간 호출을 차단하는 회로 차단기"""
+
+    def __init__(self, failure_threshold: int = 3, cooldown: float = 30):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return 'closed'
+        if time.monotonic() - self.opened_at >= self.cooldown:
+            return 'half_open'
+        return 'open'
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == 'closed':
+            return True
+        # half-open 상태에서는 한 번의 시험 호출만 허용
+        return state == 'half_open' and not self.trial_in_flight
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        self.trial_in_flight = False
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+class _BackendState:
+    __slots__ = ('outstanding', 'breaker')
+
+    def __init__(self, breaker: CircuitBreaker):
+        self.outstanding = 0
+        self.breaker = breaker
+
+class ProviderRouter:
+    """활성 LLM 제공자 우선, 포화/장애 시 라우팅 허용 제공자로 가중 최소 진행 요청 분산 및 장애 조치"""
+
+    def __init__(self, weights: Dict[str, int], failure_threshold: int = 3, cooldown: float = 30,
+                 slots: Optional[ProviderSlots] = None):
+        self.weights = weights
+        # 일괄 작업 스레드에서는 실제로 고른 제공자의 동시 실행 슬롯을 잡고 호출
+        self.slots = slots
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._backends: Dict[Tuple, _BackendState] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def backend_key(provider: ProviderConfig) -> Tuple:
+        """호스트/API 키 단위 백엔드 식별자 (원본 키는 보관하지 않음)"""
+        key_hash = hashlib.sha256((provider.api_key or '').encode()).hexdigest()[:16]
+        return (provider.provider_type, (provider.base_url or '').rstrip('/'), key_hash)
+
+    def _state(self, provider: ProviderConfig) -> _BackendState:
+        key = self.backend_key(provider)
+        if key not in self._backends:
+            self._backends[key] = _BackendState(CircuitBreaker(self.failure_threshold, self.cooldown))
+        return self._backends[key]
+
+    def order(self, providers: List[ProviderConfig]) -> List[ProviderConfig]:
+        """호출 가능한 제공자 순서 - 활성 제공자가 기본, 가중치만큼 요청이 몰리면 나머지는 (진행 중 요청 / 가중치) 오름차순"""
+        with self._lock:
+            candidates = []
+            for position, provider in enumerate(providers):
+                state = self._state(provider)
+                if not state.breaker.allow():
+                    continue
+                weight = self.weights.get(provider.provider_type, 1)
+                primary = provider.is_active and state.outstanding < weight
+                candidates.append((not primary, (state.outstanding + 1) / weight, position, provider))
+        return [c[-1] for c in sorted(candidates, key=lambda c: c[:3])]
+
+    @contextmanager
+    def track(self, provider: ProviderConfig):
+        """진행 중 요청 수와 회로 차단기 상태를 갱신하며 호출"""
+        with self._lock:
+            state = self._state(provider)
+            # 슬롯을 기다리는 호출도 진행 중으로 세어 다른 요청이 같은 제공자로 몰리지 않게 함
+            state.outstanding += 1
+            if state.breaker.state == 'half_open':
+                state.breaker.trial_in_flight = True
+        try:
+            with self._slot(provider):
+                yield
+        except SlotAbandoned:
+            with self._lock:
+                state.breaker.trial_in_flight = False
+            raise
+        except Exception:
+            with self._lock:
+                state.breaker.record_failure()
+            raise
+        else:
+            with self._lock:
+                state.breaker.record_success()
+        finally:
+            with self._lock:
+                state.outstanding -= 1
+
+    def _slot(self, provider: ProviderConfig):
+        if self.slots is None:
+            return nullcontext()
+        return self.slots.hold(provider.provider_type, provider.base_url)
+
+    def call(self, providers: List[ProviderConfig],
+             fn: Callable[[ProviderConfig], str]) -> Tuple[str, ProviderConfig]:
+        """활성 제공자(포화 시 가장 여유 있는 제공자)부터 호출하고, 실패하면 다음 정상 제공자로 재시도"""
+        errors = []
+        for provider in self.order(providers):
+            try:
+                with self.track(provider):
+                    return fn(provider), provider
+            except Exception as e:
+                print(f"LLM 제공자 '{provider.name}' 호출 실패: {e}")
+                errors.append(f"{provider.name}: {e}")
+
+        if not errors:
+            raise Exception("사용 가능한 LLM 제공자가 없습니다. (모든 제공자의 회로가 열려 있음)")
+        raise Exception(f"모든 LLM 제공자 호출 실패 - {'; '.join(errors)}")
+
+    def status(self, providers: List[ProviderConfig]) -> List[Dict]:
+        """제공자별 진행 중 요청 수와 회로 상태"""
+        with self._lock:
+            return [
+                {
+                    'id': provider.id,
+                    'name': provider.name,
+                    'provider_type': provider.provider_type,
+                    'outstanding': self._state(provider).outstanding,
+                    'circuit': self._state(provider).breaker.state,
+                    'weight': self.weights.get(provider.provider_type, 1),
+                    'slots': self.slots.usage(provider.provider_type, provider.base_url) if self.slots else None
+                }
+                for provider in providers
+            ]
+
+provider_router = ProviderRouter(
+    weights=provider_slots.limits,
+    failure_threshold=int(os.getenv('LLM_CIRCUIT_FAILURE_THRESHOLD', '3')),
+    cooldown=float(os.getenv('LLM_CIRCUIT_COOLDOWN', '30')),
+    slots=provider_slots
+)
@@ -0,0 +1,185 @@
+import asyncio
+import hashlib
+import os
+import random
+import re
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional
+
+from openai import APIConnectionError, APITimeoutError, InternalServerError, RateLimitError
+
+# 재시도할 일시적 오류 (429, 5xx, 연결/시간 초과)
+RETRYABLE_ERRORS = (RateLimitError, InternalServerError, APIConnectionError, APITimeoutError)
+
+def estimate_tokens(text: str) -> int:
+    """로컬 토큰 수 추정 (UTF-8 4바이트당 약 1토큰)"""
+    return max(1, len((text or '').encode('utf-8')) // 4)
+
+def parse_reset_duration(value: Optional[str]) -> Optional[float]:
+    """x-ratelimit-reset-* 헤더("1s", "6m0s", "20ms")를 초 단위로 변환"""
+    if not value:
+        return None
+    total = 0.0
+    matched = False
+    for amount, unit in re.findall(r'([\d.]+)(ms|h|m|s)', value):
+        matched = True
+        total += float(amount) * {'ms': 0.001, 's': 1, 'm': 60, 'h': 3600}[unit]
+    if matched:
+        return total
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+class TokenBucket:
+    """초당 일정량이 다시 채워지는 토큰 버킷 (예약 후 부족분만큼 대기)"""
+
+    def __init__(self, capacity: float, per_minute: float):
+        self.capacity = capacity
+        self.rate = per_minute / 60.0
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, amount: float, now: float) -> float:
+        """amount만큼 예약하고 사용 가능해질 때까지 기다려야 할 시간 반환"""
+        self._refill(now)
+        self.tokens -= min(amount, self.capacity)
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def sync(self, limit: Optional[float], remaining: Optional[float], reset: Optional[float], now: float):
+        """서버가 알려준 한도/잔여량으로 버킷 보정"""
+        self._refill(now)
+        if limit:
+            self.capacity = limit
+            self.rate = limit / 60.0
+        if remaining is not None:
+            self.tokens = min(self.tokens, remaining)
+            if remaining <= 0 and reset:
+                self.tokens = min(self.tokens, -reset * self.rate)
+
+class _KeyLimits:
+    __slots__ = ('requests', 'tokens', 'blocked_until')
+
+    def __init__(self, rpm: float, tpm: float):
+        self.requests = TokenBucket(rpm, rpm)
+        self.tokens = TokenBucket(tpm, tpm)
+        self.blocked_until = 0.0
+
+class OpenAIRateLimiter:
+    """API 키별 요청/토큰 버킷과 429 대응 재시도"""
+
+    def __init__(self, rpm: float = 500, tpm: float = 200000, max_retries: int = 5,
+                 base_delay: float = 1.0, max_delay: float = 60.0):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._limits: Dict[str, _KeyLimits] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(api_key: Optional[str]) -> str:
+        return hashlib.sha256((api_key or '').encode()).hexdigest()
+
+    def _get_limits(self, api_key: Optional[str]) -> _KeyLimits:
+        key = self._key(api_key)
+        if key not in self._limits:
+            self._limits[key] = _KeyLimits(self.rpm, self.tpm)
+        return self._limits[key]
+
+    def reserve(self, api_key: Optional[str], estimated_tokens: int) -> float:
+        """요청 1건과 예상 토큰을 예약하고 대기 시간(초) 반환"""
+        now = time.monotonic()
+        with self._lock:
+            limits = self._get_limits(api_key)
+            wait = max(
+                limits.requests.reserve(1, now),
+                limits.tokens.reserve(estimated_tokens, now),
+                limits.blocked_until - now
+            )
+        return max(0.0, wait)
+
+    def update_from_headers(self, api_key: Optional[str], headers: Mapping[str, str]):
+        """x-ratelimit-* 응답 헤더로 버킷 상태 동기화"""
+        def number(name):
+            try:
+                return float(headers.get(name)) if headers.get(name) is not None else None
+            except ValueError:
+                return None
+
+        now = time.monotonic()
+        with self._lock:
+            limits = self._get_limits(api_key)
+            limits.requests.sync(number('x-ratelimit-limit-requests'),
+                                 number('x-ratelimit-remaining-requests'),
+                                 parse_reset_duration(headers.get('x-ratelimit-reset-requests')), now)
+            limits.tokens.sync(number('x-ratelimit-limit-tokens'),
+                               number('x-ratelimit-remaining-tokens'),
+                               parse_reset_duration(headers.get('x-ratelimit-reset-tokens')), now)
+
+    def backoff_delay(self, attempt: int, error: Exception = None) -> float:
+        """Retry-After 헤더를 우선하고, 없으면 지터가 섞인 지수 백오프"""
+        response = getattr(error, 'response', None)
+        headers = getattr(response, 'headers', None) or {}
+        retry_after = None
+        if headers.get('retry-after-ms'):
+            retry_after = parse_reset_duration(f"{headers['retry-after-ms']}ms")
+        elif headers.get('retry-after'):
+            retry_after = parse_reset_duration(headers['retry-after'])
+        if retry_after is not None:
+            return min(self.max_delay, retry_after)
+        delay = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return random.uniform(delay / 2, delay)
+
+    def _block(self, api_key: Optional[str], seconds: float):
+        with self._lock:
+            limits = self._get_limits(api_key)
+            limits.blocked_until = max(limits.blocked_until, time.monotonic() + seconds)
+
+    def call(self, api_key: Optional[str], estimated_tokens: int, fn: Callable[[], Any]) -> Any:
+        """버킷 대기 후 fn 호출, 일시적 오류는 백오프 후 재시도 (동기)"""
+        for attempt in range(self.max_retries + 1):
+            wait = self.reserve(api_key, estimated_tokens)
+            if wait:
+                time.sleep(wait)
+            try:
+                return fn()
+            except RETRYABLE_ERRORS as e:
+                if attempt >= self.max_retries:
+                    raise
+                delay = self.backoff_delay(attempt, e)
+                if isinstance(e, RateLimitError):
+                    # 같은 키를 쓰는 다른 요청도 함께 대기
+                    self._block(api_key, delay)
+                else:
+                    time.sleep(delay)
+
+    async def call_async(self, api_key: Optional[str], estimated_tokens: int,
+                         fn: Callable[[], Awaitable[Any]]) -> Any:
+        """버킷 대기 후 fn 호출, 일시적 오류는 백오프 후 재시도 (비동기)"""
+        for attempt in range(self.max_retries + 1):
+            wait = self.reserve(api_key, estimated_tokens)
+            if wait:
+                await asyncio.sleep(wait)
+            try:
+                return await fn()
+            except RETRYABLE_ERRORS as e:
+                if attempt >= self.max_retries:
+                    raise
+                delay = self.backoff_delay(attempt, e)
+                if isinstance(e, RateLimitError):
+                    self._block(api_key, delay)
+                else:
+                    await asyncio.sleep(delay)
+
+openai_rate_limiter = OpenAIRateLimiter(
+    rpm=float(os.getenv('OPENAI_RPM_LIMIT', '500')),
+    tpm=float(os.getenv('OPENAI_TPM_LIMIT', '200000')),
+    max_retries=int(os.getenv('OPENAI_MAX_RETRIES', '5'))
+)
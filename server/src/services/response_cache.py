@@ -0,0 +1,199 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+from src.db import SessionLocal
+from src.models.llm_cache import LLMResponseCacheEntry
+
+CACHE_MODES = ('bypass', 'prefer', 'only')
+
+class MemoryCacheTier:
+    """프로세스 메모리 LRU 캐시 (TTL 포함)"""
+
+    name = 'memory'
+
+    def __init__(self, max_entries: int = 256, ttl: float = 3600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str, **metadata):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+class SQLCacheTier:
+    """데이터베이스 기반 영구 캐시 (기본: SQLite)"""
+
+    name = 'sqlite'
+
+    def __init__(self, session_factory=SessionLocal, ttl: float = 7 * 24 * 3600):
+        self.session_factory = session_factory
+        self.ttl = ttl
+
+    def get(self, key: str) -> Optional[str]:
+        db = self.session_factory()
+        try:
+            entry = db.get(LLMResponseCacheEntry, key)
+            if entry is None:
+                return None
+            if entry.expires_at <= datetime.utcnow():
+                db.delete(entry)
+                db.commit()
+                return None
+            return entry.response
+        finally:
+            db.close()
+
+    def set(self, key: str, value: str, provider_type: str = '', model_name: str = ''):
+        db = self.session_factory()
+        try:
+            db.merge(LLMResponseCacheEntry(
+                cache_key=key,
+                provider_type=provider_type,
+                model_name=model_name,
+                response=value,
+                created_at=datetime.utcnow(),
+                expires_at=datetime.utcnow() + timedelta(seconds=self.ttl)
+            ))
+            db.commit()
+        finally:
+            db.close()
+
+    def clear(self):
+        db = self.session_factory()
+        try:
+            db.query(LLMResponseCacheEntry).delete()
+            db.commit()
+        finally:
+            db.close()
+
+class RedisCacheTier:
+    """Redis 기반 영구 캐시 (여러 워커/노드가 공유)"""
+
+    name = 'redis'
+
+    def __init__(self, url: str, ttl: float = 7 * 24 * 3600, prefix: str = 'llm-cache:'):
+        import redis
+        self.client = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.client.get(self.prefix + key)
+        return value.decode() if value is not None else None
+
+    def set(self, key: str, value: str, **metadata):
+        self.client.setex(self.prefix + key, int(self.ttl), value)
+
+    def clear(self):
+        for key in self.client.scan_iter(f"{self.prefix}*"):
+            self.client.delete(key)
+
+class LLMResponseCache:
+    """프롬프트 내용 기반 LLM 응답 캐시 (메모리 LRU + 영구 저장소)"""
+
+    def __init__(self, memory_tier: MemoryCacheTier, persistent_tier=None):
+        self.memory_tier = memory_tier
+        self.persistent_tier = persistent_tier
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(prompt: str, provider_type: str, model_name: str) -> str:
+        """렌더링된 프롬프트와 제공자/모델로 캐시 키 생성"""
+        digest = hashlib.sha256()
+        for part in (provider_type or '', model_name or '', prompt):
+            digest.update(part.encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Tuple[Optional[str], Optional[str]]:
+        """(응답, 적중 계층) 반환 - 영구 계층 적중 시 메모리 계층으로 승격"""
+        value = self.memory_tier.get(key)
+        tier = self.memory_tier.name if value is not None else None
+
+        if value is None and self.persistent_tier is not None:
+            try:
+                value = self.persistent_tier.get(key)
+            except Exception as e:
+                print(f"응답 캐시 조회 오류: {e}")
+                value = None
+            if value is not None:
+                tier = self.persistent_tier.name
+                self.memory_tier.set(key, value)
+
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value, tier
+
+    def set(self, key: str, value: str, provider_type: str = '', model_name: str = ''):
+        self.memory_tier.set(key, value)
+        if self.persistent_tier is not None:
+            try:
+                self.persistent_tier.set(key, value, provider_type=provider_type, model_name=model_name)
+            except Exception as e:
+                print(f"응답 캐시 저장 오류: {e}")
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return round(self.hits / total, 4) if total else 0.0
+
+    def metadata(self, mode: str, status: str, tier: Optional[str] = None) -> Dict:
+        """응답 메타데이터에 포함할 캐시 정보"""
+        return {
+            'mode': mode,
+            'status': status,
+            'tier': tier,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hit_rate
+        }
+
+    def clear(self):
+        self.memory_tier.clear()
+        if self.persistent_tier is not None:
+            self.persistent_tier.clear()
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+def _create_response_cache() -> LLMResponseCache:
+    ttl = float(os.getenv('LLM_CACHE_TTL', str(7 * 24 * 3600)))
+    memory_tier = MemoryCacheTier(
+        max_entries=int(os.getenv('LLM_CACHE_MEMORY_ENTRIES', '256')),
+        ttl=min(ttl, 3600)
+    )
+    redis_url = os.getenv('LLM_CACHE_REDIS_URL')
+    persistent_tier = RedisCacheTier(redis_url, ttl=ttl) if redis_url else SQLCacheTier(ttl=ttl)
+    return LLMResponseCache(memory_tier, persistent_tier)
+
+response_cache = _create_response_cache()
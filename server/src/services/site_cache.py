@@ -0,0 +1,123 @@
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+from sqlalchemy.orm import Session
+
+from src.models.wordpress_site import WordPressSite
+from src.utils.crypto_utils import decrypt_secret
+
+class SiteConfig:
+    """세션과 무관하게 공유할 수 있는 WordPress 사이트 스냅샷 (복호화된 비밀번호 포함)"""
+
+    __slots__ = ('id', 'user_id', 'name', 'url', 'username', 'password', 'is_active', 'status',
+                 'user_info', 'last_tested', 'created_at', 'updated_at')
+
+    def __init__(self, id: int, user_id: int, name: str, url: str, username: str, password: Optional[str],
+                 is_active: bool = True, status: str = 'connected', user_info: Optional[Dict] = None,
+                 last_tested: Optional[str] = None, created_at: Optional[str] = None,
+                 updated_at: Optional[str] = None):
+        self.id = id
+        self.user_id = user_id
+        self.name = name
+        self.url = url
+        self.username = username
+        self.password = password
+        self.is_active = is_active
+        self.status = status
+        self.user_info = user_info or {}
+        self.last_tested = last_tested
+        self.created_at = created_at
+        self.updated_at = updated_at
+
+    @classmethod
+    def from_model(cls, site: WordPressSite) -> 'SiteConfig':
+        try:
+            password = decrypt_secret(site.password_encrypted)
+        except ValueError as e:
+            # 암호화 키가 바뀐 경우 - 목록은 보여주고 게시할 때 다시 저장하도록 안내
+            print(f"WordPress 사이트 {site.id} 자격 증명 복호화 실패: {e}")
+            password = None
+        return cls(
+            id=site.id,
+            user_id=site.user_id,
+            name=site.name,
+            url=site.url,
+            username=site.username,
+            password=password,
+            is_active=bool(site.is_active),
+            status=site.status or 'connected',
+            user_info=json.loads(site.user_info) if site.user_info else {},
+            last_tested=site.last_tested.isoformat() if site.last_tested else None,
+            created_at=site.created_at.isoformat() if site.created_at else None,
+            updated_at=site.updated_at.isoformat() if site.updated_at else None
+        )
+
+    def to_dict(self) -> Dict:
+        """API 응답용 (비밀번호 제외)"""
+        return {
+            'id': self.id,
+            'user_id': self.user_id,
+            'name': self.name,
+            'url': self.url,
+            'username': self.username,
+            'is_active': self.is_active,
+            'status': self.status,
+            'user_info': self.user_info,
+            'last_tested': self.last_tested,
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
+        }
+
+class SiteCache:
+    """사용자별 WordPress 사이트 읽기 캐시
+
+    읽을 때마다 사이트 id/version만 DB에서 확인하므로 다른 워커의 수정/삭제도 다음 조회에 바로 반영되고,
+    캐시는 전체 행 조회와 비밀번호 복호화만 생략함. 사이트를 바꾸는 코드는 version을 올려야 함
+    """
+
+    def __init__(self, ttl: float = 300):
+        self.ttl = ttl
+        self._entries: Dict[int, tuple] = {}
+        self._versions: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def _load(self, db: Session, user_id: int) -> Dict[int, SiteConfig]:
+        now = time.monotonic()
+        site_versions = dict(
+            db.query(WordPressSite.id, WordPressSite.version).filter(WordPressSite.user_id == user_id).all()
+        )
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[1] > now and entry[2] == site_versions:
+                return entry[0]
+            version = self._versions.get(user_id, 0)
+
+        rows = db.query(WordPressSite).filter(WordPressSite.user_id == user_id).order_by(WordPressSite.id).all()
+        sites = {site.id: SiteConfig.from_model(site) for site in rows}
+        with self._lock:
+            # 조회 중에 무효화되었으면 오래된 결과를 저장하지 않음
+            if self._versions.get(user_id, 0) == version:
+                self._entries[user_id] = (sites, now + self.ttl, {site.id: site.version for site in rows})
+        return sites
+
+    def get_sites(self, db: Session, user_id: int) -> List[SiteConfig]:
+        """사용자의 사이트 목록 (id 순, 캐시 적중 시 버전 확인 쿼리 하나만 실행)"""
+        return list(self._load(db, user_id).values())
+
+    def get_site(self, db: Session, user_id: int, site_id: int) -> Optional[SiteConfig]:
+        """사이트 단건 조회 (사용자 소유가 아니면 None)"""
+        return self._load(db, user_id).get(site_id)
+
+    def invalidate(self, user_id: int):
+        """사용자의 사이트가 생성/수정/삭제/활성화되었을 때 호출"""
+        with self._lock:
+            self._entries.pop(user_id, None)
+            self._versions[user_id] = self._versions.get(user_id, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+site_cache = SiteCache(ttl=float(os.getenv('WORDPRESS_SITE_CACHE_TTL', '300')))
@@ -0,0 +1,93 @@
+import json
+import re
+from typing import Dict, List
+
+# Ollama format(JSON 스키마)와 검증에 쓰는 글 구조
+ARTICLE_SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'title': {'type': 'string'},
+        'meta_description': {'type': 'string'},
+        'sections': {
+            'type': 'array',
+            'items': {
+                'type': 'object',
+                'properties': {'heading': {'type': 'string'}, 'content': {'type': 'string'}},
+                'required': ['heading', 'content']
+            }
+        },
+        'tags': {'type': 'array', 'items': {'type': 'string'}}
+    },
+    'required': ['title', 'meta_description', 'sections', 'tags']
+}
+
+STRUCTURED_OUTPUT_INSTRUCTION = """[응답 형식]
+위 작성 형식 대신 아래 구조의 JSON 객체 하나로만 응답합니다.
+{"title": "메인 키워드를 포함한 제목", "meta_description": "검색 결과에 표시할 160자 이내 요약", "sections": [{"heading": "H2 소제목 (도입부는 빈 문자열)", "content": "마크다운 본문 (H3 소제목 허용)"}], "tags": ["태그"]}"""
+
+MAX_META_DESCRIPTION = 160
+MAX_TAGS = 10
+
+def extract_json_object(text: str) -> Dict:
+    """응답에서 JSON 객체 추출 (코드 블록/앞뒤 설명 허용)"""
+    text = (text or '').strip()
+    fenced = re.search(r'```(?:json)?\s*(.*?)```', text, re.DOTALL)
+    if fenced:
+        text = fenced.group(1)
+    start, end = text.find('{'), text.rfind('}')
+    if start == -1 or end <= start:
+        raise ValueError("JSON 응답을 찾을 수 없습니다.")
+    data = json.loads(text[start:end + 1])
+    if not isinstance(data, dict):
+        raise ValueError("JSON 객체 형식이 아닙니다.")
+    return data
+
+def _text(value, field: str) -> str:
+    if not isinstance(value, str):
+        raise ValueError(f"{field}는 문자열이어야 합니다.")
+    return value.strip()
+
+def parse_article(text: str) -> Dict:
+    """구조화된 글 응답을 한 번에 읽고 검증 (title, meta_description, sections, tags) - 형식이 맞지 않으면 ValueError"""
+    data = extract_json_object(text)
+
+    title = _text(data.get('title'), 'title').lstrip('#').strip()
+    if not title:
+        raise ValueError("title이 비어 있습니다.")
+
+    raw_sections = data.get('sections')
+    if not isinstance(raw_sections, list) or not raw_sections:
+        raise ValueError("sections는 비어 있지 않은 배열이어야 합니다.")
+    sections: List[Dict] = []
+    for position, section in enumerate(raw_sections):
+        if not isinstance(section, dict):
+            raise ValueError(f"sections[{position}]는 객체여야 합니다.")
+        heading = _text(section.get('heading', ''), f"sections[{position}].heading").lstrip('#').strip()
+        content = _text(section.get('content'), f"sections[{position}].content")
+        if content:
+            sections.append({'heading': heading, 'content': content})
+    if not sections:
+        raise ValueError("본문이 있는 섹션이 없습니다.")
+
+    tags = data.get('tags') or []
+    if not isinstance(tags, list):
+        raise ValueError("tags는 배열이어야 합니다.")
+    tags = [t.strip().lstrip('#') for t in tags if isinstance(t, str) and t.strip()]
+
+    meta_description = _text(data.get('meta_description') or '', 'meta_description')
+    if len(meta_description) > MAX_META_DESCRIPTION:
+        meta_description = meta_description[:MAX_META_DESCRIPTION - 3] + '...'
+
+    return {
+        'title': title,
+        'meta_description': meta_description,
+        'sections': sections,
+        'tags': list(dict.fromkeys(tags))[:MAX_TAGS]
+    }
+
+def article_markdown(article: Dict) -> str:
+    """섹션을 H2 소제목 마크다운 본문으로 결합"""
+    parts = []
+    for section in article['sections']:
+        parts.append(f"## {section['heading']}\n\n{section['content']}" if section['heading'] else section['content'])
+    return '\n\n'.join(parts)
@@ -0,0 +1,23 @@
+import os
+from celery import Celery
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+
+# Redis가 없으면 SQLite 브로커로 동작 (로컬 개발/테스트용)
+BROKER_URL = os.environ.get(
+    "CELERY_BROKER_URL",
+    f"sqla+sqlite:///{os.path.join(BASE_DIR, 'database', 'celery-broker.db')}"
+)
+
+celery_app = Celery("wordpress_auto_poster", broker=BROKER_URL)
+
+celery_app.conf.update(
+    imports=("src.services.bulk_jobs", "src.services.bulk_publish"),
+    task_ignore_result=True,
+    # 워커가 작업 도중 종료되어도 작업이 유실되지 않도록 완료 후 ack
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
+    worker_prefetch_multiplier=1,
+    task_always_eager=os.environ.get("CELERY_TASK_ALWAYS_EAGER", "").lower() in ("1", "true", "yes"),
+    broker_connection_retry_on_startup=True,
+)
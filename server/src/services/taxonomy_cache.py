@@ -0,0 +1,197 @@
+import html
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, List, Optional
+from urllib.parse import urljoin
+
+import requests
+
+from src.services.wordpress_sessions import SiteSlots, site_slots
+
+TAXONOMIES = ('categories', 'tags')
+
+def normalize_term(name: str) -> str:
+    """용어 이름 비교용 정규화 (WordPress가 돌려주는 HTML 엔티티 해제, 대소문자 무시)"""
+    return html.unescape(name or '').strip().lower()
+
+class _TermIndex:
+    __slots__ = ('terms', 'etag', 'expires', 'lock')
+
+    def __init__(self):
+        self.terms: Dict[str, int] = {}
+        self.etag: Optional[str] = None
+        self.expires = 0.0
+        self.lock = threading.Lock()
+
+class TaxonomyCache:
+    """사이트별 카테고리/태그 캐시 - 전체 용어를 한 번에 읽고 이름으로 조회, 없는 용어만 생성"""
+
+    def __init__(self, ttl: float = 600, per_page: int = 100, timeout: float = 10,
+                 resolve_timeout: float = 15, slots: SiteSlots = site_slots):
+        self.ttl = ttl
+        self.per_page = per_page
+        self.timeout = timeout
+        # 게시 한 건에서 없는 용어 생성을 기다리는 최대 시간
+        self.resolve_timeout = resolve_timeout
+        # 사이트별 동시 요청 수 제한 (게시/목록 조회와 공유)
+        self.slots = slots
+        self._indexes: Dict[tuple, _TermIndex] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def api_url(site_url: str, taxonomy: str) -> str:
+        return urljoin(site_url.rstrip('/') + '/', f'wp-json/wp/v2/{taxonomy}')
+
+    def _index(self, site_url: str, taxonomy: str) -> _TermIndex:
+        if taxonomy not in TAXONOMIES:
+            raise ValueError(f"지원하지 않는 분류입니다: {taxonomy}")
+        key = (site_url.rstrip('/'), taxonomy)
+        with self._lock:
+            index = self._indexes.get(key)
+            if index is None:
+                index = self._indexes[key] = _TermIndex()
+            return index
+
+    def _fetch_page(self, session: requests.Session, site_url: str, taxonomy: str, page: int,
+                    etag: Optional[str] = None) -> requests.Response:
+        api_url = self.api_url(site_url, taxonomy)
+        headers = {'If-None-Match': etag} if etag else None
+        with self.slots.semaphore(site_url):
+            response = session.get(api_url, params={'per_page': self.per_page, 'page': page, '_fields': 'id,name'},
+                                   headers=headers, timeout=self.timeout)
+        if response.status_code not in (200, 304):
+            raise ValueError(f"{api_url} 용어 목록 조회 실패: HTTP {response.status_code}")
+        return response
+
+    def _load(self, session: requests.Session, site_url: str, taxonomy: str, index: _TermIndex):
+        """만료되었으면 다시 읽음 - 첫 페이지 ETag가 그대로면(304) 유지, 바뀌었으면 전체 페이지 다시 읽기"""
+        first = self._fetch_page(session, site_url, taxonomy, 1, index.etag if index.terms else None)
+        if first.status_code == 304:
+            index.expires = time.monotonic() + self.ttl
+            return
+
+        responses = [first]
+        total_pages = int(first.headers.get('X-WP-TotalPages') or 1)
+        if total_pages > 1:
+            # 나머지 페이지는 사이트 슬롯 안에서 동시에 조회
+            with ThreadPoolExecutor(max_workers=min(self.slots.limit, total_pages - 1)) as pool:
+                responses += list(pool.map(
+                    lambda page: self._fetch_page(session, site_url, taxonomy, page),
+                    range(2, total_pages + 1)
+                ))
+
+        terms = {}
+        for response in responses:
+            for term in response.json():
+                terms.setdefault(normalize_term(term.get('name')), term['id'])
+
+        index.terms = terms
+        index.etag = first.headers.get('ETag')
+        index.expires = time.monotonic() + self.ttl
+
+    def _create(self, session: requests.Session, site_url: str, taxonomy: str, name: str) -> Optional[int]:
+        with self.slots.semaphore(site_url):
+            response = session.post(self.api_url(site_url, taxonomy), json={'name': name}, timeout=self.timeout)
+        if response.status_code in (200, 201):
+            return response.json()['id']
+        # 다른 요청이 먼저 만든 경우 WordPress가 기존 용어 ID를 알려줌
+        if response.status_code == 400:
+            data = response.json()
+            if data.get('code') == 'term_exists':
+                return (data.get('data') or {}).get('term_id')
+        print(f"{taxonomy} 용어 생성 실패({name}): HTTP {response.status_code}")
+        return None
+
+    def _create_missing(self, session: requests.Session, site_url: str, indexes: Dict[str, _TermIndex],
+                        missing: List[tuple]):
+        """없는 용어를 동시에 생성 - resolve_timeout 안에 끝나지 않은 용어는 이번 게시에서 제외"""
+        def create_one(taxonomy: str, key: str, name: str):
+            term_id = self._create(session, site_url, taxonomy, name)
+            if term_id is not None:
+                # 제한 시간이 지난 뒤에 끝나도 다음 게시를 위해 색인에 반영
+                index = indexes[taxonomy]
+                with index.lock:
+                    index.terms[key] = term_id
+
+        pool = ThreadPoolExecutor(max_workers=max(1, min(self.slots.limit, len(missing))))
+        try:
+            futures = {pool.submit(create_one, *item): item for item in missing}
+            done, not_done = wait(futures, timeout=self.resolve_timeout)
+            for future in done:
+                if future.exception() is not None:
+                    taxonomy, _, name = futures[future]
+                    print(f"{taxonomy} 용어 생성 실패({name}): {future.exception()}")
+            if not_done:
+                print(f"{site_url} 용어 {len(not_done)}개가 {self.resolve_timeout}초 안에 생성되지 않아 제외합니다.")
+        finally:
+            # 느린 요청을 기다리지 않고 시작하지 않은 작업만 취소
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def resolve_many(self, session: requests.Session, site_url: str, requested: Dict[str, List[str]],
+                     failures: Optional[Dict[str, List[str]]] = None) -> Dict[str, List[int]]:
+        """분류별 이름 목록을 용어 ID로 변환 (대소문자 무시, 입력 순서 유지)
+
+        없는 용어는 분류와 관계없이 한꺼번에 사이트 슬롯 안에서 동시에 생성합니다.
+        실패하거나 제한 시간 안에 생성되지 않은 이름은 건너뛰고 failures에 기록합니다.
+        """
+        indexes = {taxonomy: self._index(site_url, taxonomy) for taxonomy in requested}
+        for taxonomy, index in indexes.items():
+            with index.lock:
+                if time.monotonic() >= index.expires:
+                    self._load(session, site_url, taxonomy, index)
+
+        missing, seen = [], set()
+        for taxonomy, names in requested.items():
+            index = indexes[taxonomy]
+            with index.lock:
+                for name in names:
+                    key = normalize_term(name)
+                    if key and key not in index.terms and (taxonomy, key) not in seen:
+                        seen.add((taxonomy, key))
+                        missing.append((taxonomy, key, name.strip()))
+        if missing:
+            self._create_missing(session, site_url, indexes, missing)
+
+        resolved = {}
+        for taxonomy, names in requested.items():
+            index = indexes[taxonomy]
+            ids = []
+            with index.lock:
+                for name in names:
+                    key = normalize_term(name)
+                    if not key:
+                        continue
+                    term_id = index.terms.get(key)
+                    if term_id is None:
+                        if failures is not None:
+                            failures.setdefault(taxonomy, []).append(name.strip())
+                    elif term_id not in ids:
+                        ids.append(term_id)
+            resolved[taxonomy] = ids
+        return resolved
+
+    def resolve(self, session: requests.Session, site_url: str, taxonomy: str, names: List[str],
+                failures: Optional[List[str]] = None) -> List[int]:
+        """한 분류의 이름 목록을 용어 ID로 변환"""
+        skipped = {}
+        ids = self.resolve_many(session, site_url, {taxonomy: names}, skipped)[taxonomy]
+        if failures is not None:
+            failures.extend(skipped.get(taxonomy, []))
+        return ids
+
+    def invalidate(self, site_url: str):
+        """사이트의 용어 캐시 삭제 (다음 게시 때 다시 읽음)"""
+        with self._lock:
+            for taxonomy in TAXONOMIES:
+                self._indexes.pop((site_url.rstrip('/'), taxonomy), None)
+
+    def clear(self):
+        with self._lock:
+            self._indexes.clear()
+
+taxonomy_cache = TaxonomyCache(
+    ttl=float(os.getenv('WORDPRESS_TAXONOMY_CACHE_TTL', '600')),
+    resolve_timeout=float(os.getenv('WORDPRESS_TAXONOMY_RESOLVE_TIMEOUT', '15'))
+)
@@ -1,20 +1,73 @@
 import requests
-import base64
+import html
 import json
-from typing import Dict, List, Optional
-from datetime import datetime
-import re
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime, timedelta, timezone
+from urllib3.exceptions import NewConnectionError
 from urllib.parse import urljoin, urlparse
+from sqlalchemy.orm import Session
+
+from src.models.wordpress_site import WordPressSite
+from src.services.site_cache import SiteCache, SiteConfig, site_cache
+from src.services.taxonomy_cache import TaxonomyCache, taxonomy_cache
+from src.services.wordpress_sessions import SiteSlots, WordPressSessionPool, site_slots, wordpress_sessions
+from src.utils.crypto_utils import encrypt_secret
+
+# 잠시 후 다시 시도하면 성공할 수 있는 응답 (요청 제한, 서버 과부하)
+TRANSIENT_STATUS_CODES = (429, 500, 502, 503, 504)
+# 요청을 처리하기 전에 거부했음이 분명한 응답 - 같은 게시 요청을 다시 보내도 중복 게시되지 않음
+RETRY_SAFE_STATUS_CODES = (429, 503)
+# REST 경로 자체가 없는 응답 - 이때만 XML-RPC로 다시 게시
+REST_UNAVAILABLE_STATUS_CODES = (404, 405)
+# 응답을 받지 못한 게시 요청의 결과를 찾을 때 사이트와의 시계 차이 여유 (초)
+LOST_RESPONSE_LOOKUP_MARGIN = 60
+
+class WordPressTransientError(Exception):
+    """일시적인 WordPress 오류 (429/5xx) - 호출자가 잠시 후 재시도"""
+
+    def __init__(self, status_code: int, message: str, retry_after: Optional[float] = None):
+        super().__init__(f"HTTP {status_code}: {message}")
+        self.status_code = status_code
+        # Retry-After 헤더(초)가 있으면 그 시간 이후 재시도
+        self.retry_after = retry_after
+
+    @property
+    def retry_safe(self) -> bool:
+        """그대로 재시도해도 되는지 (500/502/504는 포스트가 만들어진 뒤 응답만 실패했을 수 있음)"""
+        return self.status_code in RETRY_SAFE_STATUS_CODES
+
+class WordPressRestUnavailable(Exception):
+    """REST API 포스트 경로가 없음 (404/405) - 포스트가 만들어지지 않았으므로 XML-RPC로 게시 가능"""
+
+def _failed_before_send(error: requests.exceptions.RequestException) -> bool:
+    """요청이 사이트에 전달되기 전에 실패했는지 (연결 시간 초과, 연결 거부, DNS 오류)"""
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    if isinstance(error, requests.exceptions.ConnectionError) and error.args:
+        return isinstance(getattr(error.args[0], 'reason', None), NewConnectionError)
+    return False
+
+def _retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    try:
+        return max(0.0, float(value)) if value else None
+    except ValueError:
+        return None
 
 class WordPressService:
     """WordPress 연동 서비스"""
     
-    def __init__(self):
-        # 간단한 메모리 기반 저장소 (실제 환경에서는 데이터베이스 사용)
-        self.sites_store = {}
-        self.user_sites = {}
+    def __init__(self, sites: SiteCache = None, sessions: WordPressSessionPool = None,
+                 taxonomies: TaxonomyCache = None, slots: SiteSlots = None):
+        # 사이트는 DB(wordpress_sites)에 저장하고 사용자별 읽기 캐시로 조회
+        self.sites = sites if sites is not None else site_cache
+        # REST 호출은 사이트별 keep-alive 세션으로 (TLS 연결 재사용)
+        self.sessions = sessions if sessions is not None else wordpress_sessions
+        # 카테고리/태그는 사이트별로 한 번 읽어 두고 이름으로 조회
+        self.taxonomies = taxonomies if taxonomies is not None else taxonomy_cache
+        # 사이트별 동시 요청 수 제한 (용어 캐시와 공유)
+        self.slots = slots if slots is not None else site_slots
     
-    def add_site(self, user_id: int, name: str, url: str, username: str, password: str) -> Dict:
+    def add_site(self, db: Session, user_id: int, name: str, url: str, username: str, password: str) -> SiteConfig:
         """WordPress 사이트 추가"""
         
         # URL 정규화
@@ -26,44 +79,43 @@ class WordPressService:
             raise ValueError(f"WordPress 연결 실패: {test_result['message']}")
         
         # 사이트 정보 저장
-        if user_id not in self.user_sites:
-            self.user_sites[user_id] = []
-        
-        site_id = len(self.user_sites[user_id]) + 1
-        site = {
-            'id': site_id,
-            'name': name,
-            'url': normalized_url,
-            'username': username,
-            'password': password,
-            'user_id': user_id,
-            'is_active': True,
-            'created_at': datetime.utcnow().isoformat(),
-            'last_tested': datetime.utcnow().isoformat(),
-            'status': 'connected',
-            'user_info': test_result.get('user_info', {})
-        }
-        
-        self.user_sites[user_id].append(site)
-        return site
+        site = WordPressSite(
+            user_id=user_id,
+            name=name,
+            url=normalized_url,
+            username=username,
+            password_encrypted=encrypt_secret(password),
+            is_active=True,
+            status='connected',
+            user_info=json.dumps(test_result.get('user_info', {}), ensure_ascii=False),
+            last_tested=datetime.utcnow()
+        )
+        db.add(site)
+        db.commit()
+        db.refresh(site)
+        self.sites.invalidate(user_id)
+        return SiteConfig.from_model(site)
     
-    def get_user_sites(self, user_id: int) -> List[Dict]:
+    def get_user_sites(self, db: Session, user_id: int) -> List[SiteConfig]:
         """사용자의 WordPress 사이트 목록 조회"""
-        return self.user_sites.get(user_id, [])
+        return self.sites.get_sites(db, user_id)
     
-    def get_site(self, user_id: int, site_id: int) -> Optional[Dict]:
+    def get_site(self, db: Session, user_id: int, site_id: int) -> Optional[SiteConfig]:
         """특정 사이트 조회"""
-        sites = self.get_user_sites(user_id)
-        for site in sites:
-            if site['id'] == site_id:
-                return site
-        return None
+        return self.sites.get_site(db, user_id, site_id)
     
-    def update_site(self, user_id: int, site_id: int, name: str, url: str, username: str, password: str) -> Dict:
-        """WordPress 사이트 정보 수정"""
-        site = self.get_site(user_id, site_id)
+    def _get_site_model(self, db: Session, user_id: int, site_id: int) -> WordPressSite:
+        site = db.query(WordPressSite).filter(
+            WordPressSite.user_id == user_id,
+            WordPressSite.id == site_id
+        ).first()
         if not site:
             raise ValueError("사이트를 찾을 수 없습니다.")
+        return site
+    
+    def update_site(self, db: Session, user_id: int, site_id: int, name: str, url: str, username: str, password: str) -> SiteConfig:
+        """WordPress 사이트 정보 수정"""
+        site = self._get_site_model(db, user_id, site_id)
         
         # URL 정규화
         normalized_url = self._normalize_url(url)
@@ -74,28 +126,60 @@ class WordPressService:
             raise ValueError(f"WordPress 연결 실패: {test_result['message']}")
         
         # 사이트 정보 업데이트
-        site.update({
-            'name': name,
-            'url': normalized_url,
-            'username': username,
-            'password': password,
-            'last_tested': datetime.utcnow().isoformat(),
-            'status': 'connected',
-            'user_info': test_result.get('user_info', {}),
-            'updated_at': datetime.utcnow().isoformat()
-        })
-        
-        return site
+        site.name = name
+        site.url = normalized_url
+        site.username = username
+        site.password_encrypted = encrypt_secret(password)
+        site.last_tested = datetime.utcnow()
+        site.status = 'connected'
+        site.user_info = json.dumps(test_result.get('user_info', {}), ensure_ascii=False)
+        site.version = WordPressSite.version + 1
+        db.commit()
+        db.refresh(site)
+        self.sites.invalidate(user_id)
+        return SiteConfig.from_model(site)
     
-    def delete_site(self, user_id: int, site_id: int):
+    def delete_site(self, db: Session, user_id: int, site_id: int):
         """WordPress 사이트 삭제"""
-        if user_id not in self.user_sites:
-            raise ValueError("사용자의 사이트를 찾을 수 없습니다.")
-        
-        self.user_sites[user_id] = [
-            site for site in self.user_sites[user_id] 
-            if site['id'] != site_id
-        ]
+        site = self._get_site_model(db, user_id, site_id)
+        db.delete(site)
+        db.commit()
+        self.sites.invalidate(user_id)
+    
+    def set_active_site(self, db: Session, user_id: int, site_id: int) -> SiteConfig:
+        """선택한 사이트만 활성화"""
+        site = self._get_site_model(db, user_id, site_id)
+        db.query(WordPressSite).filter(
+            WordPressSite.user_id == user_id,
+            WordPressSite.id != site_id
+        ).update({WordPressSite.is_active: False, WordPressSite.version: WordPressSite.version + 1},
+                 synchronize_session=False)
+        site.is_active = True
+        site.version = WordPressSite.version + 1
+        db.commit()
+        db.refresh(site)
+        self.sites.invalidate(user_id)
+        return SiteConfig.from_model(site)
+    
+    def record_test_result(self, db: Session, user_id: int, site_id: int, success: bool):
+        """연결 테스트 결과로 사이트 상태 갱신"""
+        site = self._get_site_model(db, user_id, site_id)
+        site.last_tested = datetime.utcnow()
+        site.status = 'connected' if success else 'disconnected'
+        site.version = WordPressSite.version + 1
+        db.commit()
+        self.sites.invalidate(user_id)
+    
+    def _session(self, site: SiteConfig) -> requests.Session:
+        return self.sessions.get(site.url, site.username, site.password)
+    
+    def _require_site(self, db: Session, user_id: int, site_id: int) -> SiteConfig:
+        site = self.get_site(db, user_id, site_id)
+        if not site:
+            raise ValueError("사이트를 찾을 수 없습니다.")
+        if site.password is None:
+            raise ValueError("저장된 자격 증명을 복호화할 수 없습니다. 사이트 정보를 다시 저장해주세요.")
+        return site
     
     def test_connection(self, url: str, username: str, password: str) -> Dict:
         """WordPress 연결 테스트"""
@@ -103,16 +187,9 @@ class WordPressService:
             # REST API 엔드포인트 확인
             api_url = urljoin(url.rstrip('/') + '/', 'wp-json/wp/v2/users/me')
             
-            # 인증 헤더 생성
-            credentials = base64.b64encode(f"{username}:{password}".encode()).decode()
-            headers = {
-                'Authorization': f'Basic {credentials}',
-                'Content-Type': 'application/json',
-                'User-Agent': 'WordPress Auto Poster/1.0'
-            }
-            
-            # API 요청
-            response = requests.get(api_url, headers=headers, timeout=15)
+            # API 요청 (사이트별 세션 - 인증 헤더 포함)
+            session = self.sessions.get(url, username, password)
+            response = session.get(api_url, timeout=15)
             
             if response.status_code == 200:
                 user_data = response.json()
@@ -196,44 +273,67 @@ class WordPressService:
                 "message": f"REST API와 XML-RPC 모두 사용할 수 없습니다: {str(e)}"
             }
     
-    def create_post(self, user_id: int, site_id: int, title: str, content: str, 
+    def create_post(self, db: Session, user_id: int, site_id: int, title: str, content: str, 
                    status: str = 'draft', categories: List[str] = None, 
                    tags: List[str] = None, featured_image_url: str = None,
                    excerpt: str = None, meta_description: str = None) -> Dict:
-        """WordPress 포스트 생성"""
+        """WordPress 포스트 생성
+
+        XML-RPC로는 REST 요청이 전달되기 전에 실패했거나 REST 경로가 없을 때만 다시 보냄.
+        요청을 보낸 뒤 응답을 받지 못했으면 같은 제목의 포스트가 만들어졌는지 먼저 확인
+        """
         
-        site = self.get_site(user_id, site_id)
-        if not site:
-            raise ValueError("사이트를 찾을 수 없습니다.")
+        site = self._require_site(db, user_id, site_id)
+        attempted_at = datetime.now(timezone.utc) - timedelta(seconds=LOST_RESPONSE_LOOKUP_MARGIN)
         
         try:
             # REST API 시도
             return self._create_post_rest_api(site, title, content, status, 
                                             categories, tags, featured_image_url, 
                                             excerpt, meta_description)
-        except Exception as rest_error:
+        except WordPressTransientError:
+            # 일시적인 오류는 XML-RPC로 우회하지 않고 호출자가 재시도
+            raise
+        except WordPressRestUnavailable as rest_error:
+            return self._create_post_xmlrpc_fallback(site, title, content, status, categories, tags,
+                                                     featured_image_url, excerpt, rest_error)
+        except requests.exceptions.RequestException as rest_error:
+            if _failed_before_send(rest_error):
+                return self._create_post_xmlrpc_fallback(site, title, content, status, categories, tags,
+                                                         featured_image_url, excerpt, rest_error)
+            # 응답만 잃었을 수 있으므로 다시 보내지 않고 게시 여부 확인
             try:
-                # XML-RPC 시도
-                return self._create_post_xmlrpc(site, title, content, status, 
-                                              categories, tags, featured_image_url, 
-                                              excerpt)
-            except Exception as xmlrpc_error:
-                raise ValueError(f"포스트 생성 실패 - REST API: {rest_error}, XML-RPC: {xmlrpc_error}")
+                existing = self._find_recent_post(site, title, attempted_at)
+            except Exception as lookup_error:
+                raise ValueError(f"포스트 생성 응답을 받지 못했고 게시 여부도 확인할 수 없습니다: {rest_error} "
+                                 f"(확인 실패: {lookup_error})")
+            if existing:
+                print(f"응답을 받지 못한 게시 요청이 처리됨 ({site.url}, 포스트 {existing['id']}): {rest_error}")
+                return existing
+            raise ValueError(f"포스트 생성 응답을 받지 못했습니다. 중복 게시를 피하기 위해 다시 보내지 않습니다: {rest_error}")
+        except Exception as rest_error:
+            raise ValueError(f"포스트 생성 실패 - REST API: {rest_error}")
+    
+    def _create_post_xmlrpc_fallback(self, site: SiteConfig, title: str, content: str, status: str,
+                                     categories: List[str], tags: List[str], featured_image_url: str,
+                                     excerpt: str, rest_error: Exception) -> Dict:
+        """REST API로 포스트가 만들어지지 않았음이 확실할 때 XML-RPC로 게시"""
+        try:
+            return self._create_post_xmlrpc(site, title, content, status, 
+                                          categories, tags, featured_image_url, 
+                                          excerpt)
+        except Exception as xmlrpc_error:
+            raise ValueError(f"포스트 생성 실패 - REST API: {rest_error}, XML-RPC: {xmlrpc_error}")
     
-    def _create_post_rest_api(self, site: Dict, title: str, content: str, 
+    def _create_post_rest_api(self, site: SiteConfig, title: str, content: str, 
                              status: str, categories: List[str], tags: List[str],
                              featured_image_url: str, excerpt: str, 
                              meta_description: str) -> Dict:
         """REST API를 통한 포스트 생성"""
         
-        api_url = urljoin(site['url'].rstrip('/') + '/', 'wp-json/wp/v2/posts')
+        api_url = urljoin(site.url.rstrip('/') + '/', 'wp-json/wp/v2/posts')
         
-        credentials = base64.b64encode(f"{site['username']}:{site['password']}".encode()).decode()
-        headers = {
-            'Authorization': f'Basic {credentials}',
-            'Content-Type': 'application/json',
-            'User-Agent': 'WordPress Auto Poster/1.0'
-        }
+        session = self._session(site)
         
         # 포스트 데이터 준비
         post_data = {
@@ -243,23 +343,31 @@ class WordPressService:
             'excerpt': excerpt or '',
         }
         
-        # 카테고리 처리
-        if categories:
-            category_ids = self._get_or_create_categories(site, categories)
-            post_data['categories'] = category_ids
-        
-        # 태그 처리
-        if tags:
-            tag_ids = self._get_or_create_tags(site, tags)
-            post_data['tags'] = tag_ids
-        
         # 메타 설명 처리 (Yoast SEO 플러그인 지원)
         if meta_description:
             post_data['meta'] = {
                 '_yoast_wpseo_metadesc': meta_description
             }
         
-        response = requests.post(api_url, headers=headers, json=post_data, timeout=30)
+        for attempt in range(2):
+            # 카테고리/태그 처리 (없는 용어는 동시에 생성, 실패한 용어는 빼고 게시)
+            skipped_terms = {}
+            if categories or tags:
+                category_ids, tag_ids = self._resolve_terms(site, categories or [], tags or [], skipped_terms)
+                if categories:
+                    post_data['categories'] = category_ids
+                if tags:
+                    post_data['tags'] = tag_ids
+            
+            with self.slots.semaphore(site.url):
+                response = session.post(api_url, json=post_data, timeout=30)
+            
+            # 사이트에서 삭제된 용어 ID가 캐시에 남아 있으면 캐시를 비우고 다시 조회해 한 번 더 게시
+            if attempt == 0 and (categories or tags) and self._rejected_term_ids(response):
+                print(f"{site.url} 용어 ID가 거부되어 용어 캐시를 다시 읽습니다.")
+                self.taxonomies.invalidate(site.url)
+                continue
+            break
         
         if response.status_code in [200, 201]:
             post_result = response.json()
@@ -268,18 +376,26 @@ class WordPressService:
             if featured_image_url:
                 self._set_featured_image(site, post_result['id'], featured_image_url)
             
-            return {
+            result = {
                 'id': post_result['id'],
                 'title': post_result['title']['rendered'],
                 'link': post_result['link'],
                 'status': post_result['status'],
                 'date': post_result['date']
             }
+            if skipped_terms:
+                result['skipped_terms'] = skipped_terms
+            return result
         else:
             error_data = response.json() if response.headers.get('content-type', '').startswith('application/json') else {}
+            if response.status_code in TRANSIENT_STATUS_CODES:
+                raise WordPressTransientError(response.status_code, error_data.get('message', response.text[:200]),
+                                              _retry_after_seconds(response.headers.get('Retry-After')))
+            if response.status_code in REST_UNAVAILABLE_STATUS_CODES:
+                raise WordPressRestUnavailable(f"HTTP {response.status_code}: {error_data.get('message', response.text[:200])}")
             raise Exception(f"HTTP {response.status_code}: {error_data.get('message', response.text)}")
     
-    def _create_post_xmlrpc(self, site: Dict, title: str, content: str, 
+    def _create_post_xmlrpc(self, site: SiteConfig, title: str, content: str, 
                            status: str, categories: List[str], tags: List[str],
                            featured_image_url: str, excerpt: str) -> Dict:
         """XML-RPC를 통한 포스트 생성"""
@@ -287,8 +403,8 @@ class WordPressService:
         from wordpress_xmlrpc import Client, WordPressPost
         from wordpress_xmlrpc.methods.posts import NewPost
         
-        xmlrpc_url = urljoin(site['url'].rstrip('/') + '/', 'xmlrpc.php')
-        client = Client(xmlrpc_url, site['username'], site['password'])
+        xmlrpc_url = urljoin(site.url.rstrip('/') + '/', 'xmlrpc.php')
+        client = Client(xmlrpc_url, site.username, site.password)
         
         post = WordPressPost()
         post.title = title
@@ -308,80 +424,40 @@ class WordPressService:
         return {
             'id': post_id,
             'title': title,
-            'link': f"{site['url']}/?p={post_id}",
+            'link': f"{site.url}/?p={post_id}",
             'status': status,
             'date': datetime.utcnow().isoformat()
         }
     
-    def _get_or_create_categories(self, site: Dict, category_names: List[str]) -> List[int]:
-        """카테고리 조회 또는 생성"""
+    @staticmethod
+    def _rejected_term_ids(response) -> bool:
+        """카테고리/태그 ID가 잘못되었다는 400 응답인지 (rest_invalid_param)"""
+        if response.status_code != 400:
+            return False
         try:
-            api_url = urljoin(site['url'].rstrip('/') + '/', 'wp-json/wp/v2/categories')
-            credentials = base64.b64encode(f"{site['username']}:{site['password']}".encode()).decode()
-            headers = {
-                'Authorization': f'Basic {credentials}',
-                'Content-Type': 'application/json'
-            }
-            
-            category_ids = []
-            
-            for category_name in category_names:
-                # 기존 카테고리 검색
-                search_url = f"{api_url}?search={category_name}"
-                response = requests.get(search_url, headers=headers, timeout=10)
-                
-                if response.status_code == 200:
-                    categories = response.json()
-                    existing_category = next((cat for cat in categories if cat['name'].lower() == category_name.lower()), None)
-                    
-                    if existing_category:
-                        category_ids.append(existing_category['id'])
-                    else:
-                        # 새 카테고리 생성
-                        create_response = requests.post(api_url, headers=headers, json={'name': category_name}, timeout=10)
-                        if create_response.status_code in [200, 201]:
-                            new_category = create_response.json()
-                            category_ids.append(new_category['id'])
-            
-            return category_ids
-        except:
-            return [1]  # 기본 카테고리 ID
+            error_data = response.json()
+        except ValueError:
+            return False
+        params = (error_data.get('data') or {}).get('params') or {}
+        return error_data.get('code') == 'rest_invalid_param' and any(key in params for key in ('categories', 'tags'))
     
-    def _get_or_create_tags(self, site: Dict, tag_names: List[str]) -> List[int]:
-        """태그 조회 또는 생성"""
+    def _resolve_terms(self, site: SiteConfig, category_names: List[str], tag_names: List[str],
+                       failures: Optional[Dict[str, List[str]]] = None) -> Tuple[List[int], List[int]]:
+        """카테고리/태그 조회 또는 생성 (사이트별 용어 캐시, 없는 용어는 사이트 슬롯 안에서 동시에 생성)"""
+        session = self._session(site)
         try:
-            api_url = urljoin(site['url'].rstrip('/') + '/', 'wp-json/wp/v2/tags')
-            credentials = base64.b64encode(f"{site['username']}:{site['password']}".encode()).decode()
-            headers = {
-                'Authorization': f'Basic {credentials}',
-                'Content-Type': 'application/json'
-            }
-            
-            tag_ids = []
-            
-            for tag_name in tag_names:
-                # 기존 태그 검색
-                search_url = f"{api_url}?search={tag_name}"
-                response = requests.get(search_url, headers=headers, timeout=10)
-                
-                if response.status_code == 200:
-                    tags = response.json()
-                    existing_tag = next((tag for tag in tags if tag['name'].lower() == tag_name.lower()), None)
-                    
-                    if existing_tag:
-                        tag_ids.append(existing_tag['id'])
-                    else:
-                        # 새 태그 생성
-                        create_response = requests.post(api_url, headers=headers, json={'name': tag_name}, timeout=10)
-                        if create_response.status_code in [200, 201]:
-                            new_tag = create_response.json()
-                            tag_ids.append(new_tag['id'])
-            
-            return tag_ids
-        except:
-            return []
+            resolved = self.taxonomies.resolve_many(
+                session, site.url, {'categories': category_names, 'tags': tag_names}, failures
+            )
+            category_ids = resolved['categories']
+        except Exception as e:
+            print(f"카테고리/태그 처리 실패({site.url}): {e}")
+            return ([1] if category_names else []), []  # 기본 카테고리 ID
+        if category_names and not category_ids:
+            category_ids = [1]
+        return category_ids, resolved['tags']
     
-    def _set_featured_image(self, site: Dict, post_id: int, image_url: str):
+    def _set_featured_image(self, site: SiteConfig, post_id: int, image_url: str):
         """특성 이미지 설정"""
         try:
             # 이미지 업로드 및 설정 로직
@@ -390,21 +466,49 @@ class WordPressService:
         except:
             pass
     
-    def get_posts(self, user_id: int, site_id: int, limit: int = 10) -> List[Dict]:
+    def find_recent_post(self, db: Session, user_id: int, site_id: int, title: str,
+                         since: datetime) -> Optional[Dict]:
+        """since 이후 만들어진 같은 제목의 포스트 조회 (응답을 받지 못한 게시 요청이 처리되었는지 확인)"""
+        return self._find_recent_post(self._require_site(db, user_id, site_id), title, since)
+    
+    def _find_recent_post(self, site: SiteConfig, title: str, since: datetime) -> Optional[Dict]:
+        api_url = urljoin(site.url.rstrip('/') + '/', 'wp-json/wp/v2/posts')
+        params = {
+            'search': title,
+            'after': since.isoformat(),
+            'status': 'publish,future,draft,pending,private',
+            'context': 'edit',
+            'orderby': 'date',
+            'order': 'desc',
+            'per_page': 20,
+            '_fields': 'id,title,link,status,date'
+        }
+        with self.slots.semaphore(site.url):
+            response = self._session(site).get(api_url, params=params, timeout=15)
+        if response.status_code != 200:
+            raise Exception(f"HTTP {response.status_code}: 포스트 조회 실패")
+        
+        for post in response.json():
+            post_title = post['title'].get('raw') or html.unescape(post['title'].get('rendered', ''))
+            if post_title.strip() == (title or '').strip():
+                return {
+                    'id': post['id'],
+                    'title': post_title,
+                    'link': post['link'],
+                    'status': post['status'],
+                    'date': post['date']
+                }
+        return None
+    
+    def get_posts(self, db: Session, user_id: int, site_id: int, limit: int = 10) -> List[Dict]:
         """WordPress 포스트 목록 조회"""
-        site = self.get_site(user_id, site_id)
-        if not site:
-            raise ValueError("사이트를 찾을 수 없습니다.")
+        site = self._require_site(db, user_id, site_id)
         
         try:
-            api_url = urljoin(site['url'].rstrip('/') + '/', f'wp-json/wp/v2/posts?per_page={limit}')
-            credentials = base64.b64encode(f"{site['username']}:{site['password']}".encode()).decode()
-            headers = {
-                'Authorization': f'Basic {credentials}',
-                'Content-Type': 'application/json'
-            }
+            api_url = urljoin(site.url.rstrip('/') + '/', f'wp-json/wp/v2/posts?per_page={limit}')
+            session = self._session(site)
             
-            response = requests.get(api_url, headers=headers, timeout=15)
+            response = session.get(api_url, timeout=15)
             
             if response.status_code == 200:
                 posts = response.json()
@@ -419,7 +523,7 @@ class WordPressService:
                 } for post in posts]
             else:
                 return []
-        except Exception as e:
+        except Exception:
             return []
     
     def _normalize_url(self, url: str) -> str:
@@ -0,0 +1,127 @@
+import base64
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+USER_AGENT = 'WordPress Auto Poster/1.0'
+
+class _SessionEntry:
+    __slots__ = ('session', 'last_used')
+
+    def __init__(self, session: requests.Session):
+        self.session = session
+        self.last_used = time.monotonic()
+
+class WordPressSessionPool:
+    """사이트(URL + 계정)별 requests 세션 풀 - keep-alive 재사용, 인증 헤더 미리 계산, LRU + 유휴 만료"""
+
+    def __init__(self, max_size: int = 64, idle_ttl: float = 300, pool_size: int = 10):
+        self.max_size = max_size
+        self.idle_ttl = idle_ttl
+        # 한 사이트에 동시에 열어 둘 최대 연결 수
+        self.pool_size = pool_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(url: str, username: str, password: str) -> Tuple:
+        """(URL, 사용자명, 비밀번호 해시) 키 - 자격 증명이 바뀌면 새 세션"""
+        password_hash = hashlib.sha256((password or '').encode()).hexdigest()
+        return (url.rstrip('/'), username, password_hash)
+
+    @staticmethod
+    def auth_headers(username: str, password: str) -> Dict[str, str]:
+        credentials = base64.b64encode(f"{username}:{password}".encode()).decode()
+        return {
+            'Authorization': f'Basic {credentials}',
+            'Content-Type': 'application/json',
+            'User-Agent': USER_AGENT
+        }
+
+    def _create(self, username: str, password: str) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers.update(self.auth_headers(username, password))
+        return session
+
+    def get(self, url: str, username: str, password: str) -> requests.Session:
+        """사이트 세션 조회 (없으면 생성)"""
+        key = self.make_key(url, username, password)
+        now = time.monotonic()
+        with self._lock:
+            expired = self._pop_expired(now)
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = _SessionEntry(self._create(username, password))
+                self._entries[key] = entry
+                while len(self._entries) > self.max_size:
+                    _, evicted = self._entries.popitem(last=False)
+                    expired.append(evicted)
+            else:
+                self._entries.move_to_end(key)
+            entry.last_used = now
+            session = entry.session
+
+        for evicted in expired:
+            evicted.session.close()
+        return session
+
+    def _pop_expired(self, now: float):
+        expired = []
+        while self._entries:
+            key, entry = next(iter(self._entries.items()))
+            if now - entry.last_used < self.idle_ttl:
+                break
+            del self._entries[key]
+            expired.append(entry)
+        return expired
+
+    def evict_idle(self) -> int:
+        """유휴 시간이 지난 세션을 닫고 닫은 수 반환"""
+        with self._lock:
+            expired = self._pop_expired(time.monotonic())
+        for entry in expired:
+            entry.session.close()
+        return len(expired)
+
+    def close(self):
+        """모든 세션 정리"""
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+        for entry in entries:
+            entry.session.close()
+
+    def __len__(self):
+        return len(self._entries)
+
+class SiteSlots:
+    """사이트 호스트별 동시 요청 슬롯 (프로세스 전역 세마포어) - 호스트의 요청 제한에 걸리지 않도록"""
+
+    def __init__(self, limit: int = 4):
+        self.limit = limit
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def semaphore(self, url: str) -> threading.BoundedSemaphore:
+        key = url.rstrip('/')
+        with self._lock:
+            if key not in self._semaphores:
+                self._semaphores[key] = threading.BoundedSemaphore(self.limit)
+            return self._semaphores[key]
+
+site_slots = SiteSlots(limit=max(1, int(os.getenv('WORDPRESS_SITE_CONCURRENCY', '4'))))
+
+wordpress_sessions = WordPressSessionPool(
+    max_size=int(os.getenv('WORDPRESS_SESSION_POOL_SIZE', '64')),
+    idle_ttl=float(os.getenv('WORDPRESS_SESSION_IDLE_TTL', '300')),
+    pool_size=int(os.getenv('WORDPRESS_CONNECTIONS_PER_SITE', '10'))
+)
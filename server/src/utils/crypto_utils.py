@@ -0,0 +1,26 @@
+import base64
+import hashlib
+import os
+
+from cryptography.fernet import Fernet, InvalidToken
+
+_SECRET = os.environ.get(
+    "CREDENTIALS_SECRET_KEY",
+    os.environ.get("JWT_SECRET_KEY", "jwt-secret-string-wordpress-auto-poster")
+)
+_FERNET = Fernet(base64.urlsafe_b64encode(hashlib.sha256(b"credentials-encryption:" + _SECRET.encode()).digest()))
+
+_FERNET_PREFIX = "f1:"
+
+def encrypt_secret(plaintext: str) -> str:
+    """자격 증명 암호화 (Fernet)"""
+    return _FERNET_PREFIX + _FERNET.encrypt((plaintext or '').encode('utf-8')).decode()
+
+def decrypt_secret(token: str) -> str:
+    """암호화된 자격 증명 복호화 - 키가 다르거나 변조되었으면 ValueError"""
+    if not token.startswith(_FERNET_PREFIX):
+        raise ValueError("알 수 없는 암호화 형식입니다.")
+    try:
+        return _FERNET.decrypt(token[len(_FERNET_PREFIX):].encode()).decode('utf-8')
+    except InvalidToken:
+        raise ValueError("자격 증명을 복호화할 수 없습니다.")
@@ -1,3 +1,4 @@
+import os
 from fastapi import Depends, HTTPException, Header
 from jwt import PyJWTError
 from sqlalchemy.orm import Session
@@ -18,3 +19,10 @@ async def get_current_user(authorization: str = Header(None), db: Session = Depe
     if user is None:
         raise HTTPException(status_code=401, detail='User not found')
     return user
+
+async def get_current_admin(user: User = Depends(get_current_user)):
+    """관리자(ADMIN_USERNAMES 환경변수에 등록된 사용자)만 허용"""
+    admins = {name.strip() for name in os.getenv('ADMIN_USERNAMES', '').split(',') if name.strip()}
+    if user.username not in admins:
+        raise HTTPException(status_code=403, detail='Admin privileges required')
+    return user
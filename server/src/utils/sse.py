@@ -0,0 +1,18 @@
+import json
+from typing import Dict, Iterator
+
+from fastapi.responses import StreamingResponse
+
+def to_sse(events: Iterator[Dict]) -> Iterator[str]:
+    """{'type': ..., ...} 이벤트를 Server-Sent Events 형식으로 변환"""
+    for event in events:
+        event_type = event.pop('type')
+        yield f"event: {event_type}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+
+def sse_response(events: Iterator[Dict]) -> StreamingResponse:
+    """이벤트 스트림 응답 (프록시 버퍼링 비활성화)"""
+    return StreamingResponse(
+        to_sse(events),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -0,0 +1,116 @@
+import sys, os, json
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'server'))
+from types import SimpleNamespace
+
+import pytest
+
+from src.services.batch_prompts import OpenAIBatchClient, build_batch_prompt, parse_batch_response
+from src.services.content_generator import AdvancedContentGenerator
+
+BASE_CONTENT = {'title': '커피 가이드', 'content': '# 커피 가이드\n본문', 'keyword': '커피'}
+
+
+def test_parse_batch_response_accepts_fenced_json():
+    text = '결과입니다.\n```json\n{"twitter": {"text": "트윗"}, "extra": 1}\n```'
+    assert parse_batch_response(text, ['twitter', 'facebook']) == {'twitter': {'text': '트윗'}}
+
+    with pytest.raises(ValueError):
+        parse_batch_response('JSON 없음', ['twitter'])
+
+
+def test_variations_and_social_share_one_completion(monkeypatch):
+    generator = AdvancedContentGenerator(api_key='sk-test')
+    prompts = []
+
+    def fake_complete(prompt, active_provider=None):
+        prompts.append(prompt)
+        return json.dumps({
+            'variation_1': {'title': '변형 제목', 'content': '변형 본문'},
+            'facebook': {'text': '페북 글', 'hashtags': ['#커피']},
+            'twitter': {'text': '트윗'}
+        }, ensure_ascii=False)
+
+    monkeypatch.setattr(generator, '_complete', fake_complete)
+
+    result = generator.generate_derivative_content(BASE_CONTENT, variation_count=2)
+
+    assert len(prompts) == 1
+    assert [v['title'] for v in result['variations']] == ['변형 제목', '커피 가이드 - 변형 2']
+    assert result['social_media']['facebook'] == {'text': '페북 글', 'hashtags': ['#커피']}
+    assert result['social_media']['twitter']['hashtags'] == ['#블로그', '#커피']
+    assert result['social_media']['linkedin']['text'].startswith('새로운 인사이트: 커피 가이드')
+
+
+def test_demo_mode_keeps_existing_shapes():
+    generator = AdvancedContentGenerator(api_key=None)
+    generator.demo_mode = True
+
+    variations = generator.generate_content_variations(BASE_CONTENT, 2)
+    social = generator.generate_social_media_content(BASE_CONTENT)
+
+    assert [v['variation_type'] for v in variations] == ['variation_1', 'variation_2']
+    assert set(social) == {'facebook', 'twitter', 'linkedin'}
+
+
+class FakeOpenAI:
+    def __init__(self):
+        self.uploaded = None
+        self.files = SimpleNamespace(create=self._create_file, content=self._content)
+        self.batches = SimpleNamespace(create=self._create_batch, retrieve=self._retrieve)
+
+    def _create_file(self, file, purpose):
+        self.uploaded = file[1].read().decode()
+        return SimpleNamespace(id='file-in')
+
+    def _create_batch(self, input_file_id, endpoint, completion_window, metadata):
+        self.metadata = metadata
+        return SimpleNamespace(id='batch-1')
+
+    def _retrieve(self, batch_id):
+        return SimpleNamespace(id=batch_id, status='completed', metadata=self.metadata,
+                               output_file_id='file-out', error_file_id=None)
+
+    def _content(self, file_id):
+        lines = []
+        for line in self.uploaded.splitlines():
+            custom_id = json.loads(line)['custom_id']
+            body = {'choices': [{'message': {'content': json.dumps({'twitter': {'text': custom_id}})}}]}
+            lines.append(json.dumps({'custom_id': custom_id, 'response': {'status_code': 200, 'body': body}}))
+        return SimpleNamespace(text='\n'.join(lines))
+
+
+def test_offline_batch_round_trip(monkeypatch):
+    generator = AdvancedContentGenerator(api_key='sk-test', user_id=7)
+    fake = FakeOpenAI()
+    monkeypatch.setattr(generator, '_get_batch_client', lambda db=None: (OpenAIBatchClient(fake), 'gpt-4o-mini'))
+
+    batch_id = generator.submit_derivative_batch([BASE_CONTENT, BASE_CONTENT], variation_count=1)
+    batch = generator.collect_derivative_batch(batch_id)
+
+    assert batch['status'] == 'completed'
+    assert batch['results']['content-1']['social_media'] == {'twitter': {'text': 'content-1', 'hashtags': ['#블로그']}}
+    assert batch['results']['content-0']['variations'] == []
+
+    other_user = AdvancedContentGenerator(api_key='sk-test', user_id=8)
+    monkeypatch.setattr(other_user, '_get_batch_client', lambda db=None: (OpenAIBatchClient(fake), 'gpt-4o-mini'))
+    with pytest.raises(LookupError):
+        other_user.collect_derivative_batch(batch_id)
+
+
+def test_derivative_batch_without_tasks_is_rejected(monkeypatch):
+    generator = AdvancedContentGenerator(api_key='sk-test', user_id=7)
+    fake = FakeOpenAI()
+    monkeypatch.setattr(generator, '_get_batch_client', lambda db=None: (OpenAIBatchClient(fake), 'gpt-4o-mini'))
+
+    with pytest.raises(ValueError):
+        generator.submit_derivative_batch([BASE_CONTENT], variation_count=0, include_social=False)
+    with pytest.raises(ValueError):
+        build_batch_prompt(BASE_CONTENT, {})
+    assert generator.generate_batch(BASE_CONTENT, {}) == {}
+
+
+def test_batch_client_requires_real_api_key(monkeypatch):
+    monkeypatch.delenv('OPENAI_API_KEY', raising=False)
+    generator = AdvancedContentGenerator(user_id=7)
+    with pytest.raises(ValueError):
+        generator._get_batch_client()
@@ -0,0 +1,185 @@
+from fastapi.testclient import TestClient
+import sys, os, tempfile, threading, time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'server'))
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.main import app
+from src.db import Base, get_db
+from src.models.user import User
+from src.services.bulk_executor import BulkGenerationExecutor, ProviderSlots, load_provider_concurrency
+from src.services.bulk_jobs import bulk_job_service
+from src.services.provider_cache import ProviderConfig
+from src.services.provider_router import ProviderRouter
+from src.services.content_store import content_store
+from src.services.task_queue import celery_app
+from src.utils.jwt_utils import create_access_token
+
+# setup_module에서 채움
+HEADERS = {}
+
+
+def setup_module(module):
+    fd, path = tempfile.mkstemp()
+    os.close(fd)
+    engine = create_engine(
+        f"sqlite:///{path}", connect_args={"check_same_thread": False}
+    )
+    TestingSessionLocal = sessionmaker(
+        autocommit=False, autoflush=False, bind=engine
+    )
+    Base.metadata.create_all(bind=engine)
+
+    def override_get_db():
+        db = TestingSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    module.previous_session_factory = bulk_job_service.session_factory
+    bulk_job_service.session_factory = TestingSessionLocal
+    celery_app.conf.task_always_eager = True
+    # API 키가 없으면 데모 콘텐츠로 생성됨
+    module.previous_api_key = os.environ.pop('OPENAI_API_KEY', None)
+
+    db = TestingSessionLocal()
+    user = User(username='bulkuser', email='bulk@example.com', password_hash='x')
+    db.add(user)
+    db.commit()
+    module.HEADERS = {'Authorization': f'Bearer {create_access_token(str(user.id))}'}
+    db.close()
+    module.TEST_DB_PATH = path
+
+
+def teardown_module(module):
+    bulk_job_service.session_factory = module.previous_session_factory
+    celery_app.conf.task_always_eager = False
+    if module.previous_api_key:
+        os.environ['OPENAI_API_KEY'] = module.previous_api_key
+    app.dependency_overrides.pop(get_db, None)
+    os.unlink(module.TEST_DB_PATH)
+
+client = TestClient(app)
+
+def test_bulk_generate_returns_job_and_reports_progress():
+    res = client.post('/api/content/bulk-generate', headers=HEADERS,
+                      json={'keywords': ['파이썬', '워드프레스', '자동화']})
+    assert res.status_code == 200
+    job_id = res.json()['data']['job_id']
+
+    status = client.get(f'/api/content/bulk-jobs/{job_id}', headers=HEADERS)
+    assert status.status_code == 200
+    data = status.json()['data']
+    assert data['status'] == 'completed'
+    assert data['progress'] == {'completed': 3, 'total': 3, 'percent': 100.0}
+    assert data['successful'] == 3
+    assert [r['keyword'] for r in data['results']] == ['파이썬', '워드프레스', '자동화']
+    assert data['results'][0]['content']['demo_mode'] is True
+
+def test_bulk_item_keeps_result_when_saving_content_fails(monkeypatch):
+    def generate(item_id, options):
+        return {'title': '제목', 'content': f'본문 {item_id}', 'keyword': '저장'}
+
+    def broken_save(*args, **kwargs):
+        raise RuntimeError('disk full')
+
+    monkeypatch.setattr(bulk_job_service, '_generate_item', generate)
+    monkeypatch.setattr(content_store, 'save', broken_save)
+
+    res = client.post('/api/content/bulk-generate', headers=HEADERS, json={'keywords': ['저장1', '저장2']})
+    data = client.get(f"/api/content/bulk-jobs/{res.json()['data']['job_id']}", headers=HEADERS).json()['data']
+
+    assert data['status'] == 'completed' and data['successful'] == 2
+    for result in data['results']:
+        assert 'content_id' not in result['content']
+        assert 'disk full' in result['error']
+
+def test_bulk_flags_near_duplicates_generated_in_the_same_job(monkeypatch):
+    body = ' '.join(f'커피 원두 로스팅 단계 {i} 설명 문장' for i in range(40))
+
+    def generate(item_id, options):
+        return {'title': '원두 가이드', 'content': body + ('' if item_id % 2 else ' 마무리'), 'keyword': '원두'}
+
+    monkeypatch.setattr(bulk_job_service, '_generate_item', generate)
+
+    res = client.post('/api/content/bulk-generate', headers=HEADERS, json={'keywords': ['원두1', '원두2']})
+    data = client.get(f"/api/content/bulk-jobs/{res.json()['data']['job_id']}", headers=HEADERS).json()['data']
+
+    contents = [result['content'] for result in data['results']]
+    flagged = [c for c in contents if c['duplicate']['is_duplicate']]
+    assert len(flagged) == 1
+    other = next(c for c in contents if c is not flagged[0])
+    assert flagged[0]['duplicate']['matches'][0]['content_id'] == other['content_id']
+
+def test_bulk_job_not_visible_to_other_users():
+    res = client.get('/api/content/bulk-jobs/9999', headers=HEADERS)
+    assert res.status_code == 404
+
+def test_provider_concurrency_parsing():
+    limits = load_provider_concurrency('openai=12, ollama=1,broken')
+    assert limits['openai'] == 12
+    assert limits['ollama'] == 1
+
+def test_executor_runs_in_parallel_with_timeouts():
+    slots = ProviderSlots({'openai': 4})
+    executor = BulkGenerationExecutor(max_workers=8, item_timeout=0.5, slots=slots)
+    results = {}
+
+    def generate(delay):
+        time.sleep(delay)
+        if delay == 0.05:
+            raise ValueError('boom')
+        return delay
+
+    started = time.monotonic()
+    executor.run([0.2, 0.2, 0.05, 2], generate,
+                 lambda item, status, value: results.setdefault(item, status))
+    elapsed = time.monotonic() - started
+
+    assert results == {0.2: 'success', 0.05: 'failed', 2: 'timeout'}
+    assert elapsed < 1.0
+
+
+def test_executor_holds_the_slot_of_the_routed_provider_and_counts_timeouts():
+    slots = ProviderSlots({'openai': 8, 'ollama': 1})
+    router = ProviderRouter(weights=slots.limits, failure_threshold=100, slots=slots)
+    openai = ProviderConfig(1, 'openai', 'openai', 'gpt-4o', api_key='sk-a', is_active=True)
+    ollama = ProviderConfig(2, 'ollama', 'ollama', 'llama3', base_url='http://gpu:11434', use_for_routing=True)
+    executor = BulkGenerationExecutor(max_workers=8, item_timeout=0.3, slots=slots)
+    release = threading.Event()
+    during_stuck_call = {}
+    results = {}
+
+    def generate(item):
+        def call(provider):
+            if item == 'stuck':
+                if provider is openai:
+                    raise ConnectionError('openai down')
+                # 장애 조치로 ollama를 호출하는 동안에는 ollama 슬롯만 잡고 있음
+                during_stuck_call['openai'] = slots.usage('openai')['in_use']
+                during_stuck_call['ollama'] = slots.usage('ollama', 'http://gpu:11434')['in_use']
+                release.wait(5)
+            time.sleep(0.05)
+            return provider.provider_type
+        return router.call([openai, ollama], call)[0]
+
+    items = ['stuck'] + [f'k{i}' for i in range(11)]
+    started = time.monotonic()
+    executor.run(items, generate, lambda item, status, value: results.setdefault(item, (status, value)))
+    elapsed = time.monotonic() - started
+
+    assert during_stuck_call['ollama'] == 1 and during_stuck_call['openai'] <= 8
+    assert results.pop('stuck') == ('timeout', None)
+    assert results == {f'k{i}': ('success', 'openai') for i in range(11)}
+    # 타임아웃된 스레드는 작업자 수에서 빠지므로 남은 항목이 기다리지 않음
+    assert elapsed < 2
+    # 타임아웃된 호출은 끝날 때까지 슬롯을 차지하며 따로 집계됨
+    assert slots.usage('ollama', 'http://gpu:11434') == {'limit': 1, 'in_use': 1, 'timed_out': 1}
+
+    release.set()
+    deadline = time.monotonic() + 2
+    while slots.usage('ollama', 'http://gpu:11434')['in_use'] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert slots.usage('ollama', 'http://gpu:11434') == {'limit': 1, 'in_use': 0, 'timed_out': 0}
@@ -0,0 +1,212 @@
+from fastapi.testclient import TestClient
+import sys, os, tempfile, threading, time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'server'))
+from collections import defaultdict
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.main import app
+from src.db import Base, get_db
+from src.models.user import User
+from src.models.wordpress_site import WordPressSite
+from src.services.bulk_publish import bulk_publish_service
+from src.services.content_store import GeneratedContentRepository
+from src.services.site_cache import SiteCache
+from src.services.task_queue import celery_app
+from src.services.wordpress_service import WordPressService, WordPressTransientError
+from src.utils.crypto_utils import encrypt_secret
+from src.utils.jwt_utils import create_access_token
+
+
+def setup_module(module):
+    fd, path = tempfile.mkstemp()
+    os.close(fd)
+    engine = create_engine(
+        f"sqlite:///{path}", connect_args={"check_same_thread": False}
+    )
+    TestingSessionLocal = sessionmaker(
+        autocommit=False, autoflush=False, bind=engine
+    )
+    Base.metadata.create_all(bind=engine)
+
+    def override_get_db():
+        db = TestingSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    module.previous = (bulk_publish_service.session_factory, bulk_publish_service.wordpress,
+                       bulk_publish_service.backoff_base)
+    bulk_publish_service.session_factory = TestingSessionLocal
+    bulk_publish_service.wordpress = WordPressService(sites=SiteCache())
+    bulk_publish_service.backoff_base = 0.01
+    celery_app.conf.task_always_eager = True
+
+    db = TestingSessionLocal()
+    user = User(username='publisher', email='publisher@example.com', password_hash='x')
+    db.add(user)
+    db.commit()
+    sites = [
+        WordPressSite(user_id=user.id, name=f'client{i}', url=f'https://client{i}.example.com',
+                      username='editor', password_encrypted=encrypt_secret('pw'))
+        for i in range(3)
+    ]
+    db.add_all(sites)
+    db.commit()
+    module.SITE_IDS = [site.id for site in sites]
+    module.CONTENT_ID = GeneratedContentRepository().save(db, user.id, {
+        'keyword': '커피', 'title': '커피 원두 가이드', 'content': '본문입니다.',
+        'meta_tags': {'meta_description': '원두 고르는 법'}, 'tags': ['커피']
+    }).id
+    module.HEADERS = {'Authorization': f'Bearer {create_access_token(str(user.id))}'}
+    db.close()
+    module.TestingSessionLocal = TestingSessionLocal
+    module.TEST_DB_PATH = path
+
+
+def teardown_module(module):
+    (bulk_publish_service.session_factory, bulk_publish_service.wordpress,
+     bulk_publish_service.backoff_base) = module.previous
+    celery_app.conf.task_always_eager = False
+    app.dependency_overrides.pop(get_db, None)
+    os.unlink(module.TEST_DB_PATH)
+
+client = TestClient(app)
+
+
+class FakePublisher:
+    """사이트별 동시 게시 수를 기록하고 첫 항목의 첫 시도에 503, 실패 사이트에는 영구 오류를 내는 게시기"""
+
+    def __init__(self, flaky_item, failing_site):
+        self.flaky_item = flaky_item
+        self.failing_site = failing_site
+        self.lock = threading.Lock()
+        self.active = defaultdict(int)
+        self.max_active = defaultdict(int)
+        self.total_active = 0
+        self.max_total = 0
+        self.calls = []
+
+    def create_post(self, db, user_id, site_id, title, content, status='draft', categories=None, tags=None,
+                    featured_image_url=None, excerpt=None, meta_description=None):
+        with self.lock:
+            self.calls.append((site_id, title, meta_description, tags))
+            flaky = (site_id, title) == self.flaky_item and self.calls.count(self.calls[-1]) == 1
+            self.active[site_id] += 1
+            self.total_active += 1
+            self.max_active[site_id] = max(self.max_active[site_id], self.active[site_id])
+            self.max_total = max(self.max_total, self.total_active)
+        try:
+            time.sleep(0.05)
+            if flaky:
+                raise WordPressTransientError(503, 'Service Unavailable', retry_after=0)
+            if site_id == self.failing_site:
+                raise ValueError("포스트 생성 실패 - 권한 없음")
+            return {'id': len(self.calls), 'link': f'https://example.com/?p={len(self.calls)}'}
+        finally:
+            with self.lock:
+                self.active[site_id] -= 1
+                self.total_active -= 1
+
+
+def test_bulk_publish_schedules_posts_across_sites_with_limits_and_retries(monkeypatch):
+    publisher = FakePublisher(flaky_item=(SITE_IDS[0], '커피 원두 가이드'), failing_site=SITE_IDS[2])
+    monkeypatch.setattr(bulk_publish_service.wordpress, 'create_post', publisher.create_post)
+    monkeypatch.setattr(bulk_publish_service, 'max_workers', 4)
+    monkeypatch.setattr(bulk_publish_service, 'site_concurrency', 2)
+
+    posts = [{'content_id': CONTENT_ID}] + [{'title': f'글 {i}', 'content': f'본문 {i}'} for i in range(4)]
+    res = client.post('/api/wordpress/bulk-publish', headers=HEADERS,
+                      json={'site_ids': SITE_IDS, 'posts': posts, 'status': 'publish'})
+    assert res.status_code == 200
+    assert res.json()['data']['total_items'] == 15
+    job_id = res.json()['data']['job_id']
+
+    data = client.get(f'/api/wordpress/bulk-publish/{job_id}', headers=HEADERS).json()['data']
+    assert data['status'] == 'completed' and data['partial'] is True
+    assert data['progress'] == {'completed': 15, 'total': 15, 'percent': 100.0}
+    assert data['sites'][str(SITE_IDS[0])] == {'success': 5, 'failed': 0, 'pending': 0}
+    assert data['sites'][str(SITE_IDS[2])] == {'success': 0, 'failed': 5, 'pending': 0}
+
+    # 첫 항목은 503 후 재시도로 성공, 저장된 콘텐츠는 제목/메타 설명/태그를 함께 사용
+    first = data['results'][0]
+    assert first['status'] == 'success' and first['attempts'] == 2 and first['post']['id']
+    assert publisher.calls.count((SITE_IDS[0], '커피 원두 가이드', '원두 고르는 법', ['커피'])) == 2
+    assert 'error' in data['results'][2]
+
+    assert max(publisher.max_active.values()) <= 2
+    assert publisher.max_total <= 4
+
+    db = TestingSessionLocal()
+    assert GeneratedContentRepository().get(db, db.query(User).first().id, CONTENT_ID).status == 'published'
+    db.close()
+
+    stream = client.get(f'/api/wordpress/bulk-publish/{job_id}/stream', headers=HEADERS)
+    events = [block.split('\n')[0] for block in stream.text.strip().split('\n\n')]
+    assert events.count('event: item') == 15 and events[-1] == 'event: done'
+
+
+def test_bulk_publish_rejects_unknown_sites_and_empty_posts():
+    res = client.post('/api/wordpress/bulk-publish', headers=HEADERS,
+                      json={'site_ids': [SITE_IDS[0], 9999], 'posts': [{'title': '제목', 'content': '본문'}]})
+    assert res.status_code == 400 and '9999' in res.json()['detail']
+
+    res = client.post('/api/wordpress/bulk-publish', headers=HEADERS,
+                      json={'site_ids': SITE_IDS, 'posts': [{'title': '본문 없음'}]})
+    assert res.status_code == 400
+
+    assert client.get('/api/wordpress/bulk-publish/9999', headers=HEADERS).status_code == 404
+
+
+class LostResponsePublisher:
+    """첫 게시 요청에 502를 돌려주는 사이트 - lost_title은 실제로 만들어진 뒤 응답만 실패"""
+
+    def __init__(self, lost_title, failed_title):
+        self.lost_title = lost_title
+        self.failed_title = failed_title
+        self.lock = threading.Lock()
+        self.posts = []
+        self.calls = []
+
+    def create_post(self, db, user_id, site_id, title, content, status='draft', categories=None, tags=None,
+                    featured_image_url=None, excerpt=None, meta_description=None):
+        with self.lock:
+            self.calls.append((site_id, title))
+            first = self.calls.count((site_id, title)) == 1
+            if first and title == self.failed_title:
+                raise WordPressTransientError(502, 'Bad Gateway', retry_after=0)
+            post = {'id': len(self.posts) + 1, 'title': title, 'link': f'https://example.com/?p={len(self.posts) + 1}',
+                    'status': status, 'date': '2024-01-01T00:00:00', 'site_id': site_id}
+            self.posts.append(post)
+        if first and title == self.lost_title:
+            raise WordPressTransientError(502, 'Bad Gateway', retry_after=0)
+        return post
+
+    def find_recent_post(self, db, user_id, site_id, title, since):
+        with self.lock:
+            return next((p for p in self.posts if (p['site_id'], p['title']) == (site_id, title)), None)
+
+
+def test_bulk_publish_checks_for_created_post_before_retrying_5xx(monkeypatch):
+    publisher = LostResponsePublisher(lost_title='응답 유실', failed_title='게시 실패')
+    monkeypatch.setattr(bulk_publish_service.wordpress, 'create_post', publisher.create_post)
+    monkeypatch.setattr(bulk_publish_service.wordpress, 'find_recent_post', publisher.find_recent_post)
+
+    res = client.post('/api/wordpress/bulk-publish', headers=HEADERS, json={
+        'site_ids': [SITE_IDS[1]],
+        'posts': [{'title': '응답 유실', 'content': '본문'}, {'title': '게시 실패', 'content': '본문'}]
+    })
+    job_id = res.json()['data']['job_id']
+    data = client.get(f'/api/wordpress/bulk-publish/{job_id}', headers=HEADERS).json()['data']
+    lost, failed = data['results']
+
+    # 502 후 포스트가 이미 있으면 다시 보내지 않음
+    assert [p['title'] for p in publisher.posts].count('응답 유실') == 1
+    assert lost['status'] == 'success' and lost['attempts'] == 1
+    assert lost['post']['id'] == next(p['id'] for p in publisher.posts if p['title'] == '응답 유실')
+
+    # 포스트가 없으면 재시도
+    assert [p['title'] for p in publisher.posts].count('게시 실패') == 1
+    assert failed['status'] == 'success' and failed['attempts'] == 2
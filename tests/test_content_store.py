@@ -0,0 +1,118 @@
+from fastapi.testclient import TestClient
+import sys, os, tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'server'))
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.main import app
+from src.db import Base, get_db
+from src.models.generated_content import GeneratedContent
+from src.models.user import User
+from src.services.content_store import GeneratedContentRepository
+from src.utils.jwt_utils import create_access_token
+
+
+def setup_module(module):
+    fd, path = tempfile.mkstemp()
+    os.close(fd)
+    engine = create_engine(
+        f"sqlite:///{path}", connect_args={"check_same_thread": False}
+    )
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    def override_get_db():
+        db = TestingSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    module.TestingSessionLocal = TestingSessionLocal
+
+    db = TestingSessionLocal()
+    owner = User(username='writer', email='writer@example.com', password_hash='x')
+    other = User(username='reader', email='reader@example.com', password_hash='x')
+    db.add_all([owner, other])
+    db.commit()
+    module.OWNER_ID, module.OTHER_ID = owner.id, other.id
+    module.OWNER_HEADERS = {'Authorization': f'Bearer {create_access_token(str(owner.id))}'}
+    module.OTHER_HEADERS = {'Authorization': f'Bearer {create_access_token(str(other.id))}'}
+    db.close()
+    module.TEST_DB_PATH = path
+
+
+def teardown_module(module):
+    app.dependency_overrides.pop(get_db, None)
+    os.unlink(module.TEST_DB_PATH)
+
+client = TestClient(app)
+
+
+def _result(keyword, body='짧은 본문'):
+    return {'title': f'{keyword} 가이드', 'content': body, 'keyword': keyword, 'content_type': 'blog_post',
+            'word_count': len(body.split()), 'content_analysis': {'seo_score': 72}}
+
+
+def test_large_bodies_are_compressed_and_round_trip():
+    store = GeneratedContentRepository(compress_threshold=1024)
+    db = TestingSessionLocal()
+    long_body = '## 섹션\n\n' + '반복되는 긴 본문입니다. ' * 500
+
+    small = store.save(db, OWNER_ID, _result('짧은글'))
+    large = store.save(db, OWNER_ID, _result('긴글', long_body))
+
+    assert small.body_encoding == 'identity'
+    assert large.body_encoding == 'zlib' and len(large.body) < large.body_size / 5
+    assert store.to_detail(large)['content']['content'] == long_body
+    assert large.excerpt.startswith('섹션 반복되는')
+    db.close()
+
+
+def test_keyset_pagination_skips_bodies_and_has_no_gaps():
+    store = GeneratedContentRepository()
+    db = TestingSessionLocal()
+    for i in range(7):
+        store.save(db, OTHER_ID, _result(f'키워드{i}'))
+    db.close()
+
+    db = TestingSessionLocal()
+    seen, cursor = [], None
+    while True:
+        page, cursor = store.list(db, OTHER_ID, limit=3, cursor=cursor)
+        assert all('body' not in record.__dict__ for record in page)
+        seen += [record.keyword for record in page]
+        if not cursor:
+            break
+    assert seen == [f'키워드{i}' for i in reversed(range(7))]
+
+    with pytest.raises(ValueError):
+        store.list(db, OTHER_ID, cursor='not-a-cursor')
+    db.close()
+
+
+def test_generated_content_endpoints():
+    db = TestingSessionLocal()
+    record = GeneratedContentRepository().save(db, OWNER_ID, _result('엔드포인트'))
+    content_id = record.id
+    db.close()
+
+    res = client.get('/api/content/generated?keyword=엔드포인트', headers=OWNER_HEADERS)
+    assert res.status_code == 200
+    items = res.json()['data']['items']
+    assert [item['id'] for item in items] == [content_id]
+    assert 'content' not in items[0]
+
+    assert client.get(f'/api/content/generated/{content_id}', headers=OTHER_HEADERS).status_code == 404
+    detail = client.get(f'/api/content/generated/{content_id}', headers=OWNER_HEADERS).json()['data']
+    assert detail['content']['title'] == '엔드포인트 가이드'
+
+    assert client.patch(f'/api/content/generated/{content_id}', json={'status': 'bogus'},
+                        headers=OWNER_HEADERS).status_code == 400
+    res = client.patch(f'/api/content/generated/{content_id}', json={'status': 'published'}, headers=OWNER_HEADERS)
+    assert res.json()['data']['status'] == 'published'
+
+    assert client.delete(f'/api/content/generated/{content_id}', headers=OWNER_HEADERS).status_code == 200
+    assert client.get(f'/api/content/generated/{content_id}', headers=OWNER_HEADERS).status_code == 404
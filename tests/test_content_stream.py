@@ -0,0 +1,118 @@
+from fastapi.testclient import TestClient
+import sys, os, json, tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'server'))
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.main import app
+from src.db import Base, get_db
+from src.models.user import User
+from src.services.content_generator import AdvancedContentGenerator
+from src.utils.jwt_utils import create_access_token
+
+# setup_module에서 채움
+HEADERS = {}
+
+
+def setup_module(module):
+    fd, path = tempfile.mkstemp()
+    os.close(fd)
+    engine = create_engine(
+        f"sqlite:///{path}", connect_args={"check_same_thread": False}
+    )
+    TestingSessionLocal = sessionmaker(
+        autocommit=False, autoflush=False, bind=engine
+    )
+    Base.metadata.create_all(bind=engine)
+
+    def override_get_db():
+        db = TestingSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+
+    db = TestingSessionLocal()
+    user = User(username='streamer', email='streamer@example.com', password_hash='x')
+    db.add(user)
+    db.commit()
+    module.HEADERS = {'Authorization': f'Bearer {create_access_token(str(user.id))}'}
+    db.close()
+    module.TEST_DB_PATH = path
+
+
+def teardown_module(module):
+    app.dependency_overrides.pop(get_db, None)
+    os.unlink(module.TEST_DB_PATH)
+
+client = TestClient(app)
+
+
+def _events(response):
+    """SSE 본문을 (이벤트 종류, 데이터) 목록으로 분리"""
+    events = []
+    for block in response.text.strip().split('\n\n'):
+        event_line, data_line = block.split('\n')
+        events.append((event_line[len('event: '):], json.loads(data_line[len('data: '):])))
+    return events
+
+
+def _stream(*chunks, error=None):
+    def stream_provider(self, prompt, provider=None):
+        yield from chunks
+        if error:
+            raise error
+    return stream_provider
+
+
+def test_stream_sends_deltas_then_formatted_result(monkeypatch):
+    monkeypatch.setenv('OPENAI_API_KEY', 'sk-test')
+    monkeypatch.setattr(AdvancedContentGenerator, '_stream_provider',
+                        _stream('# 스트림 제목', '\n본문 ', '첫 문단입니다.'))
+
+    res = client.post('/api/content/generate-advanced/stream', headers=HEADERS, json={'keyword': '스트림'})
+    assert res.status_code == 200
+    assert res.headers['content-type'].startswith('text/event-stream')
+
+    events = _events(res)
+    assert [e for e in events if e[0] == 'delta'] == [
+        ('delta', {'content': '# 스트림 제목'}), ('delta', {'content': '\n본문 '}), ('delta', {'content': '첫 문단입니다.'})
+    ]
+    assert [e[0] for e in events] == ['delta', 'delta', 'delta', 'done']
+
+    done = events[-1][1]['data']
+    expected = AdvancedContentGenerator()._format_content_response(
+        '스트림 제목', '본문 첫 문단입니다.', '스트림', 'blog_post', 'professional', 'general'
+    )
+    for key in ('title', 'content', 'keyword', 'meta_tags', 'content_analysis', 'word_count'):
+        assert done[key] == expected[key]
+    assert 'usage' in done and 'demo_mode' not in done
+
+
+def test_stream_error_falls_back_to_demo_content(monkeypatch):
+    monkeypatch.setenv('OPENAI_API_KEY', 'sk-test')
+    monkeypatch.setattr(AdvancedContentGenerator, '_stream_provider',
+                        _stream('# 제목', error=ConnectionError('connection reset')))
+
+    events = _events(client.post('/api/content/generate-advanced/stream', headers=HEADERS,
+                                 json={'keyword': '스트림'}))
+
+    assert [e[0] for e in events] == ['delta', 'error', 'done']
+    assert 'connection reset' in events[1][1]['message']
+    assert events[2][1]['data']['demo_mode'] is True
+
+
+def test_stream_without_llm_returns_demo_done_event(monkeypatch):
+    monkeypatch.delenv('OPENAI_API_KEY', raising=False)
+
+    events = _events(client.post('/api/content/generate-advanced/stream', headers=HEADERS,
+                                 json={'keyword': '데모'}))
+
+    assert [e[0] for e in events] == ['done']
+    assert events[0][1]['data']['demo_mode'] is True
+    assert events[0][1]['data']['keyword'] == '데모'
+
+    res = client.post('/api/content/generate-advanced/stream', headers=HEADERS, json={'keyword': ''})
+    assert res.status_code == 400
@@ -0,0 +1,103 @@
+import sys, os, random, tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'server'))
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.db import Base
+from src.models.user import User
+import src.services.content_generator as content_generator
+import src.services.content_store as content_store_module
+from src.services.content_generator import AdvancedContentGenerator
+from src.services.content_store import GeneratedContentRepository
+from src.services.duplicate_index import DuplicateIndex, hamming_distance, simhash
+
+ARTICLE = '\n\n'.join(
+    f"커피 원두 {i}번째 문단에서는 산지별 특징과 로스팅 단계, 추출 온도 {90 + i % 5}도의 차이를 설명합니다."
+    for i in range(30)
+)
+
+
+def setup_module(module):
+    fd, path = tempfile.mkstemp()
+    os.close(fd)
+    engine = create_engine(
+        f"sqlite:///{path}", connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(bind=engine)
+    module.TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    db = module.TestingSessionLocal()
+    user = User(username='dedup', email='dedup@example.com', password_hash='x')
+    db.add(user)
+    db.commit()
+    module.USER_ID = user.id
+    db.close()
+    module.TEST_DB_PATH = path
+
+
+def teardown_module(module):
+    os.unlink(module.TEST_DB_PATH)
+
+
+@pytest.fixture
+def index(monkeypatch):
+    index = DuplicateIndex(max_distance=4)
+    monkeypatch.setattr(content_store_module, 'duplicate_index', index)
+    monkeypatch.setattr(content_generator, 'duplicate_index', index)
+    return index
+
+
+def test_simhash_is_stable_and_close_for_near_copies():
+    edited = ARTICLE.replace('설명합니다', '소개합니다', 2)
+    assert simhash(ARTICLE) == simhash(ARTICLE)
+    assert hamming_distance(simhash(ARTICLE), simhash(edited)) <= 4
+    assert hamming_distance(simhash(ARTICLE), simhash('녹차 잎을 따는 시기와 덖는 방법')) > 4
+
+
+def test_banded_lookup_finds_every_fingerprint_within_distance(index):
+    db = TestingSessionLocal()
+    store = GeneratedContentRepository()
+    saved = store.save(db, USER_ID, {'keyword': '기준', 'content': ARTICLE})
+    base = simhash(ARTICLE)
+
+    rng = random.Random(7)
+    for distance in range(6):
+        flipped = base
+        for bit in rng.sample(range(64), distance):
+            flipped ^= 1 << bit
+        found = [m['content_id'] for m in index.find(db, USER_ID, flipped)]
+        assert (saved.id in found) == (distance <= 4)
+
+    # 재시작 후에도 DB에 저장된 지문으로 다시 찾음
+    fresh = DuplicateIndex(max_distance=4)
+    assert fresh.find(db, USER_ID, base)[0]['content_id'] == saved.id
+
+    store.delete(db, saved)
+    assert index.find(db, USER_ID, base) == []
+    db.close()
+
+
+def test_generator_flags_or_regenerates_duplicates(index, monkeypatch):
+    db = TestingSessionLocal()
+    GeneratedContentRepository().save(db, USER_ID, {'keyword': '커피', 'content': ARTICLE})
+
+    prompts = []
+
+    def fake_complete(prompt, active_provider=None):
+        prompts.append(prompt.text)
+        return '# 커피 가이드\n' + (ARTICLE if len(prompts) == 1 else '녹차는 전혀 다른 주제의 글입니다.')
+
+    generator = AdvancedContentGenerator(api_key='sk-test', user_id=USER_ID)
+    monkeypatch.setattr(generator, '_complete', fake_complete)
+
+    flagged = generator.generate_seo_optimized_content('커피', db=db)
+    assert flagged['duplicate']['is_duplicate'] is True
+    assert len(prompts) == 1
+
+    prompts.clear()
+    monkeypatch.setattr(index, 'action', 'regenerate')
+    regenerated = generator.generate_seo_optimized_content('커피', db=db)
+    assert len(prompts) == 2 and content_generator.REGENERATE_INSTRUCTION in prompts[1]
+    assert regenerated['duplicate'] == {**regenerated['duplicate'], 'is_duplicate': False, 'regenerated': True}
+    db.close()
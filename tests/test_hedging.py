@@ -0,0 +1,78 @@
+import sys, os, threading, time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'server'))
+import pytest
+
+from src.services.content_generator import AdvancedContentGenerator
+from src.services.hedging import HedgedCompletion, HedgeTimeout
+
+
+def _stream(chunks, first_delay=0.0, closed=None):
+    def factory():
+        def gen():
+            try:
+                time.sleep(first_delay)
+                for chunk in chunks:
+                    yield chunk
+                    time.sleep(0.01)
+            except GeneratorExit:
+                if closed is not None:
+                    closed.set()
+                raise
+        return gen()
+    return factory
+
+
+def test_slow_primary_is_hedged_and_cancelled():
+    closed = threading.Event()
+    hedge = HedgedCompletion(deadline=0.1)
+
+    started = time.monotonic()
+    text, label = hedge.run([
+        ('primary', _stream(['느린 ', '응답'], first_delay=0.5, closed=closed)),
+        ('secondary', _stream(['빠른 ', '응답'])),
+    ])
+
+    assert (text, label) == ('빠른 응답', 'secondary')
+    assert time.monotonic() - started < 0.4
+    # 진 쪽은 다음 청크를 받으면서 닫힘
+    assert closed.wait(1)
+
+
+def test_primary_within_deadline_is_not_hedged():
+    launched = []
+
+    def tracking(name, chunks):
+        factory = _stream(chunks)
+        return name, lambda: (launched.append(name), factory())[1]
+
+    hedge = HedgedCompletion(deadline=0.5)
+    text, label = hedge.run([tracking('primary', ['a', 'b']), tracking('secondary', ['c'])])
+
+    assert (text, label) == ('ab', 'primary')
+    assert launched == ['primary']
+
+
+def test_failed_primary_falls_over_and_deadline_gives_up():
+    def broken():
+        raise ConnectionError('refused')
+
+    hedge = HedgedCompletion(deadline=5)
+    assert hedge.run([('primary', broken), ('secondary', _stream(['ok']))]) == ('ok', 'secondary')
+
+    with pytest.raises(HedgeTimeout):
+        HedgedCompletion(deadline=0.1, demo_fallback=True).run([('only', _stream(['x'], first_delay=0.5))])
+
+
+def test_generation_hedges_only_when_requested(monkeypatch):
+    generator = AdvancedContentGenerator(api_key='sk-test')
+    calls = []
+    monkeypatch.setattr(generator, '_complete_hedged',
+                        lambda prompt, providers: (calls.append('hedged') or '# 헤지\n본문', None))
+    monkeypatch.setattr(generator, '_complete_routed',
+                        lambda prompt, providers: (calls.append('routed') or '# 라우팅\n본문', None))
+
+    # 일괄 작업 등 기본 호출은 헤지하지 않음
+    generator.generate_seo_optimized_content('헤지')
+    generator.generate_seo_optimized_content('헤지', hedge=True)
+
+    assert calls == ['routed', 'hedged']
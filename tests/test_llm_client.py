@@ -0,0 +1,114 @@
+import sys, os, asyncio, time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'server'))
+import httpx
+
+from src.services.llm_client import AsyncLLMClient, get_ollama_base_url
+from src.services.llm_client_registry import LLMClientRegistry
+from src.services.provider_cache import ProviderConfig
+from src.services.provider_router import ProviderRouter
+
+
+async def _slow_ollama(request):
+    await asyncio.sleep(0.2)
+    return httpx.Response(200, json={'response': f'ok {request.url.path}'})
+
+
+def test_ollama_base_url():
+    assert get_ollama_base_url('http://host:11434/api/generate') == 'http://host:11434'
+    assert get_ollama_base_url('http://host:11434/') == 'http://host:11434'
+    assert get_ollama_base_url(None) == 'http://localhost:11434'
+
+
+def test_concurrent_chat_does_not_block():
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(_slow_ollama)) as http:
+            client = AsyncLLMClient(http_client=http)
+            started = time.monotonic()
+            results = await asyncio.gather(*[
+                client.chat('ollama', 'Hello', 'llama3.1:latest', base_url='http://fake:11434')
+                for _ in range(5)
+            ])
+            return results, time.monotonic() - started
+
+    results, elapsed = asyncio.run(run())
+    assert results == ['ok /api/generate'] * 5
+    assert elapsed < 0.6
+
+
+def test_client_registry_reuses_and_evicts():
+    registry = LLMClientRegistry(max_size=2, idle_ttl=600)
+    first = registry.get_openai_client('sk-one')
+    assert registry.get_openai_client('sk-one') is first
+    assert registry.get_openai_client('sk-one', base_url='http://other/v1') is not first
+
+    registry.get_openai_client('sk-two')
+    assert len(registry) == 2
+    assert registry.get_openai_client('sk-one') is not first
+    assert all('sk-one' not in key for key in registry._entries)
+
+
+def test_client_registry_idle_expiry():
+    registry = LLMClientRegistry(max_size=4, idle_ttl=0)
+    first = registry.get_openai_client('sk-one')
+    assert registry.get_openai_client('sk-one') is not first
+    assert len(registry) == 1
+
+
+def test_client_registry_defers_closing_evicted_clients():
+    registry = LLMClientRegistry(max_size=1, idle_ttl=600, close_grace=600)
+    first = registry.get_openai_client('sk-one')
+    registry.get_openai_client('sk-two')
+    # 다른 스레드가 아직 요청 중일 수 있으므로 목록에서 빠져도 바로 닫지 않음
+    assert not first._client.is_closed
+
+    registry.close_grace = 0
+    registry.get_openai_client('sk-two')
+    assert first._client.is_closed
+
+
+def test_async_clients_follow_the_shared_http_pool():
+    registry = LLMClientRegistry()
+    http, other = httpx.AsyncClient(), httpx.AsyncClient()
+    client = registry.get_async_openai_client('sk-one', http)
+    assert registry.get_async_openai_client('sk-one', http) is client
+    assert registry.get_async_openai_client('sk-one', other) is not client
+
+    registry.clear()
+    assert not http.is_closed and not other.is_closed
+
+
+def _provider(id, provider_type='ollama', is_active=False):
+    return ProviderConfig(id=id, name=f'p{id}', provider_type=provider_type, model_name='m',
+                          base_url=f'http://host{id}:11434', is_active=is_active)
+
+
+def test_router_fails_over_and_opens_circuit():
+    router = ProviderRouter(weights={'ollama': 1}, failure_threshold=2, cooldown=60)
+    broken, healthy = _provider(1, is_active=True), _provider(2)
+    calls = []
+
+    def fn(provider):
+        calls.append(provider.id)
+        if provider is broken:
+            raise ConnectionError('down')
+        return 'ok'
+
+    for _ in range(3):
+        assert router.call([broken, healthy], fn) == ('ok', healthy)
+
+    assert calls == [1, 2, 1, 2, 2]
+    assert [p.id for p in router.order([broken, healthy])] == [2]
+
+
+def test_router_keeps_active_primary_until_saturated():
+    router = ProviderRouter(weights={'openai': 4, 'ollama': 1})
+    active, other = _provider(1, is_active=True), _provider(2)
+    openai = _provider(3, provider_type='openai')
+
+    # 유휴 상태인 가중치 높은 제공자가 있어도 활성 제공자가 기본
+    assert router.order([openai, active])[0] is active
+    with router.track(active):
+        # 활성 제공자가 가중치만큼 요청을 받으면 나머지는 (진행 중 요청 / 가중치) 순
+        assert router.order([active, other, openai])[:2] == [openai, other]
+        with router.track(openai), router.track(openai), router.track(openai):
+            assert router.order([active, other, openai])[0] is other
@@ -0,0 +1,140 @@
+from fastapi.testclient import TestClient
+import sys, os, tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'server'))
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.main import app
+from src.db import Base, get_db
+from src.models.user import User
+from src.services.content_generator import AdvancedContentGenerator
+from src.services.llm_telemetry import TokenBudgetExceeded, llm_telemetry, percentile
+from src.utils.jwt_utils import create_access_token
+
+
+def setup_module(module):
+    fd, path = tempfile.mkstemp()
+    os.close(fd)
+    engine = create_engine(
+        f"sqlite:///{path}", connect_args={"check_same_thread": False}
+    )
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    def override_get_db():
+        db = TestingSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    module.previous_session_factory = llm_telemetry.session_factory
+    llm_telemetry.session_factory = TestingSessionLocal
+    module.TestingSessionLocal = TestingSessionLocal
+
+    db = TestingSessionLocal()
+    admin = User(username='opsadmin', email='ops@example.com', password_hash='x')
+    member = User(username='member', email='member@example.com', password_hash='x')
+    db.add_all([admin, member])
+    db.commit()
+    module.ADMIN_HEADERS = {'Authorization': f'Bearer {create_access_token(str(admin.id))}'}
+    module.MEMBER_HEADERS = {'Authorization': f'Bearer {create_access_token(str(member.id))}'}
+    module.MEMBER_ID = member.id
+    db.close()
+    module.TEST_DB_PATH = path
+
+
+def teardown_module(module):
+    llm_telemetry.session_factory = module.previous_session_factory
+    app.dependency_overrides.pop(get_db, None)
+    os.unlink(module.TEST_DB_PATH)
+
+client = TestClient(app)
+
+
+def test_percentile_nearest_rank():
+    assert percentile([10, 20, 30, 40], 50) == 20
+    assert percentile([10, 20, 30, 40], 95) == 40
+    assert percentile([], 95) is None
+
+
+def test_track_records_usage_and_errors():
+    with llm_telemetry.track('openai', 'gpt-4o-mini', operation='content', user_id=MEMBER_ID) as trace:
+        trace.first_token()
+        trace.set_usage(120, 380)
+
+    with pytest.raises(ConnectionError):
+        with llm_telemetry.track('ollama', 'llama3', user_id=MEMBER_ID):
+            raise ConnectionError('down')
+
+    llm_telemetry.flush()
+    groups = {g['provider_type']: g for g in llm_telemetry.summarize(TestingSessionLocal(), group_by='provider_type')}
+
+    assert groups['openai']['prompt_tokens'] == 120
+    assert groups['openai']['completion_tokens'] == 380
+    assert groups['openai']['ttft_ms']['p50'] is not None
+    assert groups['ollama']['errors'] == 1
+    assert groups['ollama']['error_rate'] == 1.0
+
+
+def test_token_budget_blocks_generation(monkeypatch):
+    with llm_telemetry.track('openai', 'gpt-4o-mini', user_id=MEMBER_ID) as trace:
+        trace.set_usage(400000, 200000)
+    llm_telemetry.flush()
+
+    db = TestingSessionLocal()
+    generator = AdvancedContentGenerator(api_key='sk-test', user_id=MEMBER_ID)
+    monkeypatch.setattr(generator, '_complete', lambda prompt, active_provider=None: '# 제목\n본문')
+    with pytest.raises(TokenBudgetExceeded):
+        generator.generate_seo_optimized_content('예산', db=db)
+
+    usage = db.get(User, MEMBER_ID).check_monthly_usage(llm_telemetry.monthly_tokens(db, db.get(User, MEMBER_ID)))
+    assert usage['tokens']['remaining'] == 0
+    db.close()
+
+
+def test_admin_usage_endpoint(monkeypatch):
+    monkeypatch.setenv('ADMIN_USERNAMES', 'opsadmin')
+
+    assert client.get('/api/admin/llm-usage', headers=MEMBER_HEADERS).status_code == 403
+    assert client.get('/api/admin/llm-usage?group_by=password', headers=ADMIN_HEADERS).status_code == 400
+
+    res = client.get('/api/admin/llm-usage?group_by=model_name', headers=ADMIN_HEADERS)
+    assert res.status_code == 200
+    models = {g['model_name'] for g in res.json()['data']['groups']}
+    assert {'gpt-4o-mini', 'llama3'} <= models
+
+
+def test_static_prompt_prefix_and_cached_tokens(monkeypatch):
+    from types import SimpleNamespace
+    import src.services.content_generator as content_generator
+
+    calls = []
+
+    def create(**kwargs):
+        calls.append(kwargs['messages'])
+        usage = SimpleNamespace(prompt_tokens=1500, completion_tokens=300,
+                                prompt_tokens_details=SimpleNamespace(cached_tokens=1280 if len(calls) > 1 else 0))
+        message = SimpleNamespace(content='# 제목\n본문')
+        response = SimpleNamespace(usage=usage, choices=[SimpleNamespace(message=message)])
+        return SimpleNamespace(headers={}, parse=lambda: response)
+
+    fake = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(
+        with_raw_response=SimpleNamespace(create=create))))
+    monkeypatch.setattr(content_generator.client_registry, 'get_openai_client', lambda api_key, **kw: fake)
+
+    generator = AdvancedContentGenerator(api_key='sk-test')
+    generator.generate_seo_optimized_content('커피', 'how_to_guide', cache_mode='bypass')
+    result = generator.generate_seo_optimized_content('녹차', 'how_to_guide', cache_mode='bypass')
+
+    # 키워드가 달라도 system 메시지(고정 지침)는 동일하고, 키워드는 user 메시지에만 포함
+    assert calls[0][0] == calls[1][0]
+    assert '커피' not in calls[0][0]['content'] and '커피' in calls[0][1]['content']
+    assert result['usage']['cached_tokens'] == 1280
+    assert result['usage']['cache_hit_ratio'] == round(1280 / 1500, 4)
+
+    llm_telemetry.flush()
+    groups = {g['model_name']: g for g in llm_telemetry.summarize(TestingSessionLocal(), group_by='model_name')}
+    assert groups['gpt-3.5-turbo']['cached_tokens'] == 1280
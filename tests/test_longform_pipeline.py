@@ -0,0 +1,70 @@
+import sys, os, threading, time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'server'))
+import pytest
+
+from src.services.content_generator import AdvancedContentGenerator
+from src.services.longform_pipeline import SectionedContentPipeline
+
+OUTLINE = "# 커피 추출 가이드\n## 원두 고르기\n## 분쇄도\n## 추출 시간"
+
+
+def _fake_complete(failures=None, delay=0.2):
+    failures = dict(failures or {})
+    lock = threading.Lock()
+
+    def complete(prompt):
+        prompt = getattr(prompt, 'text', prompt)
+        if '개요' in prompt and '전체 개요' not in prompt:
+            return OUTLINE
+        section = prompt.split('번 섹션 "')[1].split('"')[0]
+        with lock:
+            if failures.get(section):
+                failures[section] -= 1
+                raise ConnectionError('timeout')
+        time.sleep(delay)
+        return f"## {section}\n\n{section}에 대한 본문입니다.\n\n공통 문단입니다."
+
+    return complete
+
+
+def test_sections_run_concurrently_and_are_deduplicated():
+    pipeline = SectionedContentPipeline(max_workers=4)
+
+    started = time.monotonic()
+    result = pipeline.run('커피', 'blog_post', 'casual', 'general', _fake_complete())
+    elapsed = time.monotonic() - started
+
+    assert elapsed < 0.5
+    assert result['content'].startswith('# 커피 추출 가이드\n\n## 원두 고르기\n\n원두 고르기에 대한 본문입니다.')
+    assert result['content'].count('## 분쇄도') == 1
+    assert result['content'].count('공통 문단입니다.') == 1
+    assert result['failed_sections'] == 0
+
+
+def test_failed_section_is_retried_on_its_own():
+    pipeline = SectionedContentPipeline(section_retries=1)
+    complete = _fake_complete(failures={'분쇄도': 1, '추출 시간': 5}, delay=0)
+
+    result = pipeline.run('커피', 'blog_post', 'casual', 'general', complete)
+
+    statuses = {s['heading']: (s['status'], s['attempts']) for s in result['sections']}
+    assert statuses == {'원두 고르기': ('success', 1), '분쇄도': ('success', 2), '추출 시간': ('failed', 2)}
+    assert '## 추출 시간' not in result['content']
+    assert result['failed_sections'] == 1
+
+
+def test_parse_outline_rejects_unstructured_text():
+    with pytest.raises(ValueError):
+        SectionedContentPipeline().parse_outline('그냥 한 문단의 글')
+
+
+def test_generator_long_form(monkeypatch):
+    generator = AdvancedContentGenerator(api_key='sk-test')
+    complete = _fake_complete(delay=0)
+    monkeypatch.setattr(generator, '_complete', lambda prompt, active_provider=None: complete(prompt))
+
+    result = generator.generate_seo_optimized_content('커피', long_form=True)
+
+    assert result['title'] == '커피 추출 가이드'
+    assert result['pipeline']['mode'] == 'sectioned'
+    assert len(result['pipeline']['sections']) == 3
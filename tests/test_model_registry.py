@@ -0,0 +1,58 @@
+import sys, os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'server'))
+import pytest
+
+import src.services.content_generator as content_generator
+from src.services.content_generator import AdvancedContentGenerator
+from src.services.model_registry import TRIM_MARKER, ModelRegistry
+from src.services.provider_cache import ProviderConfig
+
+
+def test_spec_lookup_uses_longest_prefix_and_ollama_context():
+    registry = ModelRegistry(ollama_num_ctx=8192)
+
+    assert registry.get('gpt-4o-mini-2024-07-18', 'openai').max_output_tokens == 16384
+    assert registry.get('gpt-4-turbo-preview', 'openai').context_window == 128000
+    assert registry.get('gpt-4', 'openai').context_window == 8192
+    # Ollama는 모델 한도보다 작은 num_ctx로 실행
+    assert registry.get('llama3.1:8b', 'ollama').context_window == 8192
+    assert registry.get('llama2:7b', 'ollama').context_window == 4096
+    assert registry.get('unknown-model', 'ollama').context_window == 4096
+
+
+def test_plan_caps_max_tokens_and_trims_oversized_input():
+    registry = ModelRegistry(target_output_tokens=4096, ollama_num_ctx=2048)
+    system = '고정 지침입니다. ' * 20
+    user = '- 메인 키워드: 커피\n- 추가 지시사항: ' + '아주 긴 지시사항 ' * 2000
+
+    plan = registry.plan('llama3', 'ollama', system, user)
+    assert plan.trimmed and plan.user.startswith('- 메인 키워드: 커피') and plan.user.endswith(TRIM_MARKER)
+    assert plan.prompt_tokens + plan.max_tokens <= 2048
+    assert plan.max_tokens >= 1024
+    assert registry.ollama_options(plan) == {'num_ctx': 2048, 'num_predict': plan.max_tokens}
+
+    short = registry.plan('gpt-4o', 'openai', system, '짧은 요청')
+    assert not short.trimmed and short.max_tokens == 4096
+
+    with pytest.raises(ValueError):
+        registry.plan('llama3', 'ollama', '넘치는 고정 지침 ' * 3000, '요청')
+
+
+def test_ollama_generation_sends_num_ctx_and_trimmed_prompt(monkeypatch):
+    sent = {}
+
+    def fake_generate(prompt, model, base_url, system_prompt=None, stats=None, format=None, options=None):
+        sent.update(prompt=prompt, options=options)
+        return '# 제목\n본문'
+
+    monkeypatch.setattr(content_generator.ollama_backend, 'generate', fake_generate)
+    monkeypatch.setattr(content_generator.llm_telemetry, 'enabled', False)
+    provider = ProviderConfig(id=1, name='local', provider_type='ollama', model_name='llama3:8b',
+                              api_key=None, base_url=None, is_active=True)
+
+    generator = AdvancedContentGenerator()
+    generator._complete(generator._build_prompt('커피', 'blog_post', 'professional', 'general',
+                                                custom_instructions='긴 지시 ' * 20000), provider)
+
+    assert sent['options']['num_ctx'] == content_generator.model_registry.get('llama3', 'ollama').context_window
+    assert sent['prompt'].endswith(TRIM_MARKER)
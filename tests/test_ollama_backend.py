@@ -0,0 +1,102 @@
+import sys, os, asyncio, json, threading
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'server'))
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+from src.services.llm_client import AsyncLLMClient
+from src.services.model_registry import model_registry
+from src.services.ollama_backend import OllamaBackend
+
+
+class FakeOllamaHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        self.server.requests.append(body)
+        self.server.client_ports.add(self.client_address[1])
+
+        if 'prompt' not in body:
+            # 빈 프롬프트 요청은 모델 적재만 수행
+            payload = json.dumps({'model': body['model'], 'response': '', 'done': True}).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        for token in ['# 제목', '\n', '본문']:
+            self._write_chunk(json.dumps({'response': token, 'done': False}) + '\n')
+        self._write_chunk(json.dumps({'response': '', 'done': True}) + '\n')
+        self.wfile.write(b'0\r\n\r\n')
+
+    def _write_chunk(self, text):
+        data = text.encode()
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b'\r\n')
+        self.wfile.flush()
+
+    def log_message(self, *args):
+        pass
+
+
+def setup_module(module):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeOllamaHandler)
+    server.requests = []
+    server.client_ports = set()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    module.server = server
+    module.BASE_URL = f"http://127.0.0.1:{server.server_address[1]}/api/generate"
+
+
+def teardown_module(module):
+    module.server.shutdown()
+
+
+def setup_function(function):
+    server.requests.clear()
+    server.client_ports.clear()
+
+
+def test_generate_streams_with_keep_alive_over_pooled_session():
+    backend = OllamaBackend(keep_alive='1h')
+
+    assert backend.generate('프롬프트', 'llama3', BASE_URL) == '# 제목\n본문'
+    assert list(backend.stream('프롬프트', 'llama3', BASE_URL)) == ['# 제목', '\n', '본문']
+
+    assert [r['keep_alive'] for r in server.requests] == ['1h', '1h']
+    assert all(r['stream'] for r in server.requests)
+    assert len(server.client_ports) == 1
+    assert backend.is_warm('llama3', BASE_URL)
+    backend.close()
+
+
+def test_warm_up_loads_model_without_prompt():
+    backend = OllamaBackend(keep_alive='30m')
+
+    assert backend.warm_up('qwen3', BASE_URL)
+    num_ctx = model_registry.get('qwen3', 'ollama').context_window
+    assert server.requests == [{'model': 'qwen3', 'keep_alive': '30m', 'stream': False,
+                                'options': {'num_ctx': num_ctx}}]
+    assert backend.is_warm('qwen3', BASE_URL)
+    assert not backend.warm_up('qwen3', 'http://127.0.0.1:1')
+    backend.close()
+
+
+def test_async_client_reads_ndjson_stream():
+    async def run():
+        async with httpx.AsyncClient() as http:
+            client = AsyncLLMClient(http_client=http)
+            await client.warm_up_ollama('llama3', BASE_URL)
+            return await client.chat('ollama', '프롬프트', 'llama3', base_url=BASE_URL)
+
+    assert asyncio.run(run()) == '# 제목\n본문'
+    assert 'prompt' not in server.requests[0]
+    # 예열과 생성이 같은 컨텍스트 크기를 써야 모델을 다시 적재하지 않음
+    assert server.requests[0]['options']['num_ctx'] == server.requests[1]['options']['num_ctx']
+    assert server.requests[1]['keep_alive']
@@ -0,0 +1,118 @@
+import sys, os, tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'server'))
+import pytest
+from types import SimpleNamespace
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.db import Base
+from src.models.prompt_template import PromptTemplate
+from src.models.user import User
+from src.services.prompt_templates import PromptTemplateRegistry
+
+USER_TEMPLATE = """{% block prefix %}리뷰 전문가로서 {{ tone_option.name }} 톤으로 작성{% endblock %}
+{% block request %}키워드: {{ keyword }}{% endblock %}"""
+
+
+def setup_module(module):
+    fd, path = tempfile.mkstemp()
+    os.close(fd)
+    engine = create_engine(
+        f"sqlite:///{path}", connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(bind=engine)
+    module.TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    module.TEST_DB_PATH = path
+
+
+def teardown_module(module):
+    os.unlink(module.TEST_DB_PATH)
+
+
+def test_builtin_template_uses_metadata_and_caches_prefix():
+    registry = PromptTemplateRegistry()
+
+    first = registry.render('커피', 'how_to_guide', 'casual', 'beginners', ['원두'])
+    second = registry.render('녹차', 'how_to_guide', 'casual', 'beginners')
+
+    assert '도입부 → 단계별 설명 → 팁 → 결론' in first.prefix
+    assert '편안하고 친근한 어조' in first.prefix
+    assert '용어를 풀어 쓰고' in first.prefix
+    assert '커피' not in first.prefix and '메인 키워드: 커피' in first.request
+    assert first.prefix is second.prefix
+    assert first.template_id == 'ko/seo_content.j2'
+
+
+def test_unknown_locale_and_type_fall_back_to_default_template():
+    rendered = PromptTemplateRegistry().render('커피', '../secret', locale='../../etc')
+    assert rendered.template_id == 'ko/seo_content.j2'
+
+
+def test_validate_rejects_bad_templates():
+    registry = PromptTemplateRegistry()
+    registry.validate(USER_TEMPLATE)
+
+    for source in ['{% block request %}{{ keyword }', '{% block prefix %}x{% endblock %}',
+                   '{% block prefix %}{{ keyword }}{% endblock %}{% block request %}x{% endblock %}',
+                   "{% block request %}{{ ''.__class__.__mro__ }}{% endblock %}"]:
+        with pytest.raises(ValueError):
+            registry.validate(source)
+
+
+def test_user_template_overrides_builtin_until_invalidated():
+    registry = PromptTemplateRegistry()
+    db = TestingSessionLocal()
+    user = User(username='templater', email='templater@example.com', password_hash='x')
+    db.add(user)
+    db.commit()
+
+    assert registry.render('노트북', 'product_review', db=db, user_id=user.id).template_id == 'ko/seo_content.j2'
+
+    template = PromptTemplate(user_id=user.id, name='리뷰', content_type='product_review', source=USER_TEMPLATE)
+    db.add(template)
+    db.commit()
+    registry.invalidate_user(user.id)
+
+    rendered = registry.render('노트북', 'product_review', 'friendly', db=db, user_id=user.id)
+    assert rendered.template_id == f'user:{template.id}'
+    assert rendered.text == '리뷰 전문가로서 친근한 톤으로 작성\n\n키워드: 노트북'
+    assert registry.render('노트북', 'blog_post', db=db, user_id=user.id).template_id == 'ko/seo_content.j2'
+    db.close()
+
+
+def test_compiled_user_templates_keep_latest_version_within_limit():
+    registry = PromptTemplateRegistry(compiled_user_template_size=2)
+
+    def snapshot(template_id, version):
+        return SimpleNamespace(id=template_id, version=version, source=USER_TEMPLATE)
+
+    first = registry._user_template(snapshot(1, 'v1'))
+    assert registry._user_template(snapshot(1, 'v1')) is first
+
+    # 수정된 버전은 이전 버전을 대체
+    assert registry._user_template(snapshot(1, 'v2')) is not first
+    assert list(registry._compiled_user) == [1] and registry._compiled_user[1][0] == 'v2'
+
+    registry._user_template(snapshot(2, 'v1'))
+    registry._user_template(snapshot(1, 'v2'))
+    registry._user_template(snapshot(3, 'v1'))
+    assert list(registry._compiled_user) == [1, 3]
+
+
+def test_user_template_edits_within_one_second_are_picked_up():
+    registry = PromptTemplateRegistry()
+    db = TestingSessionLocal()
+    user = User(username='quickedit', email='quickedit@example.com', password_hash='x')
+    db.add(user)
+    db.commit()
+    template = PromptTemplate(user_id=user.id, name='빠른 수정', content_type='listicle', source=USER_TEMPLATE)
+    db.add(template)
+    db.commit()
+
+    assert registry.render('커피', 'listicle', db=db, user_id=user.id).prefix.startswith('리뷰 전문가')
+
+    template.source = USER_TEMPLATE.replace('리뷰 전문가', '목록 전문가')
+    db.commit()
+    registry.invalidate_user(user.id)
+    assert registry.render('커피', 'listicle', db=db, user_id=user.id).prefix.startswith('목록 전문가')
+    db.close()
@@ -0,0 +1,150 @@
+from fastapi.testclient import TestClient
+import sys, os, tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'server'))
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.orm import sessionmaker
+
+from src.main import app
+from src.db import Base, add_missing_columns, get_db
+from src.models.llm_provider import LLMProvider
+from src.models.user import User
+from src.services.content_generator import AdvancedContentGenerator
+from src.services.hedging import hedged_completion
+from src.services.ollama_backend import ollama_backend
+from src.services.provider_cache import provider_cache
+from src.utils.jwt_utils import create_access_token
+
+# setup_module에서 채움
+TestingSessionLocal = None
+USER_ID = OLLAMA_ID = None
+HEADERS = {}
+PROVIDER_QUERIES = []
+
+
+def setup_module(module):
+    fd, path = tempfile.mkstemp()
+    os.close(fd)
+    engine = create_engine(
+        f"sqlite:///{path}", connect_args={"check_same_thread": False}
+    )
+    TestingSessionLocal = sessionmaker(
+        autocommit=False, autoflush=False, bind=engine
+    )
+    Base.metadata.create_all(bind=engine)
+
+    def override_get_db():
+        db = TestingSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+
+    # llm_providers 테이블을 읽는 쿼리만 기록
+    module.PROVIDER_QUERIES = []
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if 'FROM llm_providers' in statement and statement.lstrip().upper().startswith('SELECT'):
+            module.PROVIDER_QUERIES.append(statement)
+
+    db = TestingSessionLocal()
+    user = User(username='providers', email='providers@example.com', password_hash='x')
+    db.add(user)
+    db.commit()
+    openai_provider = LLMProvider(user_id=user.id, name='OpenAI', provider_type='openai', api_key='sk-test',
+                                  model_name='gpt-4o-mini', is_active=True)
+    ollama_provider = LLMProvider(user_id=user.id, name='로컬', provider_type='ollama',
+                                  base_url='http://localhost:11434', model_name='llama3')
+    db.add_all([openai_provider, ollama_provider])
+    db.commit()
+    module.USER_ID = user.id
+    module.OLLAMA_ID = ollama_provider.id
+    module.HEADERS = {'Authorization': f'Bearer {create_access_token(str(user.id))}'}
+    db.close()
+    module.TestingSessionLocal = TestingSessionLocal
+    module.TEST_DB_PATH = path
+
+
+def teardown_module(module):
+    provider_cache.invalidate(module.USER_ID)
+    app.dependency_overrides.pop(get_db, None)
+    os.unlink(module.TEST_DB_PATH)
+
+client = TestClient(app)
+
+
+def test_generations_read_providers_from_cache(monkeypatch):
+    monkeypatch.setattr(hedged_completion, 'deadline', 0)
+    provider_cache.invalidate(USER_ID)
+    db = TestingSessionLocal()
+    generator = AdvancedContentGenerator(user_id=USER_ID)
+    monkeypatch.setattr(generator, '_complete', lambda prompt, active_provider=None: '# 캐시 제목\n본문')
+
+    PROVIDER_QUERIES.clear()
+    generator.generate_seo_optimized_content('첫 생성', db=db)
+    assert len(PROVIDER_QUERIES) == 1
+
+    # 캐시가 채워진 뒤에는 제공자 조회 쿼리가 없음
+    PROVIDER_QUERIES.clear()
+    first = generator.generate_seo_optimized_content('두 번째', db=db)
+    second = generator.generate_seo_optimized_content('세 번째', db=db)
+    db.close()
+
+    assert PROVIDER_QUERIES == []
+    assert first['llm_provider']['provider_type'] == second['llm_provider']['provider_type'] == 'openai'
+
+
+def test_inactive_providers_are_routed_only_when_enabled():
+    db = TestingSessionLocal()
+    generator = AdvancedContentGenerator(user_id=USER_ID)
+    provider_cache.invalidate(USER_ID)
+    assert [p.provider_type for p in generator._get_routable_providers(db)] == ['openai']
+
+    db.query(LLMProvider).filter(LLMProvider.id == OLLAMA_ID).update({'use_for_routing': True})
+    db.commit()
+    provider_cache.invalidate(USER_ID)
+    routable = generator._get_routable_providers(db)
+
+    db.query(LLMProvider).filter(LLMProvider.id == OLLAMA_ID).update({'use_for_routing': False})
+    db.commit()
+    provider_cache.invalidate(USER_ID)
+    db.close()
+    assert [p.provider_type for p in routable] == ['openai', 'ollama']
+
+
+def test_add_missing_columns_upgrades_existing_table():
+    fd, path = tempfile.mkstemp()
+    os.close(fd)
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE llm_providers (id INTEGER PRIMARY KEY, user_id INTEGER, name VARCHAR(100), "
+                          "provider_type VARCHAR(50), model_name VARCHAR(100), is_active BOOLEAN)"))
+        conn.execute(text("INSERT INTO llm_providers VALUES (1, 1, 'old', 'openai', 'gpt-4o', 0)"))
+
+    add_missing_columns(engine)
+    add_missing_columns(engine)
+
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT use_for_routing FROM llm_providers")).scalar() == 0
+    assert 'use_for_routing' in {c['name'] for c in inspect(engine).get_columns('llm_providers')}
+    engine.dispose()
+    os.unlink(path)
+
+
+def test_toggle_active_is_visible_immediately(monkeypatch):
+    monkeypatch.setattr(ollama_backend, 'warm_up_in_background', lambda model, base_url: False)
+    monkeypatch.setattr(provider_cache, 'ttl', 3600)
+    db = TestingSessionLocal()
+    assert provider_cache.get_active(db, USER_ID).provider_type == 'openai'
+
+    res = client.put(f'/api/llm/providers/{OLLAMA_ID}/toggle-active', headers=HEADERS)
+    assert res.status_code == 200
+
+    # TTL이 남아 있어도 변경 즉시 무효화되어 새 활성 제공자를 읽음
+    PROVIDER_QUERIES.clear()
+    active = provider_cache.get_active(db, USER_ID)
+    db.close()
+    assert active.id == OLLAMA_ID and active.provider_type == 'ollama'
+    assert len(PROVIDER_QUERIES) == 1
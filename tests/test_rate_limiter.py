@@ -0,0 +1,54 @@
+import sys, os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'server'))
+import httpx
+import pytest
+from openai import RateLimitError
+
+from src.services.rate_limiter import OpenAIRateLimiter, TokenBucket, parse_reset_duration
+
+
+def _rate_limit_error(headers):
+    request = httpx.Request('POST', 'https://api.openai.com/v1/chat/completions')
+    response = httpx.Response(429, headers=headers, request=request)
+    return RateLimitError('rate limited', response=response, body=None)
+
+
+def test_parse_reset_duration():
+    assert parse_reset_duration('6m0s') == 360
+    assert parse_reset_duration('20ms') == pytest.approx(0.02)
+    assert parse_reset_duration('2') == 2
+    assert parse_reset_duration(None) is None
+
+
+def test_token_bucket_waits_for_refill():
+    bucket = TokenBucket(capacity=60, per_minute=60)
+    assert bucket.reserve(60, now=bucket.updated) == 0
+    assert bucket.reserve(2, now=bucket.updated) == pytest.approx(2)
+
+    bucket.sync(limit=None, remaining=0, reset=5, now=bucket.updated)
+    assert bucket.reserve(0, now=bucket.updated) == pytest.approx(5)
+
+
+def test_retry_after_header_blocks_key_and_retries():
+    limiter = OpenAIRateLimiter(rpm=1000, tpm=100000, max_retries=2)
+    attempts = []
+
+    def fn():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise _rate_limit_error({'retry-after-ms': '10'})
+        return 'ok'
+
+    assert limiter.call('sk-test', 10, fn) == 'ok'
+    assert len(attempts) == 2
+    assert limiter.reserve('sk-other', 10) == 0
+
+
+def test_gives_up_after_max_retries():
+    limiter = OpenAIRateLimiter(max_retries=1)
+
+    def fn():
+        raise _rate_limit_error({'retry-after': '0'})
+
+    with pytest.raises(RateLimitError):
+        limiter.call('sk-test', 10, fn)
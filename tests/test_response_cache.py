@@ -0,0 +1,140 @@
+import sys, os, tempfile, time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'server'))
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.db import Base
+from src.services import content_generator as content_generator_module
+from src.services.content_generator import AdvancedContentGenerator
+from src.services.hedging import hedged_completion
+from src.services.provider_cache import ProviderConfig
+from src.services.provider_router import ProviderRouter
+from src.services.response_cache import LLMResponseCache, MemoryCacheTier, SQLCacheTier, response_cache
+
+
+def setup_module(module):
+    fd, path = tempfile.mkstemp()
+    os.close(fd)
+    engine = create_engine(
+        f"sqlite:///{path}", connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(bind=engine)
+    module.TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    module.TEST_DB_PATH = path
+
+
+def teardown_module(module):
+    os.unlink(module.TEST_DB_PATH)
+
+
+def test_memory_tier_lru_and_ttl():
+    tier = MemoryCacheTier(max_entries=2, ttl=60)
+    tier.set('a', '1')
+    tier.set('b', '2')
+    tier.get('a')
+    tier.set('c', '3')
+    assert tier.get('b') is None
+    assert tier.get('a') == '1'
+
+    expiring = MemoryCacheTier(ttl=0)
+    expiring.set('a', '1')
+    assert expiring.get('a') is None
+
+
+def test_persistent_tier_survives_new_cache_instance():
+    key = LLMResponseCache.make_key('prompt', 'openai', 'gpt-4')
+    LLMResponseCache(MemoryCacheTier(), SQLCacheTier(TestingSessionLocal)).set(key, '# 제목\n본문')
+
+    cache = LLMResponseCache(MemoryCacheTier(), SQLCacheTier(TestingSessionLocal))
+    assert cache.get(key) == ('# 제목\n본문', 'sqlite')
+    assert cache.get(key) == ('# 제목\n본문', 'memory')
+    assert cache.hit_rate == 1.0
+
+
+def test_generator_cache_modes(monkeypatch):
+    monkeypatch.setattr(response_cache, 'persistent_tier', SQLCacheTier(TestingSessionLocal))
+    response_cache.clear()
+    calls = []
+    generator = AdvancedContentGenerator(api_key='sk-test')
+
+    def fake_complete(prompt, active_provider=None):
+        calls.append(prompt)
+        return '# 캐시 테스트 제목\n본문'
+
+    monkeypatch.setattr(generator, '_complete', fake_complete)
+
+    with pytest.raises(LookupError):
+        generator.generate_seo_optimized_content('캐시', cache_mode='only')
+
+    first = generator.generate_seo_optimized_content('캐시', cache_mode='prefer')
+    second = generator.generate_seo_optimized_content('캐시', cache_mode='prefer')
+    bypassed = generator.generate_seo_optimized_content('캐시')
+
+    assert len(calls) == 2
+    assert first['cache']['status'] == 'miss'
+    assert second['cache']['status'] == 'hit'
+    assert second['title'] == '캐시 테스트 제목'
+    assert 'cache' not in bypassed
+
+
+def test_failover_response_is_cached_under_the_provider_that_answered(monkeypatch):
+    monkeypatch.setattr(response_cache, 'persistent_tier', SQLCacheTier(TestingSessionLocal))
+    monkeypatch.setattr(hedged_completion, 'deadline', 0)
+    response_cache.clear()
+    primary = ProviderConfig(901, '기본', 'openai', 'gpt-4o', api_key='sk-a', is_active=True)
+    backup = ProviderConfig(902, '예비', 'ollama', 'llama3')
+    generator = AdvancedContentGenerator(api_key='sk-test')
+    calls = []
+
+    def fake_complete(prompt, active_provider=None):
+        calls.append(active_provider.name)
+        if active_provider is primary:
+            raise RuntimeError('primary down')
+        return '# 예비 모델 제목\n본문'
+
+    monkeypatch.setattr(generator, '_complete', fake_complete)
+    monkeypatch.setattr(generator, '_get_routable_providers', lambda db: [primary, backup])
+
+    first = generator.generate_seo_optimized_content('장애 조치', cache_mode='prefer')
+    assert first['llm_provider']['id'] == 902 and first['cache']['status'] == 'miss'
+
+    # 기본 제공자가 복구되면 예비 모델의 응답을 재사용하지 않고 다시 생성
+    monkeypatch.setattr(generator, '_complete', lambda prompt, active_provider=None: '# 기본 모델 제목\n본문')
+    second = generator.generate_seo_optimized_content('장애 조치', cache_mode='prefer')
+    assert second['cache']['status'] == 'miss' and second['title'] == '기본 모델 제목'
+
+    # 예비 제공자가 기본이 되면 저장된 응답 적중
+    backup_first = ProviderConfig(902, '예비', 'ollama', 'llama3', is_active=True)
+    monkeypatch.setattr(generator, '_get_routable_providers', lambda db: [backup_first])
+    third = generator.generate_seo_optimized_content('장애 조치', cache_mode='prefer')
+    assert third['cache']['status'] == 'hit' and third['title'] == '예비 모델 제목'
+
+
+def test_lookup_uses_the_provider_the_router_will_call(monkeypatch):
+    monkeypatch.setattr(response_cache, 'persistent_tier', SQLCacheTier(TestingSessionLocal))
+    monkeypatch.setattr(hedged_completion, 'deadline', 0)
+    monkeypatch.setattr(content_generator_module, 'provider_router',
+                        ProviderRouter(weights={}, failure_threshold=1, cooldown=60))
+    response_cache.clear()
+    primary = ProviderConfig(911, '기본', 'openai', 'gpt-4o', api_key='sk-b', is_active=True)
+    backup = ProviderConfig(912, '예비', 'ollama', 'llama3', use_for_routing=True)
+    generator = AdvancedContentGenerator(api_key='sk-test')
+    calls = []
+
+    def fake_complete(prompt, active_provider=None):
+        calls.append(active_provider.name)
+        if active_provider is primary:
+            raise RuntimeError('primary down')
+        return '# 예비 응답\n본문'
+
+    monkeypatch.setattr(generator, '_complete', fake_complete)
+    monkeypatch.setattr(generator, '_get_routable_providers', lambda db: [primary, backup])
+
+    first = generator.generate_seo_optimized_content('회로 차단', cache_mode='prefer')
+    # 기본 제공자의 회로가 열려 있는 동안에는 예비 제공자 키로 조회해 적중
+    second = generator.generate_seo_optimized_content('회로 차단', cache_mode='prefer')
+
+    assert first['cache']['status'] == 'miss'
+    assert second['cache']['status'] == 'hit' and second['title'] == '예비 응답'
+    assert calls == ['기본', '예비']
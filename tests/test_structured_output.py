@@ -0,0 +1,58 @@
+import sys, os, json
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'server'))
+from types import SimpleNamespace
+import pytest
+
+import src.services.content_generator as content_generator
+from src.services.content_generator import AdvancedContentGenerator
+from src.services.structured_output import article_markdown, parse_article
+
+ARTICLE = {
+    'title': '# 커피 원두 고르는 법: 초보자를 위한 산지별 완벽 가이드',
+    'meta_description': '커피 원두를 산지와 로스팅 정도로 고르는 방법을 정리했습니다.',
+    'sections': [
+        {'heading': '', 'content': '커피 맛은 원두에서 시작됩니다.'},
+        {'heading': '산지별 특징', 'content': '에티오피아 원두는 꽃향이 납니다.'},
+        {'heading': '빈 섹션', 'content': '  '}
+    ],
+    'tags': ['커피', '#원두', '커피']
+}
+
+
+def test_parse_article_validates_and_normalizes():
+    article = parse_article(f"```json\n{json.dumps(ARTICLE, ensure_ascii=False)}\n```")
+
+    assert article['title'] == '커피 원두 고르는 법: 초보자를 위한 산지별 완벽 가이드'
+    assert article['tags'] == ['커피', '원두']
+    assert [s['heading'] for s in article['sections']] == ['', '산지별 특징']
+    assert article_markdown(article) == '커피 맛은 원두에서 시작됩니다.\n\n## 산지별 특징\n\n에티오피아 원두는 꽃향이 납니다.'
+
+    for broken in ('# 제목\n본문', json.dumps({**ARTICLE, 'sections': []}), json.dumps({**ARTICLE, 'title': 3})):
+        with pytest.raises(ValueError):
+            parse_article(broken)
+
+
+def test_generator_requests_json_and_analyzes_result(monkeypatch):
+    calls = []
+
+    def create(**kwargs):
+        calls.append(kwargs)
+        message = SimpleNamespace(content=json.dumps(ARTICLE, ensure_ascii=False))
+        response = SimpleNamespace(usage=None, choices=[SimpleNamespace(message=message)])
+        return SimpleNamespace(headers={}, parse=lambda: response)
+
+    fake = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(
+        with_raw_response=SimpleNamespace(create=create))))
+    monkeypatch.setattr(content_generator.client_registry, 'get_openai_client', lambda api_key, **kw: fake)
+
+    result = AdvancedContentGenerator(api_key='sk-test').generate_seo_optimized_content('커피')
+
+    assert calls[0]['response_format'] == {'type': 'json_object'}
+    assert 'JSON' in calls[0]['messages'][0]['content']
+    assert result['title'].startswith('커피 원두 고르는 법')
+    assert result['meta_tags']['meta_description'] == ARTICLE['meta_description']
+    assert result['tags'] == ['커피', '원두']
+    analysis = result['content_analysis']
+    assert analysis['keyword_in_title'] is True
+    assert analysis['content_length'] == len(result['content'])
+    assert analysis['seo_score'] == 30 + 15 + 10 and analysis['grade'] == 'D'
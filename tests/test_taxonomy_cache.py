@@ -0,0 +1,161 @@
+import sys, os, threading, time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'server'))
+from types import SimpleNamespace
+
+from src.services.taxonomy_cache import TaxonomyCache
+from src.services.wordpress_sessions import SiteSlots
+
+SITE = 'https://blog.example.com'
+
+
+class FakeTermsSession:
+    """페이지 단위 용어 목록과 ETag를 흉내 내는 세션"""
+
+    def __init__(self, names, etag='"v1"'):
+        self.terms = [{'id': i + 1, 'name': name} for i, name in enumerate(names)]
+        self.etag = etag
+        self.calls = []
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        self.calls.append(('GET', params['page'], (headers or {}).get('If-None-Match')))
+        if headers and headers.get('If-None-Match') == self.etag:
+            return SimpleNamespace(status_code=304, headers={}, json=lambda: [])
+        per_page, page = params['per_page'], params['page']
+        total_pages = max(1, -(-len(self.terms) // per_page))
+        chunk = self.terms[(page - 1) * per_page:page * per_page]
+        return SimpleNamespace(status_code=200, headers={'X-WP-TotalPages': str(total_pages), 'ETag': self.etag},
+                               json=lambda: chunk)
+
+    def post(self, url, json=None, timeout=None):
+        self.calls.append(('POST', json['name'], None))
+        existing = next((t for t in self.terms if t['name'] == json['name']), None)
+        if existing:
+            body = {'code': 'term_exists', 'data': {'status': 400, 'term_id': existing['id']}}
+            return SimpleNamespace(status_code=400, json=lambda: body)
+        term = {'id': len(self.terms) + 1, 'name': json['name']}
+        self.terms.append(term)
+        return SimpleNamespace(status_code=201, json=lambda: term)
+
+
+def test_bulk_load_resolves_case_insensitively_and_creates_only_missing_terms():
+    session = FakeTermsSession([f'태그{i}' for i in range(248)] + ['Coffee', 'Tips &amp; Tricks'])
+    cache = TaxonomyCache(ttl=600, per_page=100)
+
+    ids = cache.resolve(session, SITE, 'tags', ['coffee', ' tips & tricks ', '새 태그', 'COFFEE'])
+    assert ids == [249, 250, 251]
+    assert [c[:2] for c in session.calls] == [('GET', 1), ('GET', 2), ('GET', 3), ('POST', '새 태그')]
+
+    # 안정 상태에서는 용어 관련 요청 없음
+    session.calls.clear()
+    assert cache.resolve(session, SITE + '/', 'tags', ['새 태그', '태그7']) == [251, 8]
+    assert session.calls == []
+
+
+def test_expired_index_revalidates_with_etag_and_reloads_on_change():
+    session = FakeTermsSession(['커피'])
+    cache = TaxonomyCache(ttl=0)
+    cache.resolve(session, SITE, 'categories', ['커피'])
+
+    session.calls.clear()
+    assert cache.resolve(session, SITE, 'categories', ['커피']) == [1]
+    assert session.calls == [('GET', 1, '"v1"')]
+
+    # 다른 곳에서 용어가 추가되어 ETag가 바뀌면 전체를 다시 읽음
+    session.terms.append({'id': 2, 'name': '여행'})
+    session.etag = '"v2"'
+    session.calls.clear()
+    assert cache.resolve(session, SITE, 'categories', ['여행']) == [2]
+    assert [c[0] for c in session.calls] == ['GET']
+
+
+def test_term_created_elsewhere_uses_existing_id():
+    session = FakeTermsSession(['커피'])
+    cache = TaxonomyCache(ttl=600)
+    cache.resolve(session, SITE, 'tags', [])
+
+    session.terms.append({'id': 2, 'name': '원두'})
+    assert cache.resolve(session, SITE, 'tags', ['원두']) == [2]
+
+
+class SlowCreateSession(FakeTermsSession):
+    """용어 생성이 느린 사이트 - 동시 요청 수를 기록"""
+
+    def __init__(self, delays):
+        super().__init__([])
+        self.delays = delays
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def post(self, url, json=None, timeout=None):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delays.get(json['name'], 0.05))
+            with self.lock:
+                return super().post(url, json=json, timeout=timeout)
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+def test_missing_terms_are_created_concurrently_within_site_slots():
+    tags = [f'태그{i}' for i in range(12)]
+    session = SlowCreateSession({'느린 태그': 1.0})
+    cache = TaxonomyCache(ttl=600, resolve_timeout=0.5, slots=SiteSlots(limit=3))
+    failures = {}
+
+    started = time.monotonic()
+    resolved = cache.resolve_many(session, SITE, {'categories': ['커피'], 'tags': tags + ['느린 태그']}, failures)
+    elapsed = time.monotonic() - started
+
+    # 13개 x 0.05초를 3개씩 동시에 처리, 느린 용어는 기다리지 않음
+    assert elapsed < 0.9
+    assert session.max_active == 3
+    assert len(resolved['categories']) == 1 and len(resolved['tags']) == 12
+    assert failures == {'tags': ['느린 태그']}
+
+    # 늦게 끝난 생성 결과는 다음 게시에서 재사용
+    time.sleep(1.0)
+    session.calls.clear()
+    assert len(cache.resolve(session, SITE, 'tags', ['느린 태그'])) == 1
+    assert session.calls == []
+
+
+class SiteWithRecreatedTerms(FakeTermsSession):
+    """게시 요청에서 없는 용어 ID를 rest_invalid_param으로 거부하는 사이트"""
+
+    def post(self, url, json=None, timeout=None):
+        if not url.endswith('/posts'):
+            return super().post(url, json=json, timeout=timeout)
+        self.calls.append(('POST', 'posts', json['categories']))
+        known = {t['id'] for t in self.terms}
+        if not set(json['categories']) <= known:
+            body = {'code': 'rest_invalid_param', 'message': 'Invalid parameter(s): categories',
+                    'data': {'status': 400, 'params': {'categories': 'categories[0] is not a valid term'}}}
+            return SimpleNamespace(status_code=400, headers={'content-type': 'application/json'}, json=lambda: body)
+        post = {'id': 7, 'title': {'rendered': json['title']}, 'link': f'{SITE}/?p=7',
+                'status': json['status'], 'date': '2024-01-01T00:00:00'}
+        return SimpleNamespace(status_code=201, headers={'content-type': 'application/json'}, json=lambda: post)
+
+
+def test_rejected_term_ids_invalidate_cache_and_retry_once(monkeypatch):
+    from src.services.site_cache import SiteConfig
+    from src.services.wordpress_service import WordPressService
+
+    session = SiteWithRecreatedTerms(['커피'])
+    service = WordPressService(taxonomies=TaxonomyCache(ttl=600))
+    monkeypatch.setattr(service, '_session', lambda site: session)
+    site = SiteConfig(id=1, user_id=1, name='블로그', url=SITE, username='editor', password='pw')
+
+    assert service._create_post_rest_api(site, '첫 글', '본문', 'draft', ['커피'], [], None, None, None)['id'] == 7
+
+    # 사이트에서 용어를 지우고 다시 만들어 ID가 바뀜 - 캐시는 아직 만료되지 않음
+    session.terms = [{'id': 5, 'name': '커피'}]
+    session.etag = '"v2"'
+    session.calls.clear()
+    result = service._create_post_rest_api(site, '둘째 글', '본문', 'draft', ['커피'], [], None, None, None)
+
+    assert result['id'] == 7
+    assert [c for c in session.calls if c[1] == 'posts'] == [('POST', 'posts', [1]), ('POST', 'posts', [5])]
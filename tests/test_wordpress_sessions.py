@@ -0,0 +1,152 @@
+import sys, os, json
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'server'))
+import pytest
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectTimeout, ReadTimeout
+from requests.models import Response
+
+from src.services.site_cache import SiteConfig
+from src.services.taxonomy_cache import TaxonomyCache
+from src.services.wordpress_service import WordPressService
+from src.services.wordpress_sessions import WordPressSessionPool
+
+
+class FakeWordPressAdapter(HTTPAdapter):
+    """네트워크 없이 WordPress REST 응답을 돌려주는 어댑터"""
+
+    def __init__(self, log):
+        super().__init__()
+        self.log = log
+
+    def send(self, request, **kwargs):
+        self.log.append((request.method, request.url, request.headers.get('Authorization')))
+        response = Response()
+        response.request = request
+        response.url = request.url
+        response.headers['content-type'] = 'application/json'
+        if request.method == 'GET':
+            response.status_code = 200
+            body = []
+        elif request.url.endswith('/posts'):
+            response.status_code = 201
+            body = {'id': 10, 'title': {'rendered': '제목'}, 'link': 'https://blog.example.com/?p=10',
+                    'status': 'draft', 'date': '2024-01-01T00:00:00'}
+        else:
+            response.status_code = 201
+            body = {'id': len(self.log)}
+        response._content = json.dumps(body).encode()
+        return response
+
+
+class RecordingPool(WordPressSessionPool):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.log = []
+        self.created = 0
+
+    def _create(self, username, password):
+        self.created += 1
+        session = super()._create(username, password)
+        session.mount('https://', FakeWordPressAdapter(self.log))
+        return session
+
+
+def test_pool_reuses_sessions_and_evicts_idle_or_changed_credentials():
+    pool = WordPressSessionPool(max_size=2, idle_ttl=300)
+    session = pool.get('https://a.example.com/', 'editor', 'pw')
+    assert pool.get('https://a.example.com', 'editor', 'pw') is session
+    assert session.headers['Authorization'] == WordPressSessionPool.auth_headers('editor', 'pw')['Authorization']
+
+    # 비밀번호가 바뀌면 새 세션, 최대 개수를 넘으면 가장 오래된 세션 정리
+    assert pool.get('https://a.example.com', 'editor', 'new-pw') is not session
+    pool.get('https://b.example.com', 'editor', 'pw')
+    assert len(pool) == 2
+    assert pool.get('https://a.example.com', 'editor', 'pw') is not session
+
+    pool.idle_ttl = 0
+    assert pool.evict_idle() == 2 and len(pool) == 0
+
+
+def test_publish_uses_one_pooled_session_for_every_rest_call():
+    pool = RecordingPool()
+    service = WordPressService(sessions=pool, taxonomies=TaxonomyCache())
+    site = SiteConfig(id=1, user_id=1, name='블로그', url='https://blog.example.com',
+                      username='editor', password='app pass')
+
+    result = service._create_post_rest_api(site, '제목', '본문', 'draft', ['커피', '원두', '여행'],
+                                           ['a', 'b', 'c', 'd', 'e & f'], None, None, None)
+
+    assert result['id'] == 10
+    assert pool.created == 1
+    # 용어 목록 2 + 없는 카테고리 3 + 없는 태그 5 생성 + 포스트 1
+    assert len(pool.log) == 11
+    assert {auth for _, _, auth in pool.log} == {WordPressSessionPool.auth_headers('editor', 'app pass')['Authorization']}
+
+
+class LostPostAdapter(HTTPAdapter):
+    """포스트 POST에서 post_error를 내거나 post_status로 응답하고, 조회 GET은 posts 목록을 돌려주는 어댑터"""
+
+    def __init__(self, log, post_error=None, post_status=None, posts=()):
+        super().__init__()
+        self.log, self.post_error, self.post_status, self.posts = log, post_error, post_status, list(posts)
+
+    def send(self, request, **kwargs):
+        self.log.append((request.method, request.url.split('?')[0]))
+        if request.method == 'POST' and self.post_error:
+            raise self.post_error
+        response = Response()
+        response.request = request
+        response.url = request.url
+        response.headers['content-type'] = 'application/json'
+        response.status_code = self.post_status if request.method == 'POST' else 200
+        response._content = json.dumps({'code': 'rest_no_route', 'message': '경로 없음'} if request.method == 'POST'
+                                       else self.posts).encode()
+        return response
+
+
+def _publisher(monkeypatch, **adapter_options):
+    log, xmlrpc_calls = [], []
+
+    class Pool(WordPressSessionPool):
+        def _create(self, username, password):
+            session = super()._create(username, password)
+            session.mount('https://', LostPostAdapter(log, **adapter_options))
+            return session
+
+    service = WordPressService(sessions=Pool(), taxonomies=TaxonomyCache())
+    site = SiteConfig(id=1, user_id=1, name='블로그', url='https://blog.example.com',
+                      username='editor', password='app pass')
+    monkeypatch.setattr(service, '_require_site', lambda db, user_id, site_id: site)
+    monkeypatch.setattr(service, '_create_post_xmlrpc',
+                        lambda site, title, *args: xmlrpc_calls.append(title) or {'id': 99, 'title': title})
+    return service, log, xmlrpc_calls
+
+
+def test_lost_post_response_is_looked_up_instead_of_resent(monkeypatch):
+    created = {'id': 7, 'title': {'raw': '제목', 'rendered': '제목'}, 'link': 'https://blog.example.com/?p=7',
+               'status': 'draft', 'date': '2024-01-01T00:00:00'}
+    service, log, xmlrpc_calls = _publisher(monkeypatch, post_error=ReadTimeout('read timed out'), posts=[created])
+
+    result = service.create_post(None, 1, 1, '제목', '본문')
+
+    assert result['id'] == 7
+    assert [method for method, _ in log] == ['POST', 'GET'] and xmlrpc_calls == []
+
+    service, log, xmlrpc_calls = _publisher(monkeypatch, post_error=ReadTimeout('read timed out'))
+    with pytest.raises(ValueError, match='다시 보내지 않습니다'):
+        service.create_post(None, 1, 1, '제목', '본문')
+    assert [method for method, _ in log] == ['POST', 'GET'] and xmlrpc_calls == []
+
+
+def test_xmlrpc_fallback_only_when_rest_post_was_not_created(monkeypatch):
+    # 연결 전 실패와 REST 경로 없음(404/405)은 포스트가 만들어지지 않았으므로 XML-RPC로 게시
+    for options in ({'post_error': ConnectTimeout('connect timed out')}, {'post_status': 404}, {'post_status': 405}):
+        service, log, xmlrpc_calls = _publisher(monkeypatch, **options)
+        assert service.create_post(None, 1, 1, '제목', '본문')['id'] == 99
+        assert xmlrpc_calls == ['제목']
+
+    # 그 밖의 거부 응답은 XML-RPC로 다시 보내지 않음
+    service, log, xmlrpc_calls = _publisher(monkeypatch, post_status=401)
+    with pytest.raises(ValueError, match='HTTP 401'):
+        service.create_post(None, 1, 1, '제목', '본문')
+    assert xmlrpc_calls == []
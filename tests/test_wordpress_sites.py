@@ -0,0 +1,138 @@
+import sys, os, tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'server'))
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from src.db import Base
+from src.models.user import User
+from src.models.wordpress_site import WordPressSite
+from src.services.site_cache import SiteCache
+from src.services.wordpress_service import WordPressService
+from src.utils.crypto_utils import decrypt_secret, encrypt_secret
+
+# setup_module에서 채움
+ENGINE = TestingSessionLocal = None
+USER_ID = None
+
+
+def setup_module(module):
+    fd, path = tempfile.mkstemp()
+    os.close(fd)
+    engine = create_engine(
+        f"sqlite:///{path}", connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(bind=engine)
+    module.ENGINE = engine
+    module.TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    db = module.TestingSessionLocal()
+    user = User(username='wpsites', email='wpsites@example.com', password_hash='x')
+    db.add(user)
+    db.commit()
+    module.USER_ID = user.id
+    db.close()
+    module.TEST_DB_PATH = path
+
+
+def teardown_module(module):
+    os.unlink(module.TEST_DB_PATH)
+
+
+@pytest.fixture
+def service(monkeypatch):
+    service = WordPressService(sites=SiteCache(ttl=60))
+    monkeypatch.setattr(service, 'test_connection', lambda url, username, password: {
+        'success': True, 'message': '연결 성공', 'user_info': {'id': 1, 'name': username}
+    })
+    return service
+
+
+def test_secret_round_trip_and_tamper_detection():
+    token = encrypt_secret('app pass 1234')
+    assert 'app pass' not in token
+    assert decrypt_secret(token) == 'app pass 1234'
+    assert encrypt_secret('app pass 1234') != token
+
+    tampered = token[:-4] + ('AAAA' if not token.endswith('AAAA') else 'BBBB')
+    with pytest.raises(ValueError):
+        decrypt_secret(tampered)
+
+
+def test_sites_persist_encrypted_and_are_shared_between_instances(service):
+    db = TestingSessionLocal()
+    first = service.add_site(db, USER_ID, '블로그', 'blog.example.com/', 'editor', 'app pass 1234')
+    second = service.add_site(db, USER_ID, '리뷰', 'https://review.example.com', 'editor', 'other pass')
+
+    stored = db.query(WordPressSite).filter(WordPressSite.id == first.id).one()
+    assert stored.url == 'https://blog.example.com'
+    assert 'app pass' not in stored.password_encrypted
+    assert 'password' not in first.to_dict()
+
+    # 다른 워커(새 서비스 인스턴스/빈 캐시)에서도 같은 사이트를 조회
+    other_worker = WordPressService(sites=SiteCache(ttl=60))
+    assert [s.id for s in other_worker.get_user_sites(db, USER_ID)] == [first.id, second.id]
+    assert other_worker.get_site(db, USER_ID, first.id).password == 'app pass 1234'
+    assert other_worker.get_site(db, USER_ID + 1, first.id) is None
+
+    active = service.set_active_site(db, USER_ID, second.id)
+    assert active.is_active
+    assert [s.is_active for s in service.get_user_sites(db, USER_ID)] == [False, True]
+
+    service.delete_site(db, USER_ID, first.id)
+    assert service.get_site(db, USER_ID, first.id) is None
+    with pytest.raises(ValueError):
+        service.delete_site(db, USER_ID, first.id)
+    service.delete_site(db, USER_ID, second.id)
+    db.close()
+
+
+def test_cached_lookup_only_checks_versions_until_invalidated(service):
+    db = TestingSessionLocal()
+    site = service.add_site(db, USER_ID, '캐시', 'cache.example.com', 'editor', 'secret')
+    service.get_site(db, USER_ID, site.id)
+
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(ENGINE, 'before_cursor_execute', listener)
+    try:
+        for _ in range(5):
+            assert service.get_site(db, USER_ID, site.id).name == '캐시'
+        # 캐시 적중 시에는 비밀번호 없이 id/version만 조회
+        assert len(statements) == 5
+        assert all('password_encrypted' not in statement for statement in statements)
+
+        service.update_site(db, USER_ID, site.id, '캐시 수정', 'cache.example.com', 'editor', 'secret2')
+        statements.clear()
+        refreshed = service.get_site(db, USER_ID, site.id)
+        assert refreshed.name == '캐시 수정' and refreshed.password == 'secret2'
+        assert len(statements) == 2
+    finally:
+        event.remove(ENGINE, 'before_cursor_execute', listener)
+    service.delete_site(db, USER_ID, site.id)
+    db.close()
+
+
+def test_changes_from_other_workers_are_visible_immediately(service):
+    db = TestingSessionLocal()
+    site = service.add_site(db, USER_ID, '공유', 'shared.example.com', 'editor', 'old pass')
+    other = service.add_site(db, USER_ID, '다른 사이트', 'other.example.com', 'editor', 'pass')
+
+    # TTL이 남아 있는 다른 워커의 캐시
+    other_worker = WordPressService(sites=SiteCache(ttl=3600))
+    assert other_worker.get_site(db, USER_ID, site.id).password == 'old pass'
+
+    # 같은 초 안에 여러 번 바뀌어도 version으로 감지
+    service.update_site(db, USER_ID, site.id, '공유', 'shared.example.com', 'editor', 'new pass')
+    assert other_worker.get_site(db, USER_ID, site.id).password == 'new pass'
+    service.record_test_result(db, USER_ID, site.id, False)
+    assert other_worker.get_site(db, USER_ID, site.id).status == 'disconnected'
+    service.set_active_site(db, USER_ID, site.id)
+    assert [s.is_active for s in other_worker.get_user_sites(db, USER_ID)] == [True, False]
+
+    service.delete_site(db, USER_ID, site.id)
+    assert other_worker.get_site(db, USER_ID, site.id) is None
+    with pytest.raises(ValueError):
+        other_worker.create_post(db, USER_ID, site.id, '제목', '본문')
+    service.delete_site(db, USER_ID, other.id)
+    db.close()